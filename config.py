@@ -262,6 +262,16 @@ class Config:
     # Reconnection Strategy
     RECONNECT_INITIAL_TIMEOUT: int = int(os.getenv("RECONNECT_INITIAL_TIMEOUT", "5"))
     RECONNECT_MAX_TIMEOUT: int = int(os.getenv("RECONNECT_MAX_TIMEOUT", "300"))
+    SERIES_READY_TIMEOUT: float = float(os.getenv("SERIES_READY_TIMEOUT", "5.0"))  # Espera de series_completed tras suscribir (s)
+    
+    # Realtime Pipeline (colas acotadas entre recepción, análisis y notificación)
+    CANDLE_QUEUE_SIZE: int = int(os.getenv("CANDLE_QUEUE_SIZE", "1024"))  # Velas en espera de análisis
+    SIGNAL_QUEUE_SIZE: int = int(os.getenv("SIGNAL_QUEUE_SIZE", "8"))  # Señales en espera de emisión (gráfico, Telegram)
+    SIGNAL_WORKERS: int = max(1, int(os.getenv("SIGNAL_WORKERS", str(len(TARGET_ASSETS)))))  # Emisiones en paralelo (default: una por activo)
+    
+    # Statistics Cache (get_probability: el lookback es de días, el resultado casi no cambia entre señales cercanas)
+    PROBABILITY_CACHE_TTL_SECONDS: float = float(os.getenv("PROBABILITY_CACHE_TTL_SECONDS", "60.0"))
+    PROBABILITY_CACHE_MAX_SIZE: int = int(os.getenv("PROBABILITY_CACHE_MAX_SIZE", "4096"))
     
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "DEBUG").upper()
@@ -27,6 +27,12 @@ from src.utils.logger import get_logger, log_startup_banner, log_shutdown, log_c
 
 import iqoptionapi.constants
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 logger = get_logger(__name__)
 
 
@@ -52,6 +58,7 @@ class TradingBot:
         self.storage_service: Optional[StorageService] = None
         
         self.is_running: bool = False
+        self._stopping: bool = False
         self.shutdown_event: asyncio.Event = asyncio.Event()
     
     async def initialize(self) -> None:
@@ -144,23 +151,33 @@ class TradingBot:
         Detiene el bot de forma limpia.
         """
         if not self.is_running:
+            # Shutdown ya en curso (handler de señal): esperar a que termine
+            # para que asyncio.run() no lo cancele al volver main()
+            if self._stopping:
+                await self.shutdown_event.wait()
             return
         
         logger.info("🛑 Initiating graceful shutdown...")
         self.is_running = False
+        self._stopping = True
         
-        # Detener servicios en orden inverso
-        if self.connection_service:
-            await self.connection_service.stop()
-        
-        if self.telegram_service:
-            await self.telegram_service.stop()
-        
-        if self.storage_service:
-            await self.storage_service.close()
-        
-        log_shutdown(logger)
-        self.shutdown_event.set()
+        try:
+            # Detener servicios en orden inverso
+            if self.connection_service:
+                await self.connection_service.stop()
+            
+            if self.telegram_service:
+                await self.telegram_service.stop()
+            
+            if self.analysis_service:
+                self.analysis_service.shutdown()
+            
+            if self.storage_service:
+                await self.storage_service.close()
+            
+            log_shutdown(logger)
+        finally:
+            self.shutdown_event.set()
     
     def _handle_auth_failure(self) -> None:
         """
@@ -254,6 +271,9 @@ if __name__ == "__main__":
     # Configuración de políticas de asyncio para Windows
     if sys.platform == "win32":
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    elif UVLOOP_AVAILABLE:
+        # Event loop de libuv: menos overhead por mensaje en el loop del WebSocket
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     
     try:
         asyncio.run(main())
@@ -48,8 +48,11 @@ from config import Config
 # Import logic modules
 from src.utils.indicators import calculate_ema, calculate_bollinger_bands, calculate_rsi
 from src.logic.candle import (
-    is_shooting_star, is_hanging_man, is_inverted_hammer, is_hammer,
-    get_candle_direction, detect_candle_exhaustion
+    get_candle_direction
+)
+from src.logic.candle_vec import annotate_patterns
+from src.logic._candle_njit import (
+    FLAG_SHOOTING_STAR, FLAG_HANGING_MAN, FLAG_INVERTED_HAMMER, FLAG_HAMMER
 )
 from src.logic.analysis_service import analyze_trend, detect_exhaustion
 from src.logic.signal_classifier import classify_signal
@@ -187,9 +190,19 @@ def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     
     return df
 
+# (flag, pattern, direction) in the same order the scalar detectors were evaluated
+PATTERN_DIRECTIONS = (
+    (FLAG_SHOOTING_STAR, 'SHOOTING_STAR', 'PUT'),
+    (FLAG_HANGING_MAN, 'HANGING_MAN', 'CALL'),
+    (FLAG_INVERTED_HAMMER, 'INVERTED_HAMMER', 'PUT'),
+    (FLAG_HAMMER, 'HAMMER', 'CALL'),
+)
+
 def analyze_candle_row(row: pd.Series, prev_row: pd.Series, prev_emas: Dict[str, float]) -> Optional[Dict]:
     """
     Analyzes a single candle row for patterns and signals.
+    Pattern flags/confidence and candle exhaustion come from the batch scan
+    columns (annotate_patterns).
     Returns a signal dict if found, else None.
     """
     open_p = row['open']
@@ -207,20 +220,14 @@ def analyze_candle_row(row: pd.Series, prev_row: pd.Series, prev_emas: Dict[str,
     # Analyze Trend
     trend_analysis = analyze_trend(close, emas, prev_emas)
     
-    # Detect Patterns
-    patterns = []
-    
-    is_ss, conf_ss, _ = is_shooting_star(open_p, high, low, close)
-    if is_ss: patterns.append(('SHOOTING_STAR', conf_ss, 'PUT'))
-    
-    is_hm, conf_hm, _ = is_hanging_man(open_p, high, low, close)
-    if is_hm: patterns.append(('HANGING_MAN', conf_hm, 'CALL'))
-    
-    is_ih, conf_ih, _ = is_inverted_hammer(open_p, high, low, close)
-    if is_ih: patterns.append(('INVERTED_HAMMER', conf_ih, 'PUT'))
-    
-    is_h, conf_h, _ = is_hammer(open_p, high, low, close)
-    if is_h: patterns.append(('HAMMER', conf_h, 'CALL'))
+    # Detected Patterns (precomputed mask column)
+    mask = int(row['pattern_mask'])
+    confidence = float(row['pattern_confidence'])
+    patterns = [
+        (pattern_name, confidence, direction)
+        for flag, pattern_name, direction in PATTERN_DIRECTIONS
+        if mask & flag
+    ]
     
     if not patterns:
         return None
@@ -242,7 +249,7 @@ def analyze_candle_row(row: pd.Series, prev_row: pd.Series, prev_emas: Dict[str,
             
         # Indicators
         exhaustion = detect_exhaustion(high, low, close, row['bb_upper'], row['bb_lower'])
-        candle_exhaustion = detect_candle_exhaustion(pattern_name, high, low, prev_row['max'], prev_row['min'])
+        candle_exhaustion = bool(row['candle_exhaustion'])
         rsi_val = row['rsi']
         
         # Signal Strength (Centralized Logic)
@@ -354,9 +361,16 @@ def main():
             df['symbol'] = asset
             df = calculate_indicators(df)
             
+            # Batch pattern scan over the whole dataset (uint8 pattern_mask column);
+            # only rows with a detected pattern go through the per-row analysis.
+            df = annotate_patterns(df, ('open', 'max', 'min', 'close'))
+            
             signals_count = 0
             
-            for i in range(WARMUP_CANDLES, len(df) - 1):
+            pattern_mask = df['pattern_mask'].to_numpy()
+            candidate_rows = np.flatnonzero(pattern_mask[WARMUP_CANDLES:len(df) - 1]) + WARMUP_CANDLES
+            
+            for i in candidate_rows:
                 row = df.iloc[i]
                 prev_row = df.iloc[i-1]
                 
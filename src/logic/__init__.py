@@ -9,6 +9,23 @@ Contiene la lógica de negocio central del sistema:
 Esta capa es independiente de los servicios de infraestructura.
 """
 
-from .analysis_service import AnalysisService, PatternSignal
+from importlib import import_module
+
+# Importación diferida (PEP 562): usar src.logic.candle o los kernels no
+# arrastra analysis_service (pandas, gráficos, servicios)
+_LAZY_EXPORTS = {
+    "AnalysisService": "analysis_service",
+    "PatternSignal": "analysis_service",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = ["AnalysisService", "PatternSignal"]
@@ -0,0 +1,161 @@
+"""
+Closed Candle Analysis Kernels - Numba JIT
+===========================================
+Kernel fusionado para el análisis de la última vela cerrada: en una sola
+llamada compilada resuelve los 4 patrones, el agotamiento de Bollinger,
+la ruptura del high/low anterior (Candle Exhaustion) y el score de tendencia.
+
+El orquestador (AnalysisService) solo traduce los códigos numéricos a
+strings para logging y construcción de la señal.
+
+Igual que en _candle_njit, los umbrales se reciben como argumentos y no se
+usa fastmath (las EMAs/bandas NaN deben seguir descartándose).
+
+Los kernels declaran su firma (todo float64, como los pasa AnalysisService):
+Numba los compila al importar el módulo, fuera del event loop, y con
+cache=True las corridas siguientes los cargan del disco. Así la primera
+vela cerrada en vivo no paga la compilación JIT.
+
+Author: TradingView Pattern Monitor Team
+"""
+
+from src.utils._njit import njit
+from src.logic._candle_njit import detect_all_patterns_nb
+
+
+# Códigos de agotamiento de Bollinger (índices de EXHAUSTION_TYPES)
+EXHAUSTION_NONE = 0
+EXHAUSTION_PEAK = 1
+EXHAUSTION_BOTTOM = 2
+
+EXHAUSTION_TYPES = ("NONE", "PEAK", "BOTTOM")
+
+# Firmas eager (compilación al importar)
+BOLLINGER_SIGNATURE = "(float64, float64, float64, float64, float64)"
+TREND_SCORE_SIGNATURE = "(float64, float64, float64, float64, float64, float64, boolean, float64)"
+ANALYZE_CLOSED_CANDLE_SIGNATURE = "(" + ", ".join(["float64"] * 22) + ")"
+
+
+@njit(BOLLINGER_SIGNATURE, cache=True)
+def bollinger_exhaustion_nb(h, l, c, upper_band, lower_band):
+    """Retorna EXHAUSTION_PEAK, EXHAUSTION_BOTTOM o EXHAUSTION_NONE."""
+    # Bandas NaN: no se puede determinar agotamiento
+    if upper_band != upper_band or lower_band != lower_band:
+        return EXHAUSTION_NONE
+    if h >= upper_band or c >= upper_band:
+        return EXHAUSTION_PEAK
+    if l <= lower_band or c <= lower_band:
+        return EXHAUSTION_BOTTOM
+    return EXHAUSTION_NONE
+
+
+@njit(TREND_SCORE_SIGNATURE, cache=True)
+def trend_score_nb(ema_3, ema_5, ema_20, prev_ema_3, prev_ema_5, prev_ema_20,
+                   has_prev, slope_threshold):
+    """
+    Núcleo numérico de analyze_trend (algoritmo V7.1).
+
+    Returns:
+        (score, bucket 0..4 de alcista a bajista, is_aligned)
+    """
+    score_structure = 0.0
+    score_velocity = 0.0
+    score_momentum = 0.0
+
+    # 1. ESTRUCTURA (ALINEACIÓN) - Max 3.0 pts
+    is_bullish_structure = False
+    is_bearish_structure = False
+    if ema_3 == ema_3 and ema_5 == ema_5 and ema_20 == ema_20:
+        if ema_3 > ema_5 > ema_20:
+            is_bullish_structure = True
+            score_structure = 3.0
+        elif ema_3 < ema_5 < ema_20:
+            is_bearish_structure = True
+            score_structure = -3.0
+
+    # 2. SLOPE (% de cambio respecto a la vela anterior)
+    slope_3 = 0.0
+    slope_5 = 0.0
+    slope_20 = 0.0
+    if has_prev:
+        if ema_3 == ema_3 and prev_ema_3 == prev_ema_3 and prev_ema_3 != 0:
+            slope_3 = (ema_3 - prev_ema_3) / prev_ema_3
+        if ema_5 == ema_5 and prev_ema_5 == prev_ema_5 and prev_ema_5 != 0:
+            slope_5 = (ema_5 - prev_ema_5) / prev_ema_5
+        if ema_20 == ema_20 and prev_ema_20 == prev_ema_20 and prev_ema_20 != 0:
+            slope_20 = (ema_20 - prev_ema_20) / prev_ema_20
+
+    # 3. VELOCIDAD BASE (EMA 20) - Max 2.0 pts
+    if slope_20 > slope_threshold:
+        score_velocity = 2.0
+    elif slope_20 < -slope_threshold:
+        score_velocity = -2.0
+
+    # 4. MOMENTUM Y AGOTAMIENTO - Max 5.0 pts
+    if is_bullish_structure:
+        if slope_3 > slope_threshold:
+            score_momentum += 3.0
+        elif slope_3 < slope_threshold:
+            score_momentum -= 2.0
+        if slope_5 > slope_threshold:
+            score_momentum += 2.0
+    elif is_bearish_structure:
+        if slope_3 < -slope_threshold:
+            score_momentum -= 3.0
+        elif slope_3 > -slope_threshold:
+            score_momentum += 2.0
+        if slope_5 < -slope_threshold:
+            score_momentum -= 2.0
+    else:
+        if slope_3 > slope_threshold:
+            score_momentum += 1.5
+        elif slope_3 < -slope_threshold:
+            score_momentum -= 1.5
+        if slope_5 > slope_threshold:
+            score_momentum += 1.0
+        elif slope_5 < -slope_threshold:
+            score_momentum -= 1.0
+
+    total_score = score_structure + score_velocity + score_momentum
+    total_score = max(min(total_score, 10.0), -10.0)
+    total_score = round(total_score, 1)
+
+    if total_score >= 8.0:
+        bucket = 0
+    elif total_score >= 5.0:
+        bucket = 1
+    elif total_score > -5.0:
+        bucket = 2
+    elif total_score > -8.0:
+        bucket = 3
+    else:
+        bucket = 4
+
+    return total_score, bucket, is_bullish_structure or is_bearish_structure
+
+
+@njit(ANALYZE_CLOSED_CANDLE_SIGNATURE, cache=True)
+def analyze_closed_candle_nb(o, h, l, c, prev_h, prev_l, bb_upper, bb_lower,
+                             ema_3, ema_5, ema_20, prev_ema_3, prev_ema_5, prev_ema_20,
+                             upper_wick_min, lower_wick_min, small_body, opposite_max,
+                             wick_to_body, base, bonus, slope_threshold):
+    """
+    Kernel fusionado: patrones + agotamiento Bollinger + ruptura de la vela
+    anterior + tendencia, sobre la vela cerrada y la anterior.
+
+    Returns:
+        (máscara FLAG_*, conf_ss, conf_hm, conf_ih, conf_h, código de agotamiento,
+         rompe_high_anterior, rompe_low_anterior, score, bucket, is_aligned)
+    """
+    mask, conf_ss, conf_hm, conf_ih, conf_h = detect_all_patterns_nb(
+        o, h, l, c, upper_wick_min, lower_wick_min, small_body,
+        opposite_max, wick_to_body, base, bonus
+    )
+    exhaustion = bollinger_exhaustion_nb(h, l, c, bb_upper, bb_lower)
+    score, bucket, is_aligned = trend_score_nb(
+        ema_3, ema_5, ema_20, prev_ema_3, prev_ema_5, prev_ema_20, True, slope_threshold
+    )
+    return (
+        mask, conf_ss, conf_hm, conf_ih, conf_h, exhaustion,
+        h > prev_h, l < prev_l, score, bucket, is_aligned
+    )
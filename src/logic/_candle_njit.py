@@ -0,0 +1,318 @@
+"""
+Candle Pattern Kernels - Numba JIT
+===================================
+Kernels escalares compilados con Numba para la detección de los 4 patrones.
+Los umbrales se reciben como argumentos explícitos (los globals de Numba se
+congelan en compilación y con cache=True quedarían obsoletos si cambia .env).
+
+Cada detector retorna (detectado, confianza, código_motivo). El código de
+motivo se traduce a texto en src/logic/candle.py solo cuando hace falta.
+
+NOTA: No se usa fastmath: reasociar la suma de bonos o asumir "no NaN"
+cambiaría resultados respecto a la versión Python (velas con NaN deben
+rechazarse, y la confianza debe ser bit-exacta con candle_vec).
+
+Author: TradingView Pattern Monitor Team
+"""
+
+import numpy as np
+
+from src.utils._njit import njit, prange
+
+
+# Códigos de motivo de rechazo
+REASON_OK = 0
+REASON_NO_RANGE = 1
+REASON_WRONG_COLOR = 2
+REASON_SHAPE = 3
+
+# Rango mínimo relativo al precio: por debajo, la vela se trata como sin rango
+# (ruido de redondeo; los ratios no tienen sentido y pueden generar subnormales).
+# Es una constante del algoritmo, no de .env, por lo que puede congelarse en JIT.
+RANGE_EPS = 1e-9
+
+# Bits de la máscara de detect_all_patterns
+FLAG_SHOOTING_STAR = 1
+FLAG_HANGING_MAN = 2
+FLAG_INVERTED_HAMMER = 4
+FLAG_HAMMER = 8
+
+
+@njit(cache=True)
+def _no_range_nb(o, h, l):
+    """True si el rango de la vela es nulo (o ruido por debajo de RANGE_EPS)."""
+    return abs(h - l) <= RANGE_EPS * max(abs(o), 1.0)
+
+
+@njit(cache=True)
+def _candle_features_nb(o, h, l, c):
+    """
+    Features de la vela, calculadas una sola vez y compartidas por los 4 patrones.
+    
+    Returns:
+        (total_range, body_size, upper_wick, lower_wick, body_ratio,
+         upper_wick_ratio, lower_wick_ratio)
+    """
+    if _no_range_nb(o, h, l):
+        return 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+    total_range = h - l
+    body_size = abs(c - o)
+    # Sin rama por color: el techo del cuerpo es max(o, c) y la base min(o, c)
+    upper_wick = h - max(o, c)
+    lower_wick = min(o, c) - l
+    # Divisiones (no x * (1 / total_range)): el recíproco difiere en 1 ULP y,
+    # con precios cuantizados al tick, cambia ratios que caen justo en el
+    # umbral (0.60, 0.30, 0.15...) respecto a la versión escalar/NumPy
+    return (
+        total_range, body_size, upper_wick, lower_wick, body_size / total_range,
+        upper_wick / total_range, lower_wick / total_range
+    )
+
+
+@njit(cache=True)
+def _long_wick_nb(body_size, long_wick, long_ratio, opposite_ratio, body_ratio,
+                  wick_min, small_body, opposite_max, wick_to_body, base, bonus):
+    """
+    Evalúa la forma "mecha larga + cuerpo pequeño" común a los 4 patrones
+    sobre features ya calculadas. Retorna (detectado, confianza, código_motivo).
+    """
+    # Orden por poder de rechazo medido en velas reales de 1m (fracción que
+    # pasa): mecha larga ~9%, cuerpo pequeño ~30%, mecha opuesta ~44%.
+    # La división mecha/cuerpo va última.
+    if not (
+        long_ratio >= wick_min
+        and body_ratio <= small_body
+        and opposite_ratio <= opposite_max
+        and body_size > 0
+        and (long_wick / body_size) >= wick_to_body
+    ):
+        return False, 0.0, REASON_SHAPE
+
+    # Cantidad de condiciones de bono cumplidas (0..3) -> confianza por tabla.
+    # La tabla se arma sumando el bono de a uno para ser bit-exacta con la
+    # suma secuencial original.
+    n_bonus = int(long_ratio >= 0.70) + int(body_ratio <= 0.20) + int(opposite_ratio <= 0.10)
+    conf_1 = base + bonus
+    conf_2 = conf_1 + bonus
+    confidence_table = (base, conf_1, conf_2, conf_2 + bonus)
+    return True, min(confidence_table[n_bonus], 1.0), REASON_OK
+
+
+@njit(cache=True)
+def _wick_pattern_nb(o, h, l, c, long_is_upper, require_green,
+                     wick_min, small_body, opposite_max, wick_to_body, base, bonus):
+    """
+    Kernel único de los 4 detectores: los patrones solo difieren en qué mecha
+    debe ser larga (long_is_upper) y en el color exigido (require_green).
+    Con argumentos constantes (wrappers de abajo) LLVM elimina la rama inactiva.
+    """
+    # Rango y color antes de las features: ~la mitad de las velas tiene el
+    # color incorrecto y se descarta sin divisiones
+    if _no_range_nb(o, h, l):
+        return False, 0.0, REASON_NO_RANGE
+    # Comparaciones explícitas (no `(c > o) != require_green`): con NaN ambas
+    # son falsas y la vela debe seguir hasta el chequeo de forma
+    if require_green:
+        if c <= o:
+            return False, 0.0, REASON_WRONG_COLOR
+    elif c > o:
+        return False, 0.0, REASON_WRONG_COLOR
+
+    (total_range, body_size, upper_wick, lower_wick, body_ratio,
+     upper_ratio, lower_ratio) = _candle_features_nb(o, h, l, c)
+    if long_is_upper:
+        return _long_wick_nb(body_size, upper_wick, upper_ratio, lower_ratio, body_ratio,
+                             wick_min, small_body, opposite_max, wick_to_body, base, bonus)
+    return _long_wick_nb(body_size, lower_wick, lower_ratio, upper_ratio, body_ratio,
+                         wick_min, small_body, opposite_max, wick_to_body, base, bonus)
+
+
+@njit(cache=True)
+def _shooting_star_nb(o, h, l, c, wick_min, small_body, opposite_max, wick_to_body, base, bonus):
+    """Shooting Star: mecha superior larga, vela roja o neutral."""
+    return _wick_pattern_nb(o, h, l, c, True, False,
+                            wick_min, small_body, opposite_max, wick_to_body, base, bonus)
+
+
+@njit(cache=True)
+def _hanging_man_nb(o, h, l, c, wick_min, small_body, opposite_max, wick_to_body, base, bonus):
+    """Hanging Man: mecha inferior larga, vela roja o neutral."""
+    return _wick_pattern_nb(o, h, l, c, False, False,
+                            wick_min, small_body, opposite_max, wick_to_body, base, bonus)
+
+
+@njit(cache=True)
+def _inverted_hammer_nb(o, h, l, c, wick_min, small_body, opposite_max, wick_to_body, base, bonus):
+    """Inverted Hammer: mecha superior larga, vela verde."""
+    return _wick_pattern_nb(o, h, l, c, True, True,
+                            wick_min, small_body, opposite_max, wick_to_body, base, bonus)
+
+
+@njit(cache=True)
+def _hammer_nb(o, h, l, c, wick_min, small_body, opposite_max, wick_to_body, base, bonus):
+    """Hammer: mecha inferior larga, vela verde."""
+    return _wick_pattern_nb(o, h, l, c, False, True,
+                            wick_min, small_body, opposite_max, wick_to_body, base, bonus)
+
+
+@njit(cache=True)
+def detect_all_patterns_nb(o, h, l, c, upper_wick_min, lower_wick_min, small_body,
+                           opposite_max, wick_to_body, base, bonus):
+    """
+    Detecta los 4 patrones en una sola llamada (features calculadas una vez).
+    
+    Returns:
+        (máscara uint8 FLAG_*, conf_shooting_star, conf_hanging_man,
+         conf_inverted_hammer, conf_hammer)
+    """
+    mask = 0
+    conf_ss = 0.0
+    conf_hm = 0.0
+    conf_ih = 0.0
+    conf_h = 0.0
+
+    (total_range, body_size, upper_wick, lower_wick, body_ratio,
+     upper_ratio, lower_ratio) = _candle_features_nb(o, h, l, c)
+    if total_range != 0:
+        upper_ok, upper_conf, _ = _long_wick_nb(
+            body_size, upper_wick, upper_ratio, lower_ratio, body_ratio,
+            upper_wick_min, small_body, opposite_max, wick_to_body, base, bonus
+        )
+        lower_ok, lower_conf, _ = _long_wick_nb(
+            body_size, lower_wick, lower_ratio, upper_ratio, body_ratio,
+            lower_wick_min, small_body, opposite_max, wick_to_body, base, bonus
+        )
+        if c > o:
+            if upper_ok:
+                mask |= FLAG_INVERTED_HAMMER
+                conf_ih = upper_conf
+            if lower_ok:
+                mask |= FLAG_HAMMER
+                conf_h = lower_conf
+        else:
+            if upper_ok:
+                mask |= FLAG_SHOOTING_STAR
+                conf_ss = upper_conf
+            if lower_ok:
+                mask |= FLAG_HANGING_MAN
+                conf_hm = lower_conf
+
+    return np.uint8(mask), conf_ss, conf_hm, conf_ih, conf_h
+
+
+@njit(cache=True, nogil=True)
+def detect_patterns_batch_nb(o, h, l, c, upper_wick_min, lower_wick_min, small_body,
+                             opposite_max, wick_to_body, base, bonus):
+    """
+    Versión batch de detect_all_patterns_nb sobre arrays OHLC (float64).
+    Libera el GIL (nogil): varios escaneos pueden correr en paralelo desde
+    un pool de hilos.
+    
+    Incluye el Candle Exhaustion de cada patrón detectado (misma regla que
+    detect_candle_exhaustion contra la vela i-1; False en la primera vela).
+    
+    Returns:
+        (máscara uint8 FLAG_*, conf_shooting_star, conf_hanging_man,
+         conf_inverted_hammer, conf_hammer, candle_exhaustion bool),
+        un array por salida
+    """
+    n = o.shape[0]
+    mask = np.zeros(n, dtype=np.uint8)
+    conf_ss = np.zeros(n)
+    conf_hm = np.zeros(n)
+    conf_ih = np.zeros(n)
+    conf_h = np.zeros(n)
+    exhaustion = np.zeros(n, dtype=np.bool_)
+
+    for i in range(n):
+        mask[i], conf_ss[i], conf_hm[i], conf_ih[i], conf_h[i] = detect_all_patterns_nb(
+            o[i], h[i], l[i], c[i], upper_wick_min, lower_wick_min, small_body,
+            opposite_max, wick_to_body, base, bonus
+        )
+        # Candle Exhaustion en la misma pasada (h/l de la vela anterior aún en caché)
+        if i > 0 and mask[i] != 0:
+            if mask[i] & (FLAG_SHOOTING_STAR | FLAG_HANGING_MAN):
+                exhaustion[i] = h[i] > h[i - 1]
+            else:
+                exhaustion[i] = l[i] < l[i - 1]
+
+    return mask, conf_ss, conf_hm, conf_ih, conf_h, exhaustion
+
+
+@njit(cache=True, parallel=True)
+def detect_patterns_batch_parallel_nb(o, h, l, c, upper_wick_min, lower_wick_min, small_body,
+                                      opposite_max, wick_to_body, base, bonus):
+    """
+    Igual que detect_patterns_batch_nb pero repartiendo las velas entre los
+    núcleos (prange): cada vela es independiente. Solo compensa el costo de
+    lanzar los hilos en datasets grandes (backtesting).
+    """
+    n = o.shape[0]
+    mask = np.zeros(n, dtype=np.uint8)
+    conf_ss = np.zeros(n)
+    conf_hm = np.zeros(n)
+    conf_ih = np.zeros(n)
+    conf_h = np.zeros(n)
+    exhaustion = np.zeros(n, dtype=np.bool_)
+
+    for i in prange(n):
+        mask[i], conf_ss[i], conf_hm[i], conf_ih[i], conf_h[i] = detect_all_patterns_nb(
+            o[i], h[i], l[i], c[i], upper_wick_min, lower_wick_min, small_body,
+            opposite_max, wick_to_body, base, bonus
+        )
+        # Candle Exhaustion en la misma pasada (h/l de la vela anterior aún en caché)
+        if i > 0 and mask[i] != 0:
+            if mask[i] & (FLAG_SHOOTING_STAR | FLAG_HANGING_MAN):
+                exhaustion[i] = h[i] > h[i - 1]
+            else:
+                exhaustion[i] = l[i] < l[i - 1]
+
+    return mask, conf_ss, conf_hm, conf_ih, conf_h, exhaustion
+
+
+# Firma de los kernels especializados: compilación anticipada (eager) para OHLC float64
+OHLC_SIGNATURE = "(float64, float64, float64, float64)"
+
+
+def specialize_pattern_kernels(upper_wick_min, lower_wick_min, small_body, opposite_max,
+                               wick_to_body, base, bonus):
+    """
+    Genera kernels con los umbrales fijados (evaluación parcial).
+    
+    Numba congela las variables de la clausura como constantes de compilación,
+    así los umbrales se pliegan en el código nativo y cada llamada solo recibe
+    OHLC (4 argumentos a convertir en lugar de 10-11). Las clausuras no admiten
+    cache=True, así que se compilan aquí mismo con firma explícita
+    (OHLC_SIGNATURE): el costo de compilación se paga al cargar la
+    configuración y no en la primera vela analizada.
+    
+    Returns:
+        (shooting_star, hanging_man, inverted_hammer, hammer, detect_all),
+        cada uno con firma (o, h, l, c)
+    """
+    @njit(OHLC_SIGNATURE)
+    def shooting_star(o, h, l, c):
+        return _shooting_star_nb(o, h, l, c, upper_wick_min, small_body, opposite_max,
+                                 wick_to_body, base, bonus)
+
+    @njit(OHLC_SIGNATURE)
+    def hanging_man(o, h, l, c):
+        return _hanging_man_nb(o, h, l, c, lower_wick_min, small_body, opposite_max,
+                               wick_to_body, base, bonus)
+
+    @njit(OHLC_SIGNATURE)
+    def inverted_hammer(o, h, l, c):
+        return _inverted_hammer_nb(o, h, l, c, upper_wick_min, small_body, opposite_max,
+                                   wick_to_body, base, bonus)
+
+    @njit(OHLC_SIGNATURE)
+    def hammer(o, h, l, c):
+        return _hammer_nb(o, h, l, c, lower_wick_min, small_body, opposite_max,
+                          wick_to_body, base, bonus)
+
+    @njit(OHLC_SIGNATURE)
+    def detect_all(o, h, l, c):
+        return detect_all_patterns_nb(o, h, l, c, upper_wick_min, lower_wick_min, small_body,
+                                      opposite_max, wick_to_body, base, bonus)
+
+    return shooting_star, hanging_man, inverted_hammer, hammer, detect_all
@@ -1,8 +1,9 @@
 """
 Analysis Service - Pattern Detection & Technical Analysis
 ==========================================================
-Gestiona el buffer de velas en pandas, calcula indicadores técnicos (EMA 200),
-detecta patrones de velas japonesas (Shooting Star) y filtra por tendencia.
+Gestiona el estado por fuente (SymbolState, con un CandleBuffer columnar de
+arrays NumPy), calcula indicadores técnicos (EMA 200), detecta patrones de
+velas japonesas (Shooting Star) y filtra por tendencia.
 
 CRITICAL: Solo emite señales cuando:
 1. Buffer tiene suficientes datos (>= EMA_PERIOD * 3)
@@ -13,20 +14,65 @@ Author: TradingView Pattern Monitor Team
 """
 
 import asyncio
+import logging
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Dict, Optional, Callable, List
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from collections import defaultdict
+from pathlib import Path
+from functools import partial
 
 import pandas as pd
 import numpy as np
 
 from config import Config
 from src.services.connection_service import CandleData
-from src.logic.candle import is_shooting_star, is_hanging_man, is_inverted_hammer, is_hammer, get_candle_direction
+from src.logic.candle import (
+    get_candle_direction,
+    get_expected_direction,
+    PATTERN_FLAGS,
+    EXPECTS_RED_MASK,
+    EXPECTS_GREEN_MASK,
+    BREAKS_HIGH_MASK,
+    FLAG_SHOOTING_STAR,
+    FLAG_HANGING_MAN,
+    FLAG_INVERTED_HAMMER,
+    FLAG_HAMMER,
+    reload_thresholds
+)
 from src.utils.logger import get_logger, log_exception
-from src.utils.charting import generate_chart_base64, validate_dataframe_for_chart
-from src.logic.signal_classifier import classify_signal
+from src.utils._json import dumps as json_dumps
+from src.utils.charting import (
+    validate_dataframe_for_chart,
+    dataframe_to_bytes,
+    generate_chart_base64_from_bytes,
+    render_chart_png_bytes_from_bytes,
+    generate_outcome_chart_base64_from_bytes
+)
+from src.logic.signal_classifier import (
+    classify_signal_codes,
+    TREND_NEUTRAL,
+    TREND_BUCKET,
+    TREND_STATUSES
+)
+from src.logic.candle_buffer import CandleBuffer
+from src.logic._analysis_njit import (
+    analyze_closed_candle_nb,
+    bollinger_exhaustion_nb,
+    trend_score_nb,
+    EXHAUSTION_TYPES,
+    EXHAUSTION_NONE
+)
+from src.utils.indicators import (
+    calculate_ema,
+    calculate_bollinger_bands,
+    calculate_rsi,
+    ema_alpha,
+    update_ema
+)
 
 
 logger = get_logger(__name__)
@@ -36,12 +82,17 @@ logger = get_logger(__name__)
 # DATA STRUCTURES
 # =============================================================================
 
+# Buckets enteros de tendencia (TREND_*, TREND_BUCKET, TREND_STATUSES):
+# definidos en signal_classifier, que indexa su matriz de decisión con ellos.
+
+
 @dataclass
 class TrendAnalysis:
     """Análisis completo de tendencia basado en sistema de puntuación ponderada."""
     status: str      # "STRONG_BULLISH", "WEAK_BULLISH", "NEUTRAL", "WEAK_BEARISH", "STRONG_BEARISH"
     score: float     # De -10.0 a +10.0 (weighted score)
     is_aligned: bool # True si EMAs están ordenadas correctamente
+    bucket: int = TREND_NEUTRAL  # TREND_BUCKET[status] (< NEUTRAL alcista, > NEUTRAL bajista)
     
     def __str__(self) -> str:
         """Representación legible para logs."""
@@ -84,13 +135,64 @@ class PatternSignal:
     rsi_val: Optional[float] = None  # Valor del RSI (v8.0)
 
 
+@dataclass(slots=True)
+class SymbolState:
+    """
+    Estado por fuente (source_key) del AnalysisService en un único objeto.
+    
+    Reemplaza los diccionarios paralelos indexados por source_key (buffers,
+    timestamps, inicialización, estado de EMAs): el hot path resuelve el
+    estado una sola vez por vela y luego solo accede a atributos.
+    """
+    key: str  # source_key (ej: "OANDA_EURUSD")
+    source: str
+    symbol: str
+    buffer: CandleBuffer
+    last_timestamp: int = -1  # Última vela procesada (-1: ninguna; detecta cierres)
+    initialized: bool = False  # Velas suficientes para detectar patrones
+    ema_state: Optional[tuple] = None  # (timestamp, EMAs de la penúltima vela)
+    # Serializa la emisión de señales de esta fuente entre los workers
+    emit_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+# Columnas de EMAs del buffer (orden fijo para lecturas estructuradas)
+EMA_COLUMNS = ("ema_3", "ema_5", "ema_7", "ema_10", "ema_15", "ema_20", "ema_30", "ema_50")
+EMA_PERIODS = (3, 5, 7, 10, 15, 20, 30, 50)
+EMA_ALPHAS = np.array([ema_alpha(period) for period in EMA_PERIODS], dtype=np.float64)
+
+# Esquema del buffer por fuente (CandleBuffer) con dtypes nativos: un array
+# NumPy preasignado por columna; también define columnas y dtypes de los
+# DataFrames que se generan para los gráficos.
+BUFFER_DTYPES = {
+    "timestamp": np.int64,
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "volume": np.float64,
+    **{column: np.float64 for column in EMA_COLUMNS},
+    "bb_middle": np.float64,
+    "bb_upper": np.float64,
+    "bb_lower": np.float64,
+    "rsi": np.float64,
+}
+
+# Archivo de velas detectadas (una línea JSON por vela)
+TEST_DATA_FILE = Path("test") / "test_data.jsonl"
+
+# Patrón -> tipo_vela del formato de test_data
+TEST_DATA_PATTERN_NAMES = {
+    "SHOOTING_STAR": "shooting_star",
+    "HANGING_MAN": "hanging_man",
+    "INVERTED_HAMMER": "inverted_hammer",
+    "HAMMER": "hammer"
+}
+
+
 # =============================================================================
 # TECHNICAL ANALYSIS HELPERS
 # =============================================================================
 
-from src.utils.indicators import calculate_ema, calculate_bollinger_bands, calculate_rsi
-
-
 def detect_exhaustion(candle_high: float, candle_low: float, candle_close: float, 
                       upper_band: float, lower_band: float) -> str:
     """
@@ -111,20 +213,11 @@ def detect_exhaustion(candle_high: float, candle_low: float, candle_close: float
     Returns:
         str: "PEAK", "BOTTOM" o "NONE"
     """
-    # Si alguna banda es NaN, no podemos determinar agotamiento
-    if pd.isna(upper_band) or pd.isna(lower_band):
-        return "NONE"
-    
-    # Verificar si está en Cúspide (agotamiento alcista)
-    if candle_high >= upper_band or candle_close >= upper_band:
-        return "PEAK"
-    
-    # Verificar si está en Base (agotamiento bajista)
-    if candle_low <= lower_band or candle_close <= lower_band:
-        return "BOTTOM"
-    
-    # Zona neutra
-    return "NONE"
+    # Bandas NaN -> "NONE" (ver bollinger_exhaustion_nb)
+    return EXHAUSTION_TYPES[bollinger_exhaustion_nb(
+        float(candle_high), float(candle_low), float(candle_close),
+        float(upper_band), float(lower_band)
+    )]
 
 
 def get_candle_result_debug(
@@ -148,13 +241,15 @@ def get_candle_result_debug(
         String con información de debug formateada
     """
     # Determinar si es tendencia alcista o bajista
-    is_bullish_trend = "BULLISH" in trend_status
-    is_bearish_trend = "BEARISH" in trend_status
-    is_neutral = trend_status == "NEUTRAL"
+    trend_bucket = TREND_BUCKET.get(trend_status, TREND_NEUTRAL)
+    is_bullish_trend = trend_bucket < TREND_NEUTRAL
+    is_bearish_trend = trend_bucket > TREND_NEUTRAL
+    is_neutral = trend_bucket == TREND_NEUTRAL
     
     # Determinar si el patrón es bajista o alcista
-    pattern_is_bearish = pattern in ["SHOOTING_STAR", "INVERTED_HAMMER"]
-    pattern_is_bullish = pattern in ["HAMMER", "HANGING_MAN"]
+    pattern_flag = PATTERN_FLAGS.get(pattern, 0)
+    pattern_is_bearish = bool(pattern_flag & EXPECTS_RED_MASK)
+    pattern_is_bullish = bool(pattern_flag & EXPECTS_GREEN_MASK)
     
     # Construir mensaje
     lines = []
@@ -237,119 +332,28 @@ def analyze_trend(close: float, emas: Dict[str, float], prev_emas: Optional[Dict
     Returns:
         TrendAnalysis con estado, score (float) e is_aligned
     """
-    # Inicializar componentes
-    score_structure = 0.0
-    score_velocity = 0.0
-    score_momentum = 0.0
-    
-    # Obtener EMAs actuales
-    ema_3 = emas.get('ema_3', np.nan)
-    ema_5 = emas.get('ema_5', np.nan)
-    ema_20 = emas.get('ema_20', np.nan)
-    
-    # 1. ESTRUCTURA (ALINEACIÓN) - Max 3.0 pts
-    # Verifica la "salud" geométrica de la tendencia
-    is_bullish_structure = False
-    is_bearish_structure = False
-    
-    # Usamos EMA 5 en lugar de EMA 7 para mayor reactividad en M1
-    ema_5 = emas.get('ema_5', np.nan)
-    
-    if not pd.isna(ema_3) and not pd.isna(ema_5) and not pd.isna(ema_20):
-        if ema_3 > ema_5 > ema_20:
-            is_bullish_structure = True
-            score_structure = 3.0
-        elif ema_3 < ema_5 < ema_20:
-            is_bearish_structure = True
-            score_structure = -3.0
-            
-    # 2. CÁLCULO DE SLOPE (VELOCIDAD PORCENTUAL)
-    slope_3 = 0.0
-    slope_5 = 0.0
-    slope_20 = 0.0
-    
-    if prev_emas:
-        prev_ema_3 = prev_emas.get('ema_3', np.nan)
-        prev_ema_5 = prev_emas.get('ema_5', np.nan)
-        prev_ema_20 = prev_emas.get('ema_20', np.nan)
-        
-        # Calcular pendientes como % de cambio: (curr - prev) / prev
-        if not pd.isna(ema_3) and not pd.isna(prev_ema_3) and prev_ema_3 != 0:
-            slope_3 = (ema_3 - prev_ema_3) / prev_ema_3
-        if not pd.isna(ema_5) and not pd.isna(prev_ema_5) and prev_ema_5 != 0:
-            slope_5 = (ema_5 - prev_ema_5) / prev_ema_5
-        if not pd.isna(ema_20) and not pd.isna(prev_ema_20) and prev_ema_20 != 0:
-            slope_20 = (ema_20 - prev_ema_20) / prev_ema_20
-            
-    # 3. VELOCIDAD BASE (EMA 20) - Max 2.0 pts
-    # Define la dirección de fondo de la micro-tendencia
-    if slope_20 > Config.SLOPE_THRESHOLD_PCT:
-        score_velocity = 2.0
-    elif slope_20 < -Config.SLOPE_THRESHOLD_PCT:
-        score_velocity = -2.0
-        
-    # 4. MOMENTUM Y DETECCIÓN DE AGOTAMIENTO - Max 5.0 pts
-    # Aquí es donde detectamos si la tendencia se está cansando
-    
-    # Análisis para Estructura ALCISTA
-    if is_bullish_structure:
-        # Si EMA 3 y 5 tienen fuerza, sumamos momentum
-        if slope_3 > Config.SLOPE_THRESHOLD_PCT:
-            score_momentum += 3.0
-        elif slope_3 < Config.SLOPE_THRESHOLD_PCT: # Aplanamiento o reversión de EMA 3
-            # PENALIZACIÓN POR AGOTAMIENTO: Estructura alcista pero EMA 3 perdiendo fuerza
-            score_momentum -= 2.0 
-            
-        if slope_5 > Config.SLOPE_THRESHOLD_PCT:
-            score_momentum += 2.0
-            
-    # Análisis para Estructura BAJISTA
-    elif is_bearish_structure:
-        # Si EMA 3 y 5 tienen fuerza bajista, restamos momentum (sumamos negativo)
-        if slope_3 < -Config.SLOPE_THRESHOLD_PCT:
-            score_momentum -= 3.0
-        elif slope_3 > -Config.SLOPE_THRESHOLD_PCT: # Aplanamiento o reversión de EMA 3
-            # PENALIZACIÓN POR AGOTAMIENTO: Estructura bajista pero EMA 3 perdiendo fuerza
-            score_momentum += 2.0 # Sumar puntos para acercar el score a 0
-            
-        if slope_5 < -Config.SLOPE_THRESHOLD_PCT:
-            score_momentum -= 2.0
-            
-    # Análisis sin Estructura definida (Rango/Cruce)
-    else:
-        # Solo sumamos puntos por slope puro, pero con menos peso
-        if slope_3 > Config.SLOPE_THRESHOLD_PCT: score_momentum += 1.5
-        elif slope_3 < -Config.SLOPE_THRESHOLD_PCT: score_momentum -= 1.5
-        
-        if slope_5 > Config.SLOPE_THRESHOLD_PCT: score_momentum += 1.0
-        elif slope_5 < -Config.SLOPE_THRESHOLD_PCT: score_momentum -= 1.0
-
-    # SUMA TOTAL
-    total_score = score_structure + score_velocity + score_momentum
-    
-    # Limitar score a rango [-10, 10]
-    total_score = max(min(total_score, 10.0), -10.0)
-    total_score = round(total_score, 1)
+    # El cálculo numérico vive en trend_score_nb (compartido con el kernel fusionado)
+    nan = np.nan
+    has_prev = bool(prev_emas)
+    if not has_prev:
+        prev_emas = {}
     
-    # Clasificar tendencia según umbrales (V7.1)
-    if total_score >= 8.0:
-        status = "STRONG_BULLISH"
-    elif total_score >= 5.0:
-        status = "WEAK_BULLISH"
-    elif total_score > -5.0:
-        status = "NEUTRAL"
-    elif total_score > -8.0:
-        status = "WEAK_BEARISH"
-    else:
-        status = "STRONG_BEARISH"
-    
-    # Verificar alineación perfecta para el return
-    is_aligned = is_bullish_structure or is_bearish_structure
+    total_score, bucket, is_aligned = trend_score_nb(
+        float(emas.get('ema_3', nan)),
+        float(emas.get('ema_5', nan)),
+        float(emas.get('ema_20', nan)),
+        float(prev_emas.get('ema_3', nan)),
+        float(prev_emas.get('ema_5', nan)),
+        float(prev_emas.get('ema_20', nan)),
+        has_prev,
+        float(Config.SLOPE_THRESHOLD_PCT)
+    )
     
     return TrendAnalysis(
-        status=status,
-        score=total_score,
-        is_aligned=is_aligned
+        status=TREND_STATUSES[bucket],
+        score=float(total_score),
+        is_aligned=bool(is_aligned),
+        bucket=int(bucket)
     )
 
 
@@ -443,7 +447,7 @@ class AnalysisService:
     Servicio de análisis técnico y detección de patrones.
     
     Responsabilidades:
-    - Mantener buffer de velas en pandas DataFrames
+    - Mantener el estado por fuente (SymbolState) con su buffer de velas (CandleBuffer)
     - Calcular EMA 200 en tiempo real
     - Detectar cierre de velas (cambio de timestamp)
     - Identificar patrones de velas japonesas
@@ -473,32 +477,85 @@ class AnalysisService:
         self.telegram_service = telegram_service
         self.statistics_service = statistics_service
         
-        # Buffers separados por fuente (OANDA, FX)
-        self.dataframes: Dict[str, pd.DataFrame] = {}
-        
-        # Tracking de última vela procesada (para detectar cierres)
-        self.last_timestamps: Dict[str, int] = {}
-        
-        # Estado de inicialización
-        self.is_initialized: Dict[str, bool] = defaultdict(bool)
+        # Estado por fuente (OANDA, FX): buffer columnar, último timestamp,
+        # inicialización y estado incremental de EMAs (ver SymbolState)
+        self._states: Dict[str, SymbolState] = {}
         
         # State Machine: Señal pendiente esperando resolución
         # Key: source_key, Value: PatternSignal
         self.pending_signals: Dict[str, PatternSignal] = {}
         
+        # Velas agregadas a test/test_data.jsonl en esta sesión
+        self._test_data_written = 0
+        
+        # Directorios ya creados (evita el syscall de mkdir en cada gráfico)
+        self._created_dirs: set = set()
+        
         # Configuración
         self.ema_period = Config.EMA_PERIOD
         self.min_candles_required = Config.EMA_PERIOD * 3
         self.chart_lookback = Config.CHART_LOOKBACK
+        self.refresh_config()
+        
+        # Pool de procesos persistente para render de gráficos.
+        # Matplotlib retiene el GIL: con asyncio.to_thread() los gráficos de varios
+        # símbolos que cierran en el mismo minuto se serializan. Con procesos, N
+        # símbolos se renderizan en N cores en paralelo. Se usa "spawn" para no
+        # hacer fork de un proceso con hilos activos (event loop, aiohttp).
+        chart_workers = max(1, min(os.cpu_count() or 1, len(Config.TARGET_ASSETS)))
+        self._chart_pool = ProcessPoolExecutor(
+            max_workers=chart_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        
+        # Pool de hilos compartido para el trabajo por fuente que sigue en el
+        # proceso principal (escrituras a disco de gráficos y test_data). Se
+        # crea una sola vez: varias fuentes que cierran vela a la vez se
+        # reparten entre sus hilos en lugar de competir por el pool por
+        # defecto de asyncio.to_thread().
+        thread_workers = os.cpu_count() or 1
+        self._thread_pool = ThreadPoolExecutor(
+            max_workers=thread_workers,
+            thread_name_prefix="analysis"
+        )
+        
+        # Cola acotada de señales consumida por Config.SIGNAL_WORKERS workers
+        # fijos (por defecto uno por activo) en lugar de una tarea
+        # fire-and-forget por señal: backpressure explícita y excepciones
+        # registradas en un único lugar. Con la cola llena se descartan nuevas
+        # señales. Fuentes distintas se emiten en paralelo; las de una misma
+        # fuente, en orden (SymbolState.emit_lock). Los workers se lanzan con
+        # la primera señal (el servicio se construye fuera del loop).
+        self._signal_queue: asyncio.Queue = asyncio.Queue(maxsize=Config.SIGNAL_QUEUE_SIZE)
+        self._signal_worker_count = Config.SIGNAL_WORKERS
+        self._signal_workers: List[asyncio.Task] = []
         
         logger.info(
             f"📊 Analysis Service inicializado "
             f"(Período EMA: {self.ema_period}, Storage: {'✓' if storage_service else '✗'})"
         )
     
+    def refresh_config(self) -> None:
+        """
+        Copia en atributos locales los flags de Config consultados en cada vela.
+        
+        Evita la cadena de lookups (Config.TELEGRAM.send_charts, etc.) en el hot
+        path. Debe invocarse de nuevo si Config se modifica en caliente.
+        """
+        self._use_trend_filter = Config.USE_TREND_FILTER
+        self._send_charts = Config.TELEGRAM.send_charts
+        self._send_none_signals = Config.TELEGRAM.send_none_signal_notifications
+        self._send_outcome_charts = Config.TELEGRAM.send_outcome_charts
+        self._generate_historical_charts = Config.GENERATE_HISTORICAL_CHARTS
+        self._update_test_data = Config.UPDATE_TEST_DATA
+        self._candle_cfg = Config.CANDLE
+        self._pattern_thresholds = reload_thresholds()
+        self._slope_threshold = float(Config.SLOPE_THRESHOLD_PCT)
+        self._rsi_period = Config.RSI_PERIOD
+    
     def load_historical_candles(self, candles: List[CandleData]) -> None:
         """
-        Carga velas históricas (snapshot inicial) en el DataFrame.
+        Carga velas históricas (snapshot inicial) en el buffer de la fuente.
         NO genera gráficos ni envía notificaciones.
         
         Args:
@@ -511,23 +568,21 @@ class AnalysisService:
         first_candle = candles[0]
         source_key = f"{first_candle.source}_{first_candle.symbol}"
         
-        # Inicializar DataFrame si no existe
-        if source_key not in self.dataframes:
-            self._initialize_dataframe(source_key)
+        # Inicializar estado si no existe
+        state = self._states.get(source_key) or self._init_state(source_key)
         
         logger.info(f"📥 Cargando {len(candles)} velas históricas para {source_key}...")
         
-        # Agregar todas las velas al DataFrame en batch
-        for candle in candles:
-            self._add_new_candle(source_key, candle)
+        # Agregar todas las velas al buffer en bloque (una copia por columna)
+        self._add_historical_candles(state, candles)
         
-        # Calcular indicadores una sola vez al final
-        self._update_indicators(source_key)
+        # Calcular indicadores una sola vez al final (recálculo completo del histórico)
+        self._update_indicators(state, full_recompute=True)
         
         # Marcar como inicializado si tiene suficientes velas
-        candle_count = len(self.dataframes[source_key])
+        candle_count = len(state.buffer)
         if candle_count >= self.min_candles_required:
-            self.is_initialized[source_key] = True
+            state.initialized = True
             logger.info(
                 f"✅ {source_key} initialized with {candle_count} historical candles. "
                 "Pattern detection ACTIVE."
@@ -540,7 +595,7 @@ class AnalysisService:
         
         # Actualizar último timestamp
         if candles:
-            self.last_timestamps[source_key] = candles[-1].timestamp
+            state.last_timestamp = candles[-1].timestamp
     
     async def process_realtime_candle(self, candle: CandleData) -> None:
         """
@@ -558,12 +613,12 @@ class AnalysisService:
         """
         source_key = f"{candle.source}_{candle.symbol}"
         
-        # Inicializar DataFrame si no existe
-        if source_key not in self.dataframes:
-            self._initialize_dataframe(source_key)
+        # Estado de la fuente resuelto una sola vez para toda la vela
+        state = self._states.get(source_key) or self._init_state(source_key)
         
-        # Detectar si es un cierre de vela (timestamp diferente)
-        is_new_candle = self._is_new_candle(source_key, candle.timestamp)
+        # Detectar si es un cierre de vela (timestamp diferente): una
+        # comparación de enteros sobre el estado ya resuelto
+        is_new_candle = candle.timestamp != state.last_timestamp
         
         if is_new_candle:
             # ═════════════════════════════════════════════════════════════
@@ -604,14 +659,14 @@ class AnalysisService:
             # ═════════════════════════════════════════════════════════════
             # PASO 2: AGREGAR NUEVA VELA Y CALCULAR INDICADORES
             # ═════════════════════════════════════════════════════════════
-            self._add_new_candle(source_key, candle)
-            self._update_indicators(source_key)
+            self._add_new_candle(state, candle)
+            self._update_indicators(state)
             
             # Verificar si hay suficientes datos para análisis
-            if not self.is_initialized[source_key]:
-                candle_count = len(self.dataframes[source_key])
+            if not state.initialized:
+                candle_count = len(state.buffer)
                 if candle_count >= self.min_candles_required:
-                    self.is_initialized[source_key] = True
+                    state.initialized = True
                     logger.info(
                         f"✅ {source_key} initialized with {candle_count} candles. "
                         "Pattern detection ACTIVE."
@@ -626,130 +681,156 @@ class AnalysisService:
             # ═════════════════════════════════════════════════════════════
             # PASO 3: ANALIZAR NUEVA VELA Y ABRIR NUEVO CICLO
             # ═════════════════════════════════════════════════════════════
-            asyncio.create_task(self._analyze_last_closed_candle(source_key, candle, force_notification=False))
+            # Detección síncrona (µs de trabajo): solo se agenda una tarea si
+            # hay una señal para notificar (gráfico, estadísticas, Telegram)
+            signal = self._detect_pattern_sync(state, candle, force_notification=False)
+            if signal is not None:
+                # Snapshot (ventana visible) tomado ahora, consistente con las velas analizadas
+                chart_df = state.buffer.to_dataframe(tail=self.chart_lookback) if self._send_charts else None
+                self._enqueue_signal(source_key, signal, chart_df)
             
             # PASO 4: GENERAR GRÁFICO SI ESTÁ HABILITADO (Config.GENERATE_HISTORICAL_CHARTS)
-            if Config.GENERATE_HISTORICAL_CHARTS:
+            if self._generate_historical_charts:
                 asyncio.create_task(self._generate_realtime_chart(source_key, candle))
         
         else:
             # Actualizar la vela actual (tick intra-candle)
-            self._update_current_candle(source_key, candle)
+            self._update_current_candle(state, candle)
         
         # Actualizar timestamp de tracking
-        self.last_timestamps[source_key] = candle.timestamp
+        state.last_timestamp = candle.timestamp
     
-    def _initialize_dataframe(self, source_key: str) -> None:
+    def _init_state(self, source_key: str) -> SymbolState:
         """
-        Inicializa un DataFrame vacío para una fuente de datos.
+        Registra una fuente de datos con un buffer vacío.
         
         Args:
             source_key: Clave única de la fuente (ej: "OANDA_EURUSD")
-        """
-        self.dataframes[source_key] = pd.DataFrame(columns=[
-            "timestamp", "open", "high", "low", "close", "volume", 
-            "ema_3", "ema_5", "ema_7", "ema_10", "ema_15", "ema_20", "ema_30", "ema_50",
-            "bb_middle", "bb_upper", "bb_lower", "rsi"
-        ])
-        logger.debug(f"📋 DataFrame inicializado para {source_key}")
-    
-    def _is_new_candle(self, source_key: str, timestamp: int) -> bool:
-        """
-        Determina si la vela recibida es nueva (timestamp diferente).
-        
-        Args:
-            source_key: Clave de la fuente
-            timestamp: Timestamp de la vela recibida
             
         Returns:
-            bool: True si es una nueva vela
+            SymbolState: Estado recién creado
         """
-        if source_key not in self.last_timestamps:
-            return True
-        
-        return timestamp != self.last_timestamps[source_key]
+        # Extraer source y symbol del source_key (formato: "SOURCE_SYMBOL")
+        source, symbol = (
+            source_key.split("_", 1) if "_" in source_key else (source_key, "UNKNOWN")
+        )
+        state = SymbolState(
+            key=source_key,
+            source=source,
+            symbol=symbol,
+            # Mantener solo las últimas N velas (optimización de memoria)
+            buffer=CandleBuffer(
+                max_size=self.min_candles_required + 100,
+                dtypes=BUFFER_DTYPES
+            )
+        )
+        self._states[source_key] = state
+        logger.debug(f"📋 Buffer inicializado para {source_key}")
+        return state
     
-    def _add_new_candle(self, source_key: str, candle: CandleData) -> None:
+    def _add_new_candle(self, state: SymbolState, candle: CandleData) -> None:
         """
-        Agrega una vela cerrada al buffer de pandas.
+        Agrega una vela cerrada al buffer.
         Si el timestamp ya existe (última vela), actualiza sus valores.
-        Si es nueva, la agrega y mantiene el tamaño del buffer.
+        Si es nueva, la agrega (el buffer descarta la más vieja al superar su tamaño).
         
         Args:
-            source_key: Clave de la fuente
+            state: Estado de la fuente
             candle: Datos de la vela
         """
-        df = self.dataframes[source_key]
+        buffer = state.buffer
         
-        # Verificar si el DataFrame no está vacío y si el último timestamp coincide
-        if not df.empty and df.iloc[-1]["timestamp"] == candle.timestamp:
+        # Verificar si el buffer no está vacío y si el último timestamp coincide
+        if len(buffer) and buffer.last("timestamp") == candle.timestamp:
             # ACTUALIZAR vela existente (Update in place)
-            idx = df.index[-1]
-            df.at[idx, "open"] = candle.open
-            df.at[idx, "high"] = candle.high
-            df.at[idx, "low"] = candle.low
-            df.at[idx, "close"] = candle.close
-            df.at[idx, "volume"] = candle.volume
+            buffer.column("open")[-1] = candle.open
+            buffer.column("high")[-1] = candle.high
+            buffer.column("low")[-1] = candle.low
+            buffer.column("close")[-1] = candle.close
+            buffer.column("volume")[-1] = candle.volume
             # Nota: Los indicadores se recalcularán en _update_indicators
-            # logger.debug(f"🔄 Vela actualizada en buffer para {source_key} (T={candle.timestamp})")
             return
 
-        # Si no existe, crear nueva fila
-        new_row = pd.DataFrame([{
+        # Si no existe, escribir nueva fila (indicadores en NaN)
+        buffer.append({
             "timestamp": candle.timestamp,
             "open": candle.open,
             "high": candle.high,
             "low": candle.low,
             "close": candle.close,
             "volume": candle.volume,
-            "ema_3": np.nan,
-            "ema_5": np.nan,
-            "ema_7": np.nan,
-            "ema_10": np.nan,
-            "ema_15": np.nan,
-            "ema_20": np.nan,
-            "ema_30": np.nan,
-            "ema_50": np.nan,
-            "bb_middle": np.nan,
-            "bb_upper": np.nan,
-            "bb_lower": np.nan,
-            "rsi": np.nan
-        }])
-        
-        self.dataframes[source_key] = pd.concat(
-            [self.dataframes[source_key], new_row],
-            ignore_index=True
-        )
+        })
+    
+    def _add_historical_candles(self, state: SymbolState, candles: List[CandleData]) -> None:
+        """
+        Agrega un bloque de velas históricas al buffer de forma vectorizada.
+        
+        Mismo resultado que llamar _add_new_candle vela por vela: timestamps
+        consecutivos repetidos quedan en una sola fila con los valores de la
+        última, y si la primera coincide con la última vela del buffer la
+        actualiza in-place.
         
-        # Mantener solo las últimas N velas (optimización de memoria)
-        max_buffer_size = self.min_candles_required + 100
-        if len(self.dataframes[source_key]) > max_buffer_size:
-            self.dataframes[source_key] = self.dataframes[source_key].iloc[-max_buffer_size:]
-            self.dataframes[source_key].reset_index(drop=True, inplace=True)
+        Args:
+            state: Estado de la fuente
+            candles: Velas históricas en orden cronológico
+        """
+        buffer = state.buffer
+        timestamps = np.fromiter((candle.timestamp for candle in candles), dtype=np.int64, count=len(candles))
+        ohlcv = np.array(
+            [(candle.open, candle.high, candle.low, candle.close, candle.volume) for candle in candles],
+            dtype=np.float64
+        ).reshape(-1, 5)
+        
+        # Última vela de cada tramo de timestamps iguales (update in place)
+        keep = np.ones(len(candles), dtype=bool)
+        keep[:-1] = timestamps[1:] != timestamps[:-1]
+        timestamps = timestamps[keep]
+        ohlcv = ohlcv[keep]
+        
+        # La primera vela del bloque actualiza la última del buffer si coincide
+        if len(buffer) and len(timestamps) and buffer.last("timestamp") == timestamps[0]:
+            for index, column in enumerate(("open", "high", "low", "close", "volume")):
+                buffer.column(column)[-1] = ohlcv[0, index]
+            timestamps = timestamps[1:]
+            ohlcv = ohlcv[1:]
+        
+        buffer.extend({
+            "timestamp": timestamps,
+            "open": ohlcv[:, 0],
+            "high": ohlcv[:, 1],
+            "low": ohlcv[:, 2],
+            "close": ohlcv[:, 3],
+            "volume": ohlcv[:, 4],
+        })
     
-    def _update_current_candle(self, source_key: str, candle: CandleData) -> None:
+    def _update_current_candle(self, state: SymbolState, candle: CandleData) -> None:
         """
         Actualiza los valores de la vela actual (intra-candle ticks).
         
         Args:
-            source_key: Clave de la fuente
+            state: Estado de la fuente
             candle: Datos actualizados de la vela
         """
-        df = self.dataframes[source_key]
-        if len(df) == 0:
+        buffer = state.buffer
+        if len(buffer) == 0:
             return
         
-        indexToSearch = -1  # Última fila
         # Actualizar última fila
-        df.iloc[indexToSearch, df.columns.get_loc("high")] = max(df.iloc[indexToSearch]["high"], candle.high)
-        df.iloc[indexToSearch, df.columns.get_loc("low")] = min(df.iloc[indexToSearch]["low"], candle.low)
-        df.iloc[indexToSearch, df.columns.get_loc("close")] = candle.close
-        df.iloc[indexToSearch, df.columns.get_loc("volume")] += candle.volume
+        high = buffer.column("high")
+        low = buffer.column("low")
+        high[-1] = max(high[-1], candle.high)
+        low[-1] = min(low[-1], candle.low)
+        buffer.column("close")[-1] = candle.close
+        buffer.column("volume")[-1] += candle.volume
     
-    def _update_indicators(self, source_key: str) -> None:
+    def _update_indicators(self, state: SymbolState, full_recompute: bool = False) -> None:
         """
         Recalcula los indicadores técnicos para estrategia Mean Reversion.
         
+        Las EMAs se actualizan de forma incremental (O(1) por vela) a partir del
+        estado guardado de la vela anterior; el recálculo completo con ewm solo
+        se hace al cargar el histórico o si el estado no corresponde al buffer.
+        
         EMAs Calculadas (Sistema Ponderado):
         - EMA 5:  2.0 puntos - Ultra rápida
         - EMA 7:  2.0 puntos - Muy rápida
@@ -760,65 +841,107 @@ class AnalysisService:
         - EMA 50: 1.0 punto  - Lenta
         
         Args:
-            source_key: Clave de la fuente
+            state: Estado de la fuente
+            full_recompute: Si True, ignora el estado incremental y recalcula todo
         """
-        df = self.dataframes[source_key]
-        
-        # Calcular EMAs sobre precios de cierre (sistema ponderado)
-        # EMA 3 - Ultra rápida (peso: 3.0)
-        if len(df) >= 3:
-            df["ema_3"] = calculate_ema(df["close"], 3)
-
-        # EMA 5 - Ultra rápida (peso: 2.5)
-        if len(df) >= 5:
-            df["ema_5"] = calculate_ema(df["close"], 5)
+        buffer = state.buffer
         
-        # EMA 7 - Muy rápida (peso: 2.0)
-        if len(df) >= 7:
-            df["ema_7"] = calculate_ema(df["close"], 7)
+        # EMAs: recurrencia incremental si hay estado de la vela anterior
+        if full_recompute or not self._update_emas_incremental(state):
+            self._recompute_emas(state)
         
-        # EMA 10 - Rápida (peso: 1.5)
-        if len(df) >= 10:
-            df["ema_10"] = calculate_ema(df["close"], 10)
-        
-        # EMA 15 - Rápida-Media (peso: 1.5)
-        if len(df) >= 15:
-            df["ema_15"] = calculate_ema(df["close"], 15)
-        
-        # EMA 20 - Media (peso: 1.0)
-        if len(df) >= 20:
-            df["ema_20"] = calculate_ema(df["close"], 20)
-        
-        # EMA 30 - Media-Lenta (peso: 1.0)
-        if len(df) >= 30:
-            df["ema_30"] = calculate_ema(df["close"], 30)
-        
-        # EMA 50 - Lenta (peso: 1.0)
-        if len(df) >= 50:
-            df["ema_50"] = calculate_ema(df["close"], 50)
-
-        # EMA 200 ELIMINADA (Lag excesivo)
-        # if len(df) >= 200:
-        #     df["ema_200"] = calculate_ema(df["close"], 200)
+        # Bandas y RSI usan los indicadores de pandas sobre el cierre
+        # (Serie construida una vez sobre la columna del buffer)
+        candle_count = len(buffer)
+        close_series = pd.Series(buffer.column("close"))
         
         # Calcular Bollinger Bands (requiere al menos BB_PERIOD velas)
-        bb_period = Config.CANDLE.BB_PERIOD
-        bb_std_dev = Config.CANDLE.BB_STD_DEV
+        bb_period = self._candle_cfg.BB_PERIOD
+        bb_std_dev = self._candle_cfg.BB_STD_DEV
         
-        if len(df) >= bb_period:
+        if candle_count >= bb_period:
             bb_middle, bb_upper, bb_lower = calculate_bollinger_bands(
-                df["close"], 
+                close_series, 
                 period=bb_period, 
                 std_dev=bb_std_dev
             )
-            df["bb_middle"] = bb_middle
-            df["bb_upper"] = bb_upper
-            df["bb_lower"] = bb_lower
+            buffer.column("bb_middle")[:] = bb_middle.to_numpy()
+            buffer.column("bb_upper")[:] = bb_upper.to_numpy()
+            buffer.column("bb_lower")[:] = bb_lower.to_numpy()
             
         # Calcular RSI (v8.0)
-        rsi_period = Config.RSI_PERIOD
-        if len(df) >= rsi_period + 1:
-            df["rsi"] = calculate_rsi(df["close"], period=rsi_period)
+        rsi_period = self._rsi_period
+        if candle_count >= rsi_period + 1:
+            buffer.column("rsi")[:] = calculate_rsi(close_series, period=rsi_period).to_numpy()
+    
+    def _update_emas_incremental(self, state: SymbolState) -> bool:
+        """
+        Actualiza las EMAs de las últimas velas con la recurrencia O(1).
+        
+        El estado guarda las EMAs de la penúltima vela del buffer (una vez que
+        llega la vela siguiente ya no recibe ticks). Tras agregar una vela se
+        recalculan la anterior (pudo recibir ticks) y la nueva; tras actualizar
+        la última in-place, solo la última.
+        
+        Args:
+            state: Estado de la fuente
+            
+        Returns:
+            bool: False si no hay estado válido (requiere recálculo completo)
+        """
+        buffer = state.buffer
+        candle_count = len(buffer)
+        if state.ema_state is None or candle_count < 3:
+            return False
+        
+        state_timestamp, ema_values = state.ema_state
+        timestamps = buffer.column("timestamp")
+        if timestamps[-3] == state_timestamp:
+            start = candle_count - 2
+        elif timestamps[-2] == state_timestamp:
+            start = candle_count - 1
+        else:
+            return False
+        
+        closes = buffer.column("close")
+        ema_arrays = [buffer.column(column) for column in EMA_COLUMNS]
+        
+        for row in range(start, candle_count):
+            ema_values = update_ema(ema_values, closes[row], EMA_ALPHAS)
+            for array, value in zip(ema_arrays, ema_values):
+                array[row] = value
+            if row == candle_count - 2:
+                state.ema_state = (timestamps[row], ema_values)
+        
+        return True
+    
+    def _recompute_emas(self, state: SymbolState) -> None:
+        """
+        Recalcula todas las EMAs sobre el buffer completo y siembra el estado incremental.
+        
+        Sistema ponderado: EMA 3/5 ultra rápidas, 7 muy rápida, 10/15 rápidas,
+        20/30 medias y 50 lenta (EMA 200 eliminada por lag excesivo). Cada EMA
+        se calcula solo si hay al menos `period` velas.
+        
+        Args:
+            state: Estado de la fuente
+        """
+        buffer = state.buffer
+        candle_count = len(buffer)
+        close_series = pd.Series(buffer.column("close"))
+        
+        for column, period in zip(EMA_COLUMNS, EMA_PERIODS):
+            if candle_count >= period:
+                buffer.column(column)[:] = calculate_ema(close_series, period).to_numpy()
+        
+        # Sembrar el estado incremental con la penúltima vela (todas las EMAs definidas)
+        if candle_count >= EMA_PERIODS[-1]:
+            state.ema_state = (
+                buffer.column("timestamp")[-2],
+                np.array([buffer.column(column)[-2] for column in EMA_COLUMNS], dtype=np.float64)
+            )
+        else:
+            state.ema_state = None
     
     async def _close_signal_cycle(self, source_key: str, outcome_candle: CandleData) -> None:
         """
@@ -869,13 +992,9 @@ class AnalysisService:
         # Determinar dirección esperada según tipo de patrón
         # BAJISTA (reversión bajista): Shooting Star, Inverted Hammer
         # ALCISTA (reversión alcista): Hammer, Hanging Man
-        if pending_signal.pattern in ["SHOOTING_STAR", "INVERTED_HAMMER"]:
-            expected_direction = "ROJA"  # Bajista
-        elif pending_signal.pattern in ["HAMMER", "HANGING_MAN"]:
-            expected_direction = "VERDE"  # Alcista
-        else:
+        expected_direction = get_expected_direction(pending_signal.pattern)
+        if expected_direction == "UNKNOWN":
             logger.warning(f"⚠️  Patrón desconocido: {pending_signal.pattern}")
-            expected_direction = "UNKNOWN"
         
         # Determinar dirección actual de la vela de resultado usando la función de candle.py
         actual_direction = get_candle_direction(outcome_candle.open, outcome_candle.close)
@@ -899,7 +1018,6 @@ class AnalysisService:
         ema_order = get_ema_order_string(pending_signal.candle.close, emas_dict)
         
         # Construir registro completo con nueva estructura optimizada
-        from datetime import datetime
         record = {
             "timestamp": pending_signal.timestamp,
             "source": pending_signal.source,
@@ -977,22 +1095,26 @@ class AnalysisService:
                 chart_base64 = None
                 
                 # 1. Decidir qué gráfico enviar
-                if Config.TELEGRAM.send_outcome_charts:
+                if self._send_outcome_charts:
                     # Generar NUEVO gráfico incluyendo la vela de resultado
                     try:
-                        df_current = self.dataframes.get(source_key)
-                        if df_current is not None and not df_current.empty:
+                        state = self._states.get(source_key)
+                        candle_buffer = state.buffer if state is not None else None
+                        if candle_buffer is not None and len(candle_buffer):
+                            df_current = candle_buffer.to_dataframe()
                             
                             # Generar gráfico
                             chart_title = f"RESULTADO: {actual_direction} | {source_key}"
                             
-                            # Ejecutar en hilo separado usando la nueva función helper
-                            import asyncio
-                            from src.utils.charting import generate_outcome_chart_base64
-                            
-                            chart_base64 = await asyncio.to_thread(
-                                generate_outcome_chart_base64,
-                                df_current,
+                            # Ejecutar en el pool de procesos (buffer serializado a bytes)
+                            buffer, columns, shape = dataframe_to_bytes(df_current)
+                            loop = asyncio.get_running_loop()
+                            chart_base64 = await loop.run_in_executor(
+                                self._chart_pool,
+                                generate_outcome_chart_base64_from_bytes,
+                                buffer,
+                                columns,
+                                shape,
                                 outcome_candle,
                                 self.chart_lookback,
                                 chart_title
@@ -1033,51 +1155,35 @@ class AnalysisService:
             f"{'═'*60}\n"
         )
     
-    async def _analyze_last_closed_candle(self, source_key: str, current_candle: CandleData, force_notification: bool = False) -> None:
-        """
-        Analiza la última vela cerrada en busca de patrones y genera gráfico.
-        Solo envía notificación si detecta uno de los 4 patrones con tendencia apropiada.
-        
-        AISLAMIENTO: Esta función se ejecuta de forma totalmente aislada por instrumento.
-        El procesamiento de EURUSD no bloquea a GBPUSD.
-        
-        Args:
-            source_key: Clave de la fuente
-            current_candle: Vela actual (la siguiente a la cerrada)
-            force_notification: Si True, envía notificación incluso sin patrón (uso interno)
-        """
-        # AISLAMIENTO: Crear task independiente para no bloquear otros instrumentos
-        # Cada instrumento se procesa en su propia tarea asíncrona
-        await asyncio.create_task(
-            self._analyze_last_closed_candle_isolated(
-                source_key,
-                current_candle,
-                force_notification
-            )
-        )
-    
-    async def _analyze_last_closed_candle_isolated(
+    def _detect_pattern_sync(
         self,
-        source_key: str,
+        state: SymbolState,
         current_candle: CandleData,
         force_notification: bool = False
-    ) -> None:
+    ) -> Optional[PatternSignal]:
         """
-        Análisis aislado de vela cerrada (ejecución independiente por instrumento).
-        Esta función se ejecuta completamente aislada del resto de instrumentos.
+        Analiza la última vela cerrada en busca de patrones (síncrono, sin await).
+        
+        Se ejecuta directamente desde process_realtime_candle: las velas sin
+        patrón o sin notificación se descartan acá sin crear ninguna tarea.
+        Solo las señales a notificar continúan en _emit_signal.
         
         Args:
-            source_key: Clave de la fuente
+            state: Estado de la fuente
             current_candle: Vela actual (la siguiente a la cerrada)
             force_notification: Si True, envía notificación incluso sin patrón (uso interno)
+            
+        Returns:
+            Optional[PatternSignal]: Señal a emitir (sin gráfico ni estadísticas), o None
         """
-        df = self.dataframes[source_key]
+        source_key = state.key
+        buffer = state.buffer
         
-        if len(df) < 2:
-            return
+        if len(buffer) < 2:
+            return None
         
-        # Obtener la última vela CERRADA
-        last_closed = df.iloc[-1]
+        # Obtener la última vela CERRADA (columna -> escalar)
+        last_closed = buffer.row(-1)
         
         # ⚠️ VALIDACIÓN: Filtrar velas vacías (sin movimiento real)
         # TradingView envía primer tick de vela nueva con todos los valores iguales
@@ -1087,96 +1193,111 @@ class AnalysisService:
                 f"⏭️  Vela vacía detectada (Range: {total_range}, Vol: {last_closed['volume']:.2f}). "
                 "Saltando análisis."
             )
-            return
+            return None
         
         # # Verificar que EMA 200 esté disponible
         # if pd.isna(last_closed["ema_200"]):
         #     return
         
-        # LOG: Información de la vela cerrada con todas las EMAs
-        ema_5_val = last_closed.get('ema_5', np.nan)
-        ema_7_val = last_closed.get('ema_7', np.nan)
-        ema_10_val = last_closed.get('ema_10', np.nan)
-        ema_15_val = last_closed.get('ema_15', np.nan)
-        ema_20_val = last_closed.get('ema_20', np.nan)
-        ema_30_val = last_closed.get('ema_30', np.nan)
-        ema_50_val = last_closed.get('ema_50', np.nan)
-        
-        # Formatear EMAs (convertir a string antes)
-        ema_5_str = f"{ema_5_val:.5f}" if not pd.isna(ema_5_val) else "N/A"
-        ema_7_str = f"{ema_7_val:.5f}" if not pd.isna(ema_7_val) else "N/A"
-        ema_10_str = f"{ema_10_val:.5f}" if not pd.isna(ema_10_val) else "N/A"
-        ema_15_str = f"{ema_15_val:.5f}" if not pd.isna(ema_15_val) else "N/A"
-        ema_20_str = f"{ema_20_val:.5f}" if not pd.isna(ema_20_val) else "N/A"
-        ema_30_str = f"{ema_30_val:.5f}" if not pd.isna(ema_30_val) else "N/A"
-        ema_50_str = f"{ema_50_val:.5f}" if not pd.isna(ema_50_val) else "N/A"
+        # Lectura estructurada única de EMAs de la vela cerrada
+        emas_dict = {column: last_closed[column] for column in EMA_COLUMNS}
         
-        logger.info(
-            f"\n\n"
-            f"🕯️  VELA CERRADA - INICIANDO ANÁLISIS\n"
-            f"{'='*40}\n"
-            f"📊 Fuente: {source_key}\n"
-            f"🕒 Timestamp: {last_closed['timestamp']}\n"
-            f"💰 Apertura: {last_closed['open']:.5f}\n"
-            f"💰 Máximo: {last_closed['high']:.5f}\n"
-            f"💰 Mínimo: {last_closed['low']:.5f}\n"
-            f"💰 Cierre: {last_closed['close']:.5f}\n"
-            f"📊 Volumen: {last_closed['volume']:.2f}\n"
-            f"📉 EMAs: 5={ema_5_str} | 7={ema_7_str} | 10={ema_10_str} | 15={ema_15_str} | 20={ema_20_str} | 30={ema_30_str} | 50={ema_50_str}\n"
-            f"{'='*40}\n"
-        )
+        # Los bloques de log multilínea solo se formatean si INFO está habilitado
+        log_info = logger.isEnabledFor(logging.INFO)
         
-        # Analizar tendencia con sistema de scoring ponderado
-        emas_dict = {
-            'ema_3': last_closed.get('ema_3', np.nan),
-            'ema_5': last_closed.get('ema_5', np.nan),
-            'ema_7': last_closed.get('ema_7', np.nan),
-            'ema_10': last_closed.get('ema_10', np.nan),
-            'ema_15': last_closed.get('ema_15', np.nan),
-            'ema_20': last_closed.get('ema_20', np.nan),
-            'ema_30': last_closed.get('ema_30', np.nan),
-            'ema_50': last_closed.get('ema_50', np.nan)
-        }
-        
-        # Obtener EMAs previas para cálculo de Slope (V7)
-        prev_emas_dict = None
-        if len(df) >= 2:
-            prev_closed = df.iloc[-2]
-            prev_emas_dict = {
-                'ema_3': prev_closed.get('ema_3', np.nan),
-                'ema_5': prev_closed.get('ema_5', np.nan),
-                'ema_7': prev_closed.get('ema_7', np.nan),
-                'ema_10': prev_closed.get('ema_10', np.nan),
-                'ema_15': prev_closed.get('ema_15', np.nan),
-                'ema_20': prev_closed.get('ema_20', np.nan),
-                'ema_30': prev_closed.get('ema_30', np.nan),
-                'ema_50': prev_closed.get('ema_50', np.nan)
-            }
+        # LOG: Información de la vela cerrada con todas las EMAs
+        if log_info:
+            ema_5_val = emas_dict['ema_5']
+            ema_7_val = emas_dict['ema_7']
+            ema_10_val = emas_dict['ema_10']
+            ema_15_val = emas_dict['ema_15']
+            ema_20_val = emas_dict['ema_20']
+            ema_30_val = emas_dict['ema_30']
+            ema_50_val = emas_dict['ema_50']
+            
+            # Formatear EMAs (convertir a string antes; x == x descarta NaN sin pasar por pandas)
+            ema_5_str = f"{ema_5_val:.5f}" if ema_5_val == ema_5_val else "N/A"
+            ema_7_str = f"{ema_7_val:.5f}" if ema_7_val == ema_7_val else "N/A"
+            ema_10_str = f"{ema_10_val:.5f}" if ema_10_val == ema_10_val else "N/A"
+            ema_15_str = f"{ema_15_val:.5f}" if ema_15_val == ema_15_val else "N/A"
+            ema_20_str = f"{ema_20_val:.5f}" if ema_20_val == ema_20_val else "N/A"
+            ema_30_str = f"{ema_30_val:.5f}" if ema_30_val == ema_30_val else "N/A"
+            ema_50_str = f"{ema_50_val:.5f}" if ema_50_val == ema_50_val else "N/A"
             
-        trend_analysis = analyze_trend(last_closed["close"], emas_dict, prev_emas_dict)
+            logger.info(
+                f"\n\n"
+                f"🕯️  VELA CERRADA - INICIANDO ANÁLISIS\n"
+                f"{'='*40}\n"
+                f"📊 Fuente: {source_key}\n"
+                f"🕒 Timestamp: {last_closed['timestamp']}\n"
+                f"💰 Apertura: {last_closed['open']:.5f}\n"
+                f"💰 Máximo: {last_closed['high']:.5f}\n"
+                f"💰 Mínimo: {last_closed['low']:.5f}\n"
+                f"💰 Cierre: {last_closed['close']:.5f}\n"
+                f"📊 Volumen: {last_closed['volume']:.2f}\n"
+                f"📉 EMAs: 5={ema_5_str} | 7={ema_7_str} | 10={ema_10_str} | 15={ema_15_str} | 20={ema_20_str} | 30={ema_30_str} | 50={ema_50_str}\n"
+                f"{'='*40}\n"
+            )
         
         # Obtener Bollinger Bands para detección de agotamiento
-        bb_upper = last_closed.get('bb_upper', np.nan)
-        bb_lower = last_closed.get('bb_lower', np.nan)
-        bb_middle = last_closed.get('bb_middle', np.nan)
-        
-        # Detectar si está en zona de agotamiento (Cúspide o Base)
-        exhaustion_type = detect_exhaustion(
-            last_closed["high"],
-            last_closed["low"],
-            last_closed["close"],
-            bb_upper,
-            bb_lower
+        bb_upper = last_closed['bb_upper']
+        bb_lower = last_closed['bb_lower']
+        bb_middle = last_closed['bb_middle']
+        
+        # ═════════════════════════════════════════════════════════════════════
+        # KERNEL FUSIONADO: patrones + Bollinger + Candle Exhaustion + tendencia
+        # ═════════════════════════════════════════════════════════════════════
+        # Valores de la vela anterior leídos directamente de los arrays de columna
+        # (high/low para Candle Exhaustion, EMAs 3/5/20 para el Slope V7)
+        prev_candle = buffer.row(-2)
+        (
+            pattern_mask,
+            shooting_star_conf,
+            hanging_man_conf,
+            inverted_hammer_conf,
+            hammer_conf,
+            exhaustion_code,
+            breaks_prev_high,
+            breaks_prev_low,
+            trend_score,
+            trend_bucket,
+            trend_is_aligned
+        ) = analyze_closed_candle_nb(
+            float(last_closed["open"]),
+            float(last_closed["high"]),
+            float(last_closed["low"]),
+            float(last_closed["close"]),
+            float(prev_candle["high"]),
+            float(prev_candle["low"]),
+            float(bb_upper),
+            float(bb_lower),
+            float(emas_dict['ema_3']),
+            float(emas_dict['ema_5']),
+            float(emas_dict['ema_20']),
+            float(prev_candle["ema_3"]),
+            float(prev_candle["ema_5"]),
+            float(prev_candle["ema_20"]),
+            *self._pattern_thresholds,
+            self._slope_threshold
         )
         
-        # Formatear Bollinger Bands para logging (manejar NaN)
-        bb_upper_str = f"{bb_upper:.5f}" if not pd.isna(bb_upper) else "N/A"
-        bb_middle_str = f"{bb_middle:.5f}" if not pd.isna(bb_middle) else "N/A"
-        bb_lower_str = f"{bb_lower:.5f}" if not pd.isna(bb_lower) else "N/A"
+        trend_analysis = TrendAnalysis(
+            status=TREND_STATUSES[trend_bucket],
+            score=float(trend_score),
+            is_aligned=bool(trend_is_aligned),
+            bucket=int(trend_bucket)
+        )
+        exhaustion_type = EXHAUSTION_TYPES[exhaustion_code]
         
         # Obtener RSI (v8.0)
-        rsi_val = last_closed.get('rsi', np.nan)
-        rsi_str = f"{rsi_val:.1f}" if not pd.isna(rsi_val) else "N/A"
+        rsi_val = last_closed['rsi']
+        
+        # Formatear Bollinger Bands y RSI para logging (manejar NaN)
+        if log_info:
+            bb_upper_str = f"{bb_upper:.5f}" if bb_upper == bb_upper else "N/A"
+            bb_middle_str = f"{bb_middle:.5f}" if bb_middle == bb_middle else "N/A"
+            bb_lower_str = f"{bb_lower:.5f}" if bb_lower == bb_lower else "N/A"
+            rsi_str = f"{rsi_val:.1f}" if rsi_val == rsi_val else "N/A"
         
         # logger.info(
         #     f"📈 Análisis de Tendencia: {trend_analysis}\n"
@@ -1190,367 +1311,370 @@ class AnalysisService:
         #     f"   • Zona de Agotamiento: {exhaustion_type}\n"
         # )
         
-        # Detectar los 4 patrones de velas japonesas
-        shooting_star_detected, shooting_star_conf, shooting_star_reason = is_shooting_star(
-            last_closed["open"],
-            last_closed["high"],
-            last_closed["low"],
-            last_closed["close"]
-        )
-        
-        hanging_man_detected, hanging_man_conf, hanging_man_reason = is_hanging_man(
-            last_closed["open"],
-            last_closed["high"],
-            last_closed["low"],
-            last_closed["close"]
-        )
-        
-        inverted_hammer_detected, inverted_hammer_conf, inverted_hammer_reason = is_inverted_hammer(
-            last_closed["open"],
-            last_closed["high"],
-            last_closed["low"],
-            last_closed["close"]
-        )
-        
-        hammer_detected, hammer_conf, hammer_reason = is_hammer(
-            last_closed["open"],
-            last_closed["high"],
-            last_closed["low"],
-            last_closed["close"]
-        )
+        # Los 4 patrones de velas japonesas (resueltos por el kernel fusionado)
+        shooting_star_detected = bool(pattern_mask & FLAG_SHOOTING_STAR)
+        hanging_man_detected = bool(pattern_mask & FLAG_HANGING_MAN)
+        inverted_hammer_detected = bool(pattern_mask & FLAG_INVERTED_HAMMER)
+        hammer_detected = bool(pattern_mask & FLAG_HAMMER)
         
         # Filtrar patrones por tendencia apropiada (solo si USE_TREND_FILTER está activo)
         # BEARISH signals (reversión bajista): Shooting Star y Hanging Man en tendencia alcista
         # BULLISH signals (reversión alcista): Hammer e Inverted Hammer en tendencia bajista
         pattern_detected = None
+        pattern_flag = 0
         pattern_confidence = 0.0
         
-        if Config.USE_TREND_FILTER:
+        if self._use_trend_filter:
             # Modo CON filtro de tendencia (comportamiento original)
             # Mapear estados granulares a direcciones generales
-            current_status = trend_analysis.status
-            is_bearish = "BEARISH" in current_status  # STRONG_BEARISH o WEAK_BEARISH
-            is_bullish = "BULLISH" in current_status  # STRONG_BULLISH o WEAK_BULLISH
+            trend_bucket = trend_analysis.bucket
+            is_bearish = trend_bucket > TREND_NEUTRAL  # STRONG_BEARISH o WEAK_BEARISH
+            is_bullish = trend_bucket < TREND_NEUTRAL  # STRONG_BULLISH o WEAK_BULLISH
             
             if is_bearish:
                 # En tendencia bajista, buscar reversión alcista
                 if hammer_detected:
                     pattern_detected = "HAMMER"
+                    pattern_flag = FLAG_HAMMER
                     pattern_confidence = hammer_conf
                 elif inverted_hammer_detected:
                     pattern_detected = "INVERTED_HAMMER"
+                    pattern_flag = FLAG_INVERTED_HAMMER
                     pattern_confidence = inverted_hammer_conf
             elif is_bullish:
                 # En tendencia alcista, buscar reversión bajista
                 if shooting_star_detected:
                     pattern_detected = "SHOOTING_STAR"
+                    pattern_flag = FLAG_SHOOTING_STAR
                     pattern_confidence = shooting_star_conf
                 elif hanging_man_detected:
                     pattern_detected = "HANGING_MAN"
+                    pattern_flag = FLAG_HANGING_MAN
                     pattern_confidence = hanging_man_conf
         else:
             # Modo SIN filtro de tendencia: detectar cualquier patrón sin importar tendencia
             # Prioridad: Shooting Star > Hanging Man > Hammer > Inverted Hammer
             if shooting_star_detected:
                 pattern_detected = "SHOOTING_STAR"
+                pattern_flag = FLAG_SHOOTING_STAR
                 pattern_confidence = shooting_star_conf
             elif hanging_man_detected:
                 pattern_detected = "HANGING_MAN"
+                pattern_flag = FLAG_HANGING_MAN
                 pattern_confidence = hanging_man_conf
             elif hammer_detected:
                 pattern_detected = "HAMMER"
+                pattern_flag = FLAG_HAMMER
                 pattern_confidence = hammer_conf
             elif inverted_hammer_detected:
                 pattern_detected = "INVERTED_HAMMER"
+                pattern_flag = FLAG_INVERTED_HAMMER
                 pattern_confidence = inverted_hammer_conf
         
         # Si no hay patrón detectado, salir (force_notification no puede forzar patrones inexistentes)
         if not pattern_detected:
             logger.info("ℹ️  No se detectó ningún patrón relevante en esta vela.")
-            return
+            return None
         
         # ═════════════════════════════════════════════════════════════════════
         # CLASIFICACIÓN DE FUERZA DE SEÑAL - Mean Reversion Strategy (NUEVO)
         # ═════════════════════════════════════════════════════════════════════
         
         # NUEVA MATRIZ DE DECISIÓN con Candle Exhaustion
-        # Importar función de candle.py
-        from src.logic.candle import detect_candle_exhaustion
-        
-        # Obtener vela anterior para cálculo de Candle Exhaustion
-        prev_candle_high = None
-        prev_candle_low = None
-        if len(df) >= 2:
-            prev_row = df.iloc[-2]
-            prev_candle_high = prev_row["high"]
-            prev_candle_low = prev_row["low"]
-        
-        # Calcular Candle Exhaustion
-        candle_exhaustion = False
-        if prev_candle_high is not None and prev_candle_low is not None:
-            candle_exhaustion = detect_candle_exhaustion(
-                pattern=pattern_detected,
-                current_high=last_closed["high"],
-                current_low=last_closed["low"],
-                prev_high=prev_candle_high,
-                prev_low=prev_candle_low
-            )
+        # Patrones bajistas: rompió el máximo anterior; alcistas: rompió el mínimo anterior
+        # (misma regla que detect_candle_exhaustion, con las rupturas ya calculadas)
+        if pattern_flag & BREAKS_HIGH_MASK:
+            candle_exhaustion = bool(breaks_prev_high)
+        else:
+            candle_exhaustion = bool(breaks_prev_low)
         
         # Determinar Bollinger Exhaustion (PEAK o BOTTOM)
-        bollinger_exhaustion = exhaustion_type in ["PEAK", "BOTTOM"]
-        
-        # Clasificar patrones por tipo
-        pattern_is_bearish = pattern_detected in ["SHOOTING_STAR", "HANGING_MAN"]
-        pattern_is_bullish = pattern_detected in ["HAMMER", "INVERTED_HAMMER"]
-        pattern_is_primary = pattern_detected in ["SHOOTING_STAR", "HAMMER"]
+        bollinger_exhaustion = exhaustion_code != EXHAUSTION_NONE
         
-        # Determinar contexto de tendencia
-        current_status = trend_analysis.status
-        is_strong_bullish = current_status == "STRONG_BULLISH"
-        is_weak_bullish = current_status == "WEAK_BULLISH"
-        is_strong_bearish = current_status == "STRONG_BEARISH"
-        is_weak_bearish = current_status == "WEAK_BEARISH"
-        is_neutral = current_status == "NEUTRAL"
-        
-        is_bullish_trend = is_strong_bullish or is_weak_bullish
-        is_bearish_trend = is_strong_bearish or is_weak_bearish
-        
-        # Variable de scoring
-        signal_strength = "NONE"
-        
-        # ═════════════════════════════════════════════════════════════════════
-        # CASO A: TENDENCIA ALCISTA (Buscamos VENTAS - Patrones Bajistas)
-        # ═════════════════════════════════════════════════════════════════════
         # ═════════════════════════════════════════════════════════════════════
         # CLASIFICACIÓN CENTRALIZADA (Task 1)
         # ═════════════════════════════════════════════════════════════════════
-        signal_strength = classify_signal(
-            pattern=pattern_detected,
-            trend_status=trend_analysis.status,
-            exhaustion_bb=exhaustion_type,
-            candle_exhaustion=candle_exhaustion,
-            rsi_val=rsi_val
+        # Un único lookup en la matriz precomputada resuelve fuerza de señal,
+        # alineación y contra-tendencia, indexando con los códigos enteros del
+        # kernel (bucket de tendencia y FLAG_* del patrón) en lugar de strings
+        signal_strength, is_trend_aligned, is_counter_trend = classify_signal_codes(
+            pattern_flag,
+            trend_analysis.bucket,
+            bollinger_exhaustion,
+            candle_exhaustion
         )
         
-        logger.info(f"🎚️  Signal Strength Classified: {signal_strength}")
+        logger.info("🎚️  Signal Strength Classified: %s", signal_strength)
         
-        # Determinar si el patrón es "contra-tendencia" (para compatibilidad con storage)
-        is_counter_trend = False
-        if pattern_is_bearish and is_bearish_trend:
-            is_counter_trend = True  # Patrón bajista en tendencia bajista
-        elif pattern_is_bullish and is_bullish_trend:
-            is_counter_trend = True  # Patrón alcista en tendencia alcista
+        # Decidir notificación inmediatamente tras la clasificación:
+        # force_notification omite validación de confianza mínima (útil para testing/debug)
+        should_notify = pattern_confidence >= 0.70 or force_notification
         
-        # Determinar alineación tradicional (para compatibilidad)
-        is_trend_aligned = False
-        if pattern_is_bearish:
-            is_trend_aligned = is_bullish_trend  # Bajista espera tendencia alcista
-        elif pattern_is_bullish:
-            is_trend_aligned = is_bearish_trend  # Alcista espera tendencia bajista
+        # FILTRO DE SEÑALES "NONE"
+        if not force_notification and signal_strength == "NONE" and not self._send_none_signals:
+            should_notify = False
+            logger.info("🔇 Señal silenciada (Strength=NONE, SEND_NONE_SIGNAL_NOTIFICATIONS=False)")
         
         # Calcular punto de entrada (50% del rango total de la vela cerrada)
-        candle_range = last_closed.high - last_closed.low
-        entry_point = last_closed.low + (candle_range / 2)
+        candle_range = last_closed['high'] - last_closed['low']
+        entry_point = last_closed['low'] + (candle_range / 2)
 
-        logger.info(
-            f"\n{'═'*60}\n"
-            f"🎯 PATRÓN DETECTADO: {pattern_detected}\n"
-            f"{'═'*60}\n"
-            f"📊 Confianza Técnica: {pattern_confidence:.1%}\n"
-            f"📈 Tendencia: {trend_analysis.status} (Score: {trend_analysis.score:+.1f}/10.0)\n"
-            f"🔄 Alineación: {'✓ Alineado' if is_trend_aligned else '✗ No alineado'}\n"
-            f"💥 Candle Exhaustion: {'✅ SÍ' if candle_exhaustion else '❌ NO'}\n"
-            f"📍 Bollinger Exhaustion: {'✅ ' + exhaustion_type if bollinger_exhaustion else '❌ NONE'}\n"
-            f"📊 RSI (7): {rsi_str}\n"
-            f"🎚️  Fuerza de Señal: {signal_strength}\n"
-            f"⚠️  Contra-Tendencia: {'SÍ' if is_counter_trend else 'NO'}\n"
-            f"🎯 Entry Point (50%): {entry_point:.5f}\n"
+        if log_info:
+            logger.info(
+                f"\n{'═'*60}\n"
+                f"🎯 PATRÓN DETECTADO: {pattern_detected}\n"
+                f"{'═'*60}\n"
+                f"📊 Confianza Técnica: {pattern_confidence:.1%}\n"
+                f"📈 Tendencia: {trend_analysis.status} (Score: {trend_analysis.score:+.1f}/10.0)\n"
+                f"🔄 Alineación: {'✓ Alineado' if is_trend_aligned else '✗ No alineado'}\n"
+                f"💥 Candle Exhaustion: {'✅ SÍ' if candle_exhaustion else '❌ NO'}\n"
+                f"📍 Bollinger Exhaustion: {'✅ ' + exhaustion_type if bollinger_exhaustion else '❌ NONE'}\n"
+                f"📊 RSI (7): {rsi_str}\n"
+                f"🎚️  Fuerza de Señal: {signal_strength}\n"
+                f"⚠️  Contra-Tendencia: {'SÍ' if is_counter_trend else 'NO'}\n"
+                f"🎯 Entry Point (50%): {entry_point:.5f}\n"
+            )
+        
+        # Cortocircuito: si la señal no se va a notificar, no se consultan
+        # estadísticas, no se genera gráfico ni se construye el PatternSignal
+        if not should_notify:
+            return None
+        
+        signal = PatternSignal(
+            symbol=current_candle.symbol,
+            source=current_candle.source,
+            pattern=pattern_detected,
+            timestamp=int(last_closed["timestamp"]),
+            candle=CandleData(
+                timestamp=int(last_closed["timestamp"]),
+                open=last_closed["open"],
+                high=last_closed["high"],
+                low=last_closed["low"],
+                close=last_closed["close"],
+                volume=last_closed["volume"],
+                source=current_candle.source,
+                symbol=current_candle.symbol
+            ),
+
+            confidence=pattern_confidence,
+            trend_filtered=self._use_trend_filter,
+            **emas_dict,
+
+            trend=trend_analysis.status,
+            trend_score=trend_analysis.score,
+            is_trend_aligned=trend_analysis.is_aligned,
+            bb_upper=float(bb_upper) if bb_upper == bb_upper else None,
+            bb_lower=float(bb_lower) if bb_lower == bb_lower else None,
+            exhaustion_type=exhaustion_type,
+            candle_exhaustion=candle_exhaustion,
+            signal_strength=signal_strength,
+            is_counter_trend=is_counter_trend,
+            entry_point=entry_point,
+            rsi_val=rsi_val if rsi_val == rsi_val else None
         )
+        return signal
+    
+    def _enqueue_signal(
+        self,
+        source_key: str,
+        signal: PatternSignal,
+        chart_df: Optional[pd.DataFrame]
+    ) -> None:
+        """
+        Encola una señal detectada para que la emitan los workers.
         
-        # Notificar al TelegramService con la información completa
-        # force_notification omite validación de confianza mínima (útil para testing/debug)
-        should_notify = pattern_confidence >= 0.70 or force_notification
+        Args:
+            source_key: Clave de la fuente
+            signal: Señal detectada (sin gráfico ni estadísticas)
+            chart_df: Snapshot del buffer para el gráfico (None si SEND_CHARTS=False)
+        """
+        if not self._signal_workers:
+            self._signal_workers = [
+                asyncio.create_task(self._signal_worker())
+                for _ in range(self._signal_worker_count)
+            ]
         
-        # FILTRO DE SEÑALES "NONE"
-        if not force_notification and signal_strength == "NONE" and not Config.TELEGRAM.send_none_signal_notifications:
-            should_notify = False
-            logger.info(f"🔇 Señal silenciada (Strength=NONE, SEND_NONE_SIGNAL_NOTIFICATIONS=False)")
+        try:
+            self._signal_queue.put_nowait((source_key, signal, chart_df))
+        except asyncio.QueueFull:
+            logger.warning(
+                f"⚠️  Cola de señales llena ({Config.SIGNAL_QUEUE_SIZE}) | {source_key} | "
+                f"Descartando {signal.pattern} @ {signal.timestamp}"
+            )
+    
+    async def _signal_worker(self) -> None:
+        """
+        Consume la cola de señales y las emite de a una por worker.
         
-        if should_notify:
-            # Generar gráfico en Base64 (operación bloqueante en hilo separado)
-            chart_base64 = None
-            
-            # OPTIMIZACIÓN: Solo generar gráfico si se va a enviar
-            # El guardado local (SAVE_NOTIFICATIONS_LOCALLY) guardará lo que se haya generado (con o sin imagen)
-            should_generate_chart = Config.TELEGRAM.send_charts
-            
-            if should_generate_chart:
-                try:
-                    # Validar que hay suficientes datos para el gráfico
-                    is_valid, error_msg = validate_dataframe_for_chart(df, self.chart_lookback)
-                    logger.debug(
-                        f"Validación de DataFrame para gráfico: is_valid={is_valid}, error_msg='{error_msg}'"
-                    )
-                    if is_valid:
-                        chart_title = f"{current_candle.source}:{current_candle.symbol} - {pattern_detected}"
-                        
-                        logger.info(
-                            f"📋 GENERANDO GRÁFICO | {source_key} | "
-                            f"Últimas {self.chart_lookback} velas | Patrón: {pattern_detected}"
-                        )
-                        
-                        # CRITICAL: Ejecutar en hilo separado para no bloquear el Event Loop
-                        import time
-                        start_time = time.perf_counter()
-                        
-                        chart_base64 = await asyncio.to_thread(
-                            generate_chart_base64,
-                            df,
-                            self.chart_lookback,
-                            chart_title
-                        )
-                        
-                        elapsed_ms = (time.perf_counter() - start_time) * 1000
-                        
-                        logger.info(
-                            f"✅ GRÁFICO GENERADO | {source_key} | "
-                            f"Tamaño: {len(chart_base64)} bytes Base64 | "
-                            f"Tiempo: {elapsed_ms:.1f}ms | Patrón: {pattern_detected}"
-                        )
-                    else:
-                        logger.warning(f"⚠️  No se pudo generar gráfico: {error_msg}")
+        Las señales de una misma fuente se emiten en orden de llegada: el lock
+        de la fuente se toma apenas se saca la señal de la cola (los waiters de
+        asyncio.Lock son FIFO), así una señal vieja no pisa a una más nueva en
+        pending_signals.
+        
+        Una excepción al emitir se registra y el worker sigue con la próxima señal.
+        """
+        while True:
+            source_key, signal, chart_df = await self._signal_queue.get()
+            try:
+                async with self._states[source_key].emit_lock:
+                    await self._emit_signal(source_key, signal, chart_df)
+            except Exception as e:
+                log_exception(logger, f"Error emitiendo señal de {source_key}", e)
+            finally:
+                self._signal_queue.task_done()
+    
+    async def _emit_signal(
+        self,
+        source_key: str,
+        signal: PatternSignal,
+        chart_df: Optional[pd.DataFrame]
+    ) -> None:
+        """
+        Completa y emite una señal detectada por _detect_pattern_sync.
+        
+        Genera el gráfico (en el pool de hilos), consulta estadísticas,
+        guarda la vela en test_data, deja la señal pendiente y notifica.
+        Se ejecuta desde _signal_worker.
+        
+        Args:
+            source_key: Clave de la fuente
+            signal: Señal detectada (sin gráfico ni estadísticas)
+            chart_df: Snapshot del buffer para el gráfico (None si SEND_CHARTS=False)
+        """
+        pattern_detected = signal.pattern
+        
+        # Generar gráfico en Base64 (operación bloqueante en hilo separado)
+        chart_base64 = None
+        
+        # OPTIMIZACIÓN: Solo generar gráfico si se va a enviar (chart_df solo
+        # se toma con SEND_CHARTS activo). El guardado local
+        # (SAVE_NOTIFICATIONS_LOCALLY) guardará lo que se haya generado (con o sin imagen)
+        if chart_df is not None:
+            try:
+                df = chart_df
                 
-                except Exception as e:
-                    log_exception(logger, "Failed to generate chart", e)
-                    # Continuar sin gráfico si hay error
-                    chart_base64 = None
-            else:
-                logger.debug(f"⏭️  Saltando generación de gráfico para {source_key} (SEND_CHARTS=False)")
-            
-            # En este punto siempre hay un patrón detectado
-            
-            # Consultar estadísticas históricas si hay StatisticsService disponible
-            statistics = None
-            if self.statistics_service:
-                try:
-                    # Calcular alignment y ema_order para búsqueda precisa
-                    emas_dict = {
-                        'ema_3': last_closed.get("ema_3", np.nan),
-                        'ema_5': last_closed.get("ema_5", np.nan),
-                        'ema_7': last_closed.get("ema_7", np.nan),
-                        'ema_10': last_closed.get("ema_10", np.nan),
-                        'ema_20': last_closed.get("ema_20", np.nan),
-                        'ema_30': last_closed.get("ema_30", np.nan),
-                        'ema_50': last_closed.get("ema_50", np.nan)
-                    }
-                    current_alignment = get_ema_alignment_string(emas_dict)
-                    current_ema_order = get_ema_order_string(last_closed["close"], emas_dict)
+                # Validar que hay suficientes datos para el gráfico
+                is_valid, error_msg = validate_dataframe_for_chart(df, self.chart_lookback)
+                logger.debug(
+                    f"Validación de DataFrame para gráfico: is_valid={is_valid}, error_msg='{error_msg}'"
+                )
+                if is_valid:
+                    chart_title = f"{signal.source}:{signal.symbol} - {pattern_detected}"
+                    
+                    logger.info(
+                        f"📋 GENERANDO GRÁFICO | {source_key} | "
+                        f"Últimas {self.chart_lookback} velas | Patrón: {pattern_detected}"
+                    )
                     
-                    # Extraer source y symbol del source_key (formato: "SOURCE_SYMBOL")
-                    source, symbol = source_key.split("_", 1) if "_" in source_key else (source_key, "UNKNOWN")
+                    # CRITICAL: Render en el pool de procesos (Matplotlib retiene el
+                    # GIL); solo viajan los bytes float64 de la ventana visible
+                    start_time = time.perf_counter()
                     
-                    statistics = self.statistics_service.get_probability(
-                        pattern=pattern_detected,
-                        current_score=trend_analysis.score,
-                        current_exhaustion_type=exhaustion_type,
-                        source=source,
-                        symbol=symbol,
-                        current_alignment=current_alignment,
-                        current_ema_order=current_ema_order,
-                        lookback_days=30,
-                        score_tolerance=2
+                    buffer, columns, shape = dataframe_to_bytes(df)
+                    loop = asyncio.get_running_loop()
+                    chart_base64 = await loop.run_in_executor(
+                        self._chart_pool,
+                        generate_chart_base64_from_bytes,
+                        buffer,
+                        columns,
+                        shape,
+                        self.chart_lookback,
+                        chart_title
                     )
                     
-                    exact_cases = statistics.get('exact', {}).get('total_cases', 0)
-                    by_score_cases = statistics.get('by_score', {}).get('total_cases', 0)
-                    by_range_cases = statistics.get('by_range', {}).get('total_cases', 0)
+                    elapsed_ms = (time.perf_counter() - start_time) * 1000
                     
-                    logger.debug(
-                        f"📊 Estadísticas obtenidas (Zona: {exhaustion_type}) | "
-                        f"Exact: {exact_cases} | "
-                        f"By Score: {by_score_cases} | "
-                        f"By Range: {by_range_cases}"
+                    logger.info(
+                        f"✅ GRÁFICO GENERADO | {source_key} | "
+                        f"Tamaño: {len(chart_base64)} bytes Base64 | "
+                        f"Tiempo: {elapsed_ms:.1f}ms | Patrón: {pattern_detected}"
                     )
-                except Exception as e:
-                    logger.warning(f"⚠️  Error obteniendo estadísticas: {e}")
+                else:
+                    logger.warning(f"⚠️  No se pudo generar gráfico: {error_msg}")
             
-            signal = PatternSignal(
-                symbol=current_candle.symbol,
-                source=current_candle.source,
-                pattern=pattern_detected,
-                timestamp=int(last_closed["timestamp"]),
-                candle=CandleData(
-                    timestamp=int(last_closed["timestamp"]),
-                    open=last_closed["open"],
-                    high=last_closed["high"],
-                    low=last_closed["low"],
-                    close=last_closed["close"],
-                    volume=last_closed["volume"],
-                    source=current_candle.source,
-                    symbol=current_candle.symbol
-                ),
-
-                confidence=pattern_confidence,
-                trend_filtered=Config.USE_TREND_FILTER,
-                ema_3=last_closed.get("ema_3", np.nan),
-                ema_5=last_closed.get("ema_5", np.nan),
-                ema_7=last_closed.get("ema_7", np.nan),
-                ema_10=last_closed.get("ema_10", np.nan),
-                ema_15=last_closed.get("ema_15", np.nan),
-                ema_20=last_closed.get("ema_20", np.nan),
-                ema_30=last_closed.get("ema_30", np.nan),
-                ema_50=last_closed.get("ema_50", np.nan),
+            except Exception as e:
+                log_exception(logger, "Failed to generate chart", e)
+                # Continuar sin gráfico si hay error
+                chart_base64 = None
+        else:
+            logger.debug(f"⏭️  Saltando generación de gráfico para {source_key} (SEND_CHARTS=False)")
+        
+        signal.chart_base64 = chart_base64
+        
+        # Consultar estadísticas históricas si hay StatisticsService disponible
+        if self.statistics_service:
+            try:
+                # Calcular alignment y ema_order para búsqueda precisa
+                # (la consulta histórica no incluye EMA 15 en el orden)
+                stats_emas = {column: getattr(signal, column) for column in EMA_COLUMNS if column != 'ema_15'}
+                current_alignment = get_ema_alignment_string(stats_emas)
+                current_ema_order = get_ema_order_string(signal.candle.close, stats_emas)
+                
+                # source y symbol del source_key (precalculados en _init_state)
+                state = self._states[source_key]
+                source, symbol = state.source, state.symbol
+                
+                statistics = self.statistics_service.get_probability(
+                    pattern=pattern_detected,
+                    current_score=signal.trend_score,
+                    current_exhaustion_type=signal.exhaustion_type,
+                    source=source,
+                    symbol=symbol,
+                    current_alignment=current_alignment,
+                    current_ema_order=current_ema_order,
+                    lookback_days=30,
+                    score_tolerance=2
+                )
+                
+                exact_cases = statistics.get('exact', {}).get('total_cases', 0)
+                by_score_cases = statistics.get('by_score', {}).get('total_cases', 0)
+                by_range_cases = statistics.get('by_range', {}).get('total_cases', 0)
+                
+                logger.debug(
+                    f"📊 Estadísticas obtenidas (Zona: {signal.exhaustion_type}) | "
+                    f"Exact: {exact_cases} | "
+                    f"By Score: {by_score_cases} | "
+                    f"By Range: {by_range_cases}"
+                )
+                signal.statistics = statistics
+            except Exception as e:
+                logger.warning(f"⚠️  Error obteniendo estadísticas: {e}")
+        
+        logger.info(
+            f"🎯 PATTERN DETECTED | {signal.source} | {signal.pattern} | "
+            f"Trend={signal.trend} (Score: {signal.trend_score:+.1f}/10.0) | "
+            f"Strength={signal.signal_strength} | Exhaustion={signal.exhaustion_type} | "
+            f"Close={signal.candle.close:.5f} | Confidence={signal.confidence:.2f} | "
+            f"Chart={'✓' if chart_base64 else '✗'}"
+        )
+        
+        # Guardar vela detectada en test_data.jsonl
+        await self._save_detected_candle_to_test_data(
+            signal.candle.open,
+            signal.candle.high,
+            signal.candle.low,
+            signal.candle.close,
+            pattern_detected
+        )
+        
+        logger.info(
+            f"✅ Señal de patrón emitida para {signal.source} | "
+            f"{signal.pattern} @ {signal.timestamp}"
+        )
+        
+        # ═════════════════════════════════════════════════════════════
+        # GUARDAR SEÑAL COMO PENDIENTE (State Machine)
+        # ═════════════════════════════════════════════════════════════
+        self.pending_signals[source_key] = signal
+        logger.info(
+            f"⏳ SEÑAL GUARDADA COMO PENDIENTE | {source_key} | "
+            f"{signal.pattern} | Esperando próxima vela para cerrar ciclo"
+        )
+        
+        # Emitir señal a Telegram en tiempo real (notificación inmediata)
+        if self.on_pattern_detected:
+            await self.on_pattern_detected(signal)
 
-                trend=trend_analysis.status,
-                trend_score=trend_analysis.score,
-                is_trend_aligned=trend_analysis.is_aligned,
-                bb_upper=float(bb_upper) if not pd.isna(bb_upper) else None,
-                bb_lower=float(bb_lower) if not pd.isna(bb_lower) else None,
-                exhaustion_type=exhaustion_type,
-                candle_exhaustion=candle_exhaustion,
-                signal_strength=signal_strength,
-                is_counter_trend=is_counter_trend,
-                statistics=statistics,
-                chart_base64=chart_base64,
-                entry_point=entry_point,
-                rsi_val=rsi_val if not pd.isna(rsi_val) else None
-            )
-            
-            logger.info(
-                f"🎯 PATTERN DETECTED | {signal.source} | {signal.pattern} | "
-                f"Trend={trend_analysis.status} (Score: {trend_analysis.score:+.1f}/10.0) | "
-                f"Strength={signal_strength} | Exhaustion={exhaustion_type} | "
-                f"Close={signal.candle.close:.5f} | Confidence={signal.confidence:.2f} | "
-                f"Chart={'✓' if chart_base64 else '✗'}"
-            )
-            
-            # Guardar vela detectada en test_data.json
-            await self._save_detected_candle_to_test_data(
-                last_closed["open"],
-                last_closed["high"],
-                last_closed["low"],
-                last_closed["close"],
-                pattern_detected
-            )
-            
-            logger.info(
-                f"✅ Señal de patrón emitida para {signal.source} | "
-                f"{signal.pattern} @ {signal.timestamp}"
-            )
-            
-            # ═════════════════════════════════════════════════════════════
-            # GUARDAR SEÑAL COMO PENDIENTE (State Machine)
-            # ═════════════════════════════════════════════════════════════
-            self.pending_signals[source_key] = signal
-            logger.info(
-                f"⏳ SEÑAL GUARDADA COMO PENDIENTE | {source_key} | "
-                f"{signal.pattern} | Esperando próxima vela para cerrar ciclo"
-            )
-            
-            # Emitir señal a Telegram en tiempo real (notificación inmediata)
-            if self.on_pattern_detected:
-                await self.on_pattern_detected(signal)
-    
     async def _generate_realtime_chart(self, source_key: str, candle: CandleData) -> None:
         """
         Genera y guarda un gráfico PNG para la vela cerrada actual.
@@ -1560,27 +1684,28 @@ class AnalysisService:
             source_key: Clave de la fuente (ej: "IQ_EURUSD_BIN")
             candle: Vela que acaba de cerrar
         """
-        if not Config.UPDATE_TEST_DATA:
+        if not self._update_test_data:
             return
 
         try:
-            from pathlib import Path
-            from datetime import datetime
-            import base64
-            from src.utils.charting import generate_chart_base64
-            
-            df = self.dataframes.get(source_key)
-            if df is None or len(df) < 10:
+            state = self._states.get(source_key)
+            candle_buffer = state.buffer if state is not None else None
+            if candle_buffer is None or len(candle_buffer) < 10:
                 return
             
-            # Generar gráfico
+            # Generar gráfico en el pool de procesos (solo la ventana visible)
             chart_title = f"{candle.source}:{candle.symbol} - Real-Time"
-            chart_base64 = await asyncio.to_thread(
-                generate_chart_base64,
-                df,
+            buffer, columns, shape = dataframe_to_bytes(candle_buffer.to_dataframe(tail=self.chart_lookback))
+            loop = asyncio.get_running_loop()
+            png_bytes = await loop.run_in_executor(
+                self._chart_pool,
+                render_chart_png_bytes_from_bytes,
+                buffer,
+                columns,
+                shape,
                 self.chart_lookback,
                 chart_title,
-                show_emas=True
+                True
             )
             
             # Guardar en archivo
@@ -1588,18 +1713,42 @@ class AnalysisService:
             timestamp_str = candle_time.strftime("%Y%m%d_%H%M%S")
             
             chart_dir = Path("data") / "charts" / candle.symbol / "realtime"
-            chart_dir.mkdir(parents=True, exist_ok=True)
+            self._ensure_directory(chart_dir)
             
             chart_path = chart_dir / f"candle_{timestamp_str}.png"
             
-            with open(chart_path, "wb") as f:
-                f.write(base64.b64decode(chart_base64))
+            # Escritura del PNG en hilo separado (no bloquea el Event Loop)
+            await loop.run_in_executor(self._thread_pool, self._write_chart_file, chart_path, png_bytes)
             
             logger.info(f"📊 Gráfico en tiempo real guardado: {chart_path}")
             
         except Exception as e:
             log_exception(logger, "Error generando gráfico en tiempo real", e)
 
+    def _ensure_directory(self, directory: Path) -> None:
+        """
+        Crea un directorio una sola vez por sesión.
+        
+        Args:
+            directory: Directorio a crear (con padres)
+        """
+        key = str(directory)
+        if key not in self._created_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(key)
+    
+    @staticmethod
+    def _write_chart_file(chart_path: Path, png_bytes: bytes) -> None:
+        """
+        Escritura síncrona de un PNG (ejecutada en thread separado).
+        
+        Args:
+            chart_path: Ruta destino del gráfico
+            png_bytes: Contenido PNG crudo
+        """
+        with open(chart_path, "wb") as f:
+            f.write(png_bytes)
+    
     async def generate_initial_chart(self, source_key: str, last_candle: CandleData) -> None:
         """
         Genera el gráfico inicial (snapshot) después de cargar históricos.
@@ -1609,40 +1758,41 @@ class AnalysisService:
             source_key: Clave de la fuente
             last_candle: Última vela cerrada (para referencia en título)
         """
-        if not Config.GENERATE_HISTORICAL_CHARTS:
+        if not self._generate_historical_charts:
             return
 
-        if not Config.UPDATE_TEST_DATA:
+        if not self._update_test_data:
             return
 
         try:
-            from pathlib import Path
-            import base64
-            from src.utils.charting import generate_chart_base64
-            
-            df = self.dataframes.get(source_key)
-            if df is None or len(df) < 10:
+            state = self._states.get(source_key)
+            buffer = state.buffer if state is not None else None
+            if buffer is None or len(buffer) < 10:
                 logger.warning(f"⚠️ No hay suficientes datos para gráfico inicial de {source_key}")
                 return
             
-            # Generar gráfico
+            # Generar gráfico en el pool de procesos (solo la ventana visible)
             chart_title = f"{last_candle.source}:{last_candle.symbol} - Initial Snapshot"
-            chart_base64 = await asyncio.to_thread(
-                generate_chart_base64,
-                df,
+            data, columns, shape = dataframe_to_bytes(buffer.to_dataframe(tail=self.chart_lookback))
+            loop = asyncio.get_running_loop()
+            png_bytes = await loop.run_in_executor(
+                self._chart_pool,
+                partial(render_chart_png_bytes_from_bytes, show_emas=False),
+                data,
+                columns,
+                shape,
                 self.chart_lookback,
-                chart_title,
-                show_emas=False
+                chart_title
             )
             
             # Guardar en archivo
             chart_dir = Path("data") / "charts" / last_candle.symbol
-            chart_dir.mkdir(parents=True, exist_ok=True)
+            self._ensure_directory(chart_dir)
             
             chart_path = chart_dir / "boot_snapshot.png"
             
-            with open(chart_path, "wb") as f:
-                f.write(base64.b64decode(chart_base64))
+            # Escritura del PNG en hilo separado (no bloquea el Event Loop)
+            await loop.run_in_executor(self._thread_pool, self._write_chart_file, chart_path, png_bytes)
             
             logger.info(f"📊 Gráfico inicial guardado: {chart_path}")
             
@@ -1658,7 +1808,11 @@ class AnalysisService:
         pattern: str
     ) -> None:
         """
-        Guarda una vela detectada en test/test_data.json.
+        Agrega una vela detectada a test/test_data.jsonl (una línea JSON por vela).
+        
+        Append-only: no se lee ni se reescribe el histórico en cada detección.
+        test/test_data.json se conserva como semilla y los lectores (test_candles,
+        visualize_patterns) concatenan ambos archivos.
         
         Args:
             apertura: Precio de apertura
@@ -1667,40 +1821,17 @@ class AnalysisService:
             cierre: Precio de cierre
             pattern: Tipo de patrón detectado (SHOOTING_STAR, HANGING_MAN, etc.)
         """
-        if not Config.UPDATE_TEST_DATA:
+        if not self._update_test_data:
             return
 
         try:
-            from pathlib import Path
-            import json
-            
             # Mapear nombres de patrones a formato del test
-            pattern_map = {
-                "SHOOTING_STAR": "shooting_star",
-                "HANGING_MAN": "hanging_man",
-                "INVERTED_HAMMER": "inverted_hammer",
-                "HAMMER": "hammer"
-            }
-            
-            tipo_vela = pattern_map.get(pattern)
+            tipo_vela = TEST_DATA_PATTERN_NAMES.get(pattern)
             if not tipo_vela:
-                logger.warning(f"⚠️  Patrón desconocido para guardar: {pattern}")
+                logger.warning("⚠️  Patrón desconocido para guardar: %s", pattern)
                 return
             
-            # Ruta al archivo test_data.json
-            test_file = Path("test") / "test_data.json"
-            
-            # Crear directorio si no existe
-            test_file.parent.mkdir(exist_ok=True)
-            
-            # Leer datos existentes
-            if test_file.exists():
-                with open(test_file, "r", encoding="utf-8") as f:
-                    test_data = json.load(f)
-            else:
-                test_data = []
-            
-            # Crear nuevo elemento
+            # Crear nuevo elemento (una línea JSONL)
             new_entry = {
                 "apertura": float(apertura),
                 "cierre": float(cierre),
@@ -1708,21 +1839,49 @@ class AnalysisService:
                 "minimo": float(minimo),
                 "tipo_vela": tipo_vela
             }
+            line = json_dumps(new_entry) + b"\n"
             
-            # Agregar al array
-            test_data.append(new_entry)
-            
-            # Guardar archivo actualizado
-            with open(test_file, "w", encoding="utf-8") as f:
-                json.dump(test_data, f, indent=2, ensure_ascii=False)
+            # Append de una línea por detección (las detecciones son raras),
+            # en el pool de hilos sin bloquear el Event Loop
+            self._ensure_directory(TEST_DATA_FILE.parent)
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._thread_pool, self._append_test_data_line, TEST_DATA_FILE, line)
+            self._test_data_written += 1
             
+            # Formato diferido (%-style): no se arma el string si INFO está filtrado
             logger.info(
-                f"💾 VELA GUARDADA EN TEST_DATA.JSON | Tipo: {tipo_vela} | "
-                f"Total velas: {len(test_data)}"
+                "💾 VELA AGREGADA A TEST_DATA.JSONL | Tipo: %s | Velas agregadas (sesión): %d",
+                tipo_vela, self._test_data_written
             )
             
         except Exception as e:
-            log_exception(logger, "Error guardando vela en test_data.json", e)
+            log_exception(logger, "Error guardando vela en test_data.jsonl", e)
+    
+    @staticmethod
+    def _append_test_data_line(test_file: Path, line: bytes) -> None:
+        """
+        Escritura síncrona append-only (ejecutada en thread separado).
+        
+        Args:
+            test_file: Ruta al archivo JSONL
+            line: Línea JSON codificada (incluye salto de línea)
+        """
+        with open(test_file, "ab") as f:
+            f.write(line)
+    
+    def shutdown(self) -> None:
+        """
+        Detiene los workers de señales y libera los pools de gráficos
+        (procesos) y de trabajo por fuente (hilos).
+        Debe invocarse durante el graceful shutdown del bot.
+        """
+        for worker in self._signal_workers:
+            worker.cancel()
+        self._signal_workers = []
+        
+        self._chart_pool.shutdown(wait=False, cancel_futures=True)
+        self._thread_pool.shutdown(wait=False, cancel_futures=True)
+        logger.info("📊 Analysis Service detenido (pools de gráficos liberados)")
     
     def get_buffer_status(self) -> Dict[str, int]:
         """
@@ -1732,6 +1891,6 @@ class AnalysisService:
             Dict[str, int]: Diccionario con el conteo de velas por fuente
         """
         return {
-            source_key: len(df)
-            for source_key, df in self.dataframes.items()
+            source_key: len(state.buffer)
+            for source_key, state in self._states.items()
         }
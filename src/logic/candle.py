@@ -9,14 +9,126 @@ Patrones implementados:
 3. Inverted Hammer (Martillo Invertido) - Patrón de reversión alcista
 4. Hammer (Martillo) - Patrón de reversión alcista
 
-Cada función retorna una tupla (is_pattern: bool, confidence: float)
-donde confidence es un score de 0.0 a 1.0.
+Cada función retorna una tupla (is_pattern: bool, confidence: float, reason: str)
+donde confidence es un score de 0.0 a 1.0. El cálculo numérico se delega a
+kernels compilados con Numba (src/logic/_candle_njit.py), especializados con los
+umbrales de Config.CANDLE ya fijados; el texto del motivo
+de rechazo solo se construye en Python cuando el patrón no se detecta
+(y se omite con explain=False).
+Los resultados se cachean por OHLC (lru_cache) para re-chequeos de la misma vela.
 
 Author: TradingView Pattern Monitor Team
 """
 
-from typing import Tuple
+from functools import lru_cache
+from typing import Tuple, Union
 from config import Config
+from src.logic._candle_njit import (
+    REASON_NO_RANGE,
+    REASON_WRONG_COLOR,
+    FLAG_SHOOTING_STAR,
+    FLAG_HANGING_MAN,
+    FLAG_INVERTED_HAMMER,
+    FLAG_HAMMER,
+    specialize_pattern_kernels,
+)
+
+
+# Patrón -> bit FLAG_* (misma codificación que la máscara de los kernels).
+# La clasificación por grupos se resuelve con un AND entero en lugar de
+# buscar el nombre en listas de strings.
+PATTERN_FLAGS = {
+    "SHOOTING_STAR": FLAG_SHOOTING_STAR,
+    "HANGING_MAN": FLAG_HANGING_MAN,
+    "INVERTED_HAMMER": FLAG_INVERTED_HAMMER,
+    "HAMMER": FLAG_HAMMER,
+}
+
+# Dirección esperada de la vela de resultado
+EXPECTS_RED_MASK = FLAG_SHOOTING_STAR | FLAG_INVERTED_HAMMER
+EXPECTS_GREEN_MASK = FLAG_HAMMER | FLAG_HANGING_MAN
+
+# Candle Exhaustion: ruptura del máximo anterior o del mínimo anterior
+BREAKS_HIGH_MASK = FLAG_SHOOTING_STAR | FLAG_HANGING_MAN
+BREAKS_LOW_MASK = FLAG_HAMMER | FLAG_INVERTED_HAMMER
+
+
+# Tamaño del cache de resultados por OHLC: backtests y re-chequeos de la
+# misma vela reutilizan el resultado sin volver a evaluar los kernels.
+DETECTOR_CACHE_SIZE = 1024
+
+# Umbrales de Config.CANDLE en el orden de argumentos de los kernels y
+# kernels especializados con esos umbrales fijados (specialize_pattern_kernels).
+# Se construyen una sola vez (en lugar de 6 lookups Config.CANDLE.* por llamada);
+# reload_thresholds() los regenera si Config se modifica en caliente.
+_ALL_PATTERN_THRESHOLDS: Tuple[float, ...] = ()
+_shooting_star_kernel = None
+_hanging_man_kernel = None
+_inverted_hammer_kernel = None
+_hammer_kernel = None
+_detect_all_kernel = None
+
+
+def reload_thresholds() -> Tuple[float, ...]:
+    """
+    Relee los umbrales de Config.CANDLE usados por los detectores.
+    
+    Returns:
+        Tuple[float, ...]: Umbrales en el orden de detect_all_patterns_nb
+        (upper_wick_min, lower_wick_min, small_body, opposite_max,
+        wick_to_body, base, bonus)
+    """
+    global _ALL_PATTERN_THRESHOLDS, _shooting_star_kernel, _hanging_man_kernel
+    global _inverted_hammer_kernel, _hammer_kernel, _detect_all_kernel
+    
+    cfg = Config.CANDLE
+    thresholds = (
+        float(cfg.UPPER_WICK_RATIO_MIN),
+        float(cfg.LOWER_WICK_RATIO_MIN),
+        float(cfg.SMALL_BODY_RATIO),
+        float(cfg.OPPOSITE_WICK_MAX),
+        float(cfg.WICK_TO_BODY_RATIO),
+        float(cfg.BASE_CONFIDENCE),
+        float(cfg.BONUS_CONFIDENCE_PER_CONDITION),
+    )
+    
+    # Sin cambios: se conservan los kernels ya compilados y los caches
+    if thresholds == _ALL_PATTERN_THRESHOLDS:
+        return _ALL_PATTERN_THRESHOLDS
+    
+    _ALL_PATTERN_THRESHOLDS = thresholds
+    (
+        _shooting_star_kernel,
+        _hanging_man_kernel,
+        _inverted_hammer_kernel,
+        _hammer_kernel,
+        _detect_all_kernel,
+    ) = specialize_pattern_kernels(*thresholds)
+    
+    # Los resultados cacheados dependen de los umbrales anteriores
+    for detector in _CACHED_DETECTORS:
+        detector.cache_clear()
+    
+    return _ALL_PATTERN_THRESHOLDS
+
+
+def get_expected_direction(pattern: str) -> str:
+    """
+    Dirección de vela que anticipa un patrón.
+    
+    Args:
+        pattern: Tipo de patrón ("SHOOTING_STAR", "HANGING_MAN", "HAMMER", "INVERTED_HAMMER")
+        
+    Returns:
+        str: "ROJA" (Shooting Star, Inverted Hammer), "VERDE" (Hammer, Hanging Man)
+        o "UNKNOWN" si el patrón no es reconocido
+    """
+    flag = PATTERN_FLAGS.get(pattern, 0)
+    if flag & EXPECTS_RED_MASK:
+        return "ROJA"
+    if flag & EXPECTS_GREEN_MASK:
+        return "VERDE"
+    return "UNKNOWN"
 
 
 def get_candle_direction(open_price: float, close: float) -> str:
@@ -39,7 +151,7 @@ def get_candle_direction(open_price: float, close: float) -> str:
 
 
 def detect_candle_exhaustion(
-    pattern: str,
+    pattern: Union[str, int],
     current_high: float,
     current_low: float,
     prev_high: float,
@@ -61,6 +173,7 @@ def detect_candle_exhaustion(
     
     Args:
         pattern: Tipo de patrón ("SHOOTING_STAR", "HANGING_MAN", "HAMMER", "INVERTED_HAMMER")
+            o directamente su FLAG_* (escaneos batch que ya tienen la máscara)
         current_high: Precio máximo de la vela actual
         current_low: Precio mínimo de la vela actual
         prev_high: Precio máximo de la vela anterior
@@ -69,12 +182,15 @@ def detect_candle_exhaustion(
     Returns:
         bool: True si detecta Candle Exhaustion, False en caso contrario
     """
+    # Los FLAG_* pueden llegar como enteros NumPy (columna uint8 pattern_mask)
+    flag = PATTERN_FLAGS.get(pattern, 0) if isinstance(pattern, str) else int(pattern)
+    
     # Patrones bajistas: verificar ruptura y rechazo del máximo
-    if pattern in ["SHOOTING_STAR", "HANGING_MAN"]:
+    if flag & BREAKS_HIGH_MASK:
         return current_high > prev_high
     
     # Patrones alcistas: verificar ruptura y rechazo del mínimo
-    elif pattern in ["HAMMER", "INVERTED_HAMMER"]:
+    elif flag & BREAKS_LOW_MASK:
         return current_low < prev_low
     
     # Patrón no reconocido
@@ -89,6 +205,8 @@ def _calculate_candle_metrics(
 ) -> Tuple[float, float, float, float, float]:
     """
     Calcula las métricas básicas de una vela.
+    Se mantiene para diagnóstico (test/test_candles.py); los detectores
+    calculan las métricas en los kernels JIT.
     
     Args:
         open_price: Precio de apertura
@@ -120,11 +238,13 @@ def _calculate_candle_metrics(
     return total_range, body_size, upper_wick, lower_wick, body_ratio
 
 
+@lru_cache(maxsize=DETECTOR_CACHE_SIZE)
 def is_shooting_star(
     open_price: float,
     high: float,
     low: float,
-    close: float
+    close: float,
+    explain: bool = True
 ) -> Tuple[bool, float, str]:
     """
     Detecta el patrón Shooting Star (Estrella Fugaz).
@@ -145,71 +265,33 @@ def is_shooting_star(
         high: Precio máximo
         low: Precio mínimo
         close: Precio de cierre
+        explain: Si es False, el motivo de rechazo no se construye (retorna "");
+            para escaneos masivos que solo necesitan detectado/confianza
         
     Returns:
         Tuple[bool, float, str]: (es_shooting_star, confianza, motivo_rechazo)
     """
-    total_range, body_size, upper_wick, lower_wick, body_ratio = _calculate_candle_metrics(
-        open_price, high, low, close
+    detected, confidence, reason_code = _shooting_star_kernel(
+        float(open_price), float(high), float(low), float(close)
     )
     
-    if total_range == 0:
-        return False, 0.0, "Vela sin rango (high == low)"
-    
-    # ⚠️ VALIDACIÓN CRÍTICA: Shooting Star debe ser ROJO o neutral
-    # Si es vela VERDE (close > open), NO es Shooting Star
-    if close > open_price:
-        return False, 0.0, "Vela verde (debe ser roja o neutral)"
-    
-    # Cálculo de ratios
-    upper_wick_ratio = upper_wick / total_range
-    lower_wick_ratio = lower_wick / total_range
-    
-    # Condiciones del patrón
-    has_long_upper_wick = upper_wick_ratio >= Config.CANDLE.UPPER_WICK_RATIO_MIN
-    has_small_body = body_ratio <= Config.CANDLE.SMALL_BODY_RATIO
-    has_small_lower_wick = lower_wick_ratio <= Config.CANDLE.OPPOSITE_WICK_MAX
-    wick_to_body = (upper_wick / body_size) >= Config.CANDLE.WICK_TO_BODY_RATIO if body_size > 0 else False
-    
-    # Validación del patrón y construcción del motivo
-    reasons = []
-    if not has_long_upper_wick:
-        reasons.append(f"Mecha superior muy corta ({upper_wick_ratio*100:.1f}%, necesita ≥60%)")
-    if not has_small_body:
-        reasons.append(f"Cuerpo demasiado grande ({body_ratio*100:.1f}%, necesita ≤30%)")
-    if not has_small_lower_wick:
-        reasons.append(f"Mecha inferior muy larga ({lower_wick_ratio*100:.1f}%, necesita ≤15%)")
-    if not wick_to_body:
-        ratio = (upper_wick / body_size) if body_size > 0 else 0
-        reasons.append(f"Mecha superior/cuerpo insuficiente ({ratio:.1f}x, necesita ≥2x)")
-    
-    if reasons:
-        return False, 0.0, " | ".join(reasons)
+    if detected:
+        return True, confidence, "Patrón válido"
     
-    # Cálculo de confianza (scoring)
-    confidence = Config.CANDLE.BASE_CONFIDENCE
-    
-    # Bonos por condiciones excepcionales
-    if upper_wick_ratio >= 0.70:  # Mecha superior muy larga
-        confidence += Config.CANDLE.BONUS_CONFIDENCE_PER_CONDITION
-    
-    if body_ratio <= 0.20:  # Cuerpo muy pequeño
-        confidence += Config.CANDLE.BONUS_CONFIDENCE_PER_CONDITION
-    
-    if lower_wick_ratio <= 0.10:  # Mecha inferior casi inexistente
-        confidence += Config.CANDLE.BONUS_CONFIDENCE_PER_CONDITION
-    
-    # Limitar confianza a 1.0
-    confidence = min(confidence, 1.0)
-    
-    return True, confidence, "Patrón válido"
+    if not explain:
+        return False, 0.0, ""
+    return False, 0.0, _rejection_reason(
+        reason_code, "Vela verde (debe ser roja o neutral)", True, open_price, high, low, close
+    )
 
 
+@lru_cache(maxsize=DETECTOR_CACHE_SIZE)
 def is_hanging_man(
     open_price: float,
     high: float,
     low: float,
-    close: float
+    close: float,
+    explain: bool = True
 ) -> Tuple[bool, float, str]:
     """
     Detecta el patrón Hanging Man (Hombre Colgado).
@@ -231,70 +313,33 @@ def is_hanging_man(
         high: Precio máximo
         low: Precio mínimo
         close: Precio de cierre
+        explain: Si es False, el motivo de rechazo no se construye (retorna "");
+            para escaneos masivos que solo necesitan detectado/confianza
         
     Returns:
         Tuple[bool, float, str]: (es_hanging_man, confianza, motivo_rechazo)
     """
-    total_range, body_size, upper_wick, lower_wick, body_ratio = _calculate_candle_metrics(
-        open_price, high, low, close
+    detected, confidence, reason_code = _hanging_man_kernel(
+        float(open_price), float(high), float(low), float(close)
     )
     
-    if total_range == 0:
-        return False, 0.0, "Vela sin rango (high == low)"
-    
-    # ⚠️ VALIDACIÓN CRÍTICA: Hanging Man debe ser ROJO o neutral
-    # Si es vela VERDE (close > open), NO es Hanging Man
-    if close > open_price:
-        return False, 0.0, "Vela verde (debe ser roja o neutral)"
-    
-    # Cálculo de ratios
-    upper_wick_ratio = upper_wick / total_range
-    lower_wick_ratio = lower_wick / total_range
+    if detected:
+        return True, confidence, "Patrón válido"
     
-    # Condiciones del patrón
-    has_long_lower_wick = lower_wick_ratio >= Config.CANDLE.LOWER_WICK_RATIO_MIN
-    has_small_body = body_ratio <= Config.CANDLE.SMALL_BODY_RATIO
-    has_small_upper_wick = upper_wick_ratio <= Config.CANDLE.OPPOSITE_WICK_MAX
-    wick_to_body = (lower_wick / body_size) >= Config.CANDLE.WICK_TO_BODY_RATIO if body_size > 0 else False
-    
-    # Validación del patrón y construcción del motivo
-    reasons = []
-    if not has_long_lower_wick:
-        reasons.append(f"Mecha inferior muy corta ({lower_wick_ratio*100:.1f}%, necesita ≥60%)")
-    if not has_small_body:
-        reasons.append(f"Cuerpo demasiado grande ({body_ratio*100:.1f}%, necesita ≤30%)")
-    if not has_small_upper_wick:
-        reasons.append(f"Mecha superior muy larga ({upper_wick_ratio*100:.1f}%, necesita ≤15%)")
-    if not wick_to_body:
-        ratio = (lower_wick / body_size) if body_size > 0 else 0
-        reasons.append(f"Mecha inferior/cuerpo insuficiente ({ratio:.1f}x, necesita ≥2x)")
-    
-    if reasons:
-        return False, 0.0, " | ".join(reasons)
-    
-    # Cálculo de confianza
-    confidence = Config.CANDLE.BASE_CONFIDENCE
-    
-    # Bonos por condiciones excepcionales
-    if lower_wick_ratio >= 0.70:
-        confidence += Config.CANDLE.BONUS_CONFIDENCE_PER_CONDITION
-    
-    if body_ratio <= 0.20:
-        confidence += Config.CANDLE.BONUS_CONFIDENCE_PER_CONDITION
-    
-    if upper_wick_ratio <= 0.10:
-        confidence += Config.CANDLE.BONUS_CONFIDENCE_PER_CONDITION
-    
-    confidence = min(confidence, 1.0)
-    
-    return True, confidence, "Patrón válido"
+    if not explain:
+        return False, 0.0, ""
+    return False, 0.0, _rejection_reason(
+        reason_code, "Vela verde (debe ser roja o neutral)", False, open_price, high, low, close
+    )
 
 
+@lru_cache(maxsize=DETECTOR_CACHE_SIZE)
 def is_inverted_hammer(
     open_price: float,
     high: float,
     low: float,
-    close: float
+    close: float,
+    explain: bool = True
 ) -> Tuple[bool, float, str]:
     """
     Detecta el patrón Inverted Hammer (Martillo Invertido).
@@ -317,70 +362,33 @@ def is_inverted_hammer(
         high: Precio máximo
         low: Precio mínimo
         close: Precio de cierre
+        explain: Si es False, el motivo de rechazo no se construye (retorna "");
+            para escaneos masivos que solo necesitan detectado/confianza
         
     Returns:
         Tuple[bool, float, str]: (es_inverted_hammer, confianza, motivo_rechazo)
     """
-    total_range, body_size, upper_wick, lower_wick, body_ratio = _calculate_candle_metrics(
-        open_price, high, low, close
+    detected, confidence, reason_code = _inverted_hammer_kernel(
+        float(open_price), float(high), float(low), float(close)
     )
     
-    if total_range == 0:
-        return False, 0.0, "Vela sin rango (high == low)"
-    
-    # ⚠️ VALIDACIÓN CRÍTICA: Inverted Hammer debe ser VERDE
-    # Si es vela ROJA (close <= open), NO es Inverted Hammer (sería Shooting Star)
-    if close <= open_price:
-        return False, 0.0, "Vela roja o neutral (debe ser verde)"
-    
-    # Cálculo de ratios
-    upper_wick_ratio = upper_wick / total_range
-    lower_wick_ratio = lower_wick / total_range
-    
-    # Condiciones del patrón
-    has_long_upper_wick = upper_wick_ratio >= Config.CANDLE.UPPER_WICK_RATIO_MIN
-    has_small_body = body_ratio <= Config.CANDLE.SMALL_BODY_RATIO
-    has_small_lower_wick = lower_wick_ratio <= Config.CANDLE.OPPOSITE_WICK_MAX
-    wick_to_body = (upper_wick / body_size) >= Config.CANDLE.WICK_TO_BODY_RATIO if body_size > 0 else False
-    
-    # Validación del patrón y construcción del motivo
-    reasons = []
-    if not has_long_upper_wick:
-        reasons.append(f"Mecha superior muy corta ({upper_wick_ratio*100:.1f}%, necesita ≥60%)")
-    if not has_small_body:
-        reasons.append(f"Cuerpo demasiado grande ({body_ratio*100:.1f}%, necesita ≤30%)")
-    if not has_small_lower_wick:
-        reasons.append(f"Mecha inferior muy larga ({lower_wick_ratio*100:.1f}%, necesita ≤15%)")
-    if not wick_to_body:
-        ratio = (upper_wick / body_size) if body_size > 0 else 0
-        reasons.append(f"Mecha superior/cuerpo insuficiente ({ratio:.1f}x, necesita ≥2x)")
-    
-    if reasons:
-        return False, 0.0, " | ".join(reasons)
-    
-    # Cálculo de confianza
-    confidence = Config.CANDLE.BASE_CONFIDENCE
-    
-    # Bonos
-    if upper_wick_ratio >= 0.70:
-        confidence += Config.CANDLE.BONUS_CONFIDENCE_PER_CONDITION
-    
-    if body_ratio <= 0.20:
-        confidence += Config.CANDLE.BONUS_CONFIDENCE_PER_CONDITION
-    
-    if lower_wick_ratio <= 0.10:
-        confidence += Config.CANDLE.BONUS_CONFIDENCE_PER_CONDITION
-    
-    confidence = min(confidence, 1.0)
+    if detected:
+        return True, confidence, "Patrón válido"
     
-    return True, confidence, "Patrón válido"
+    if not explain:
+        return False, 0.0, ""
+    return False, 0.0, _rejection_reason(
+        reason_code, "Vela roja o neutral (debe ser verde)", True, open_price, high, low, close
+    )
 
 
+@lru_cache(maxsize=DETECTOR_CACHE_SIZE)
 def is_hammer(
     open_price: float,
     high: float,
     low: float,
-    close: float
+    close: float,
+    explain: bool = True
 ) -> Tuple[bool, float, str]:
     """
     Detecta el patrón Hammer (Martillo).
@@ -407,63 +415,129 @@ def is_hammer(
         high: Precio máximo
         low: Precio mínimo
         close: Precio de cierre
+        explain: Si es False, el motivo de rechazo no se construye (retorna "");
+            para escaneos masivos que solo necesitan detectado/confianza
         
     Returns:
         Tuple[bool, float, str]: (es_hammer, confianza, motivo_rechazo)
     """
-    total_range, body_size, upper_wick, lower_wick, body_ratio = _calculate_candle_metrics(
-        open_price, high, low, close
+    detected, confidence, reason_code = _hammer_kernel(
+        float(open_price), float(high), float(low), float(close)
     )
     
-    if total_range == 0:
-        return False, 0.0, "Vela sin rango (high == low)"
+    if detected:
+        return True, confidence, "Patrón válido"
     
-    # ⚠️ VALIDACIÓN CRÍTICA: Hammer debe ser VERDE
-    # Si es vela ROJA (close <= open), NO es Hammer (sería Hanging Man)
-    if close <= open_price:
-        return False, 0.0, "Vela roja o neutral (debe ser verde)"
+    if not explain:
+        return False, 0.0, ""
+    return False, 0.0, _rejection_reason(
+        reason_code, "Vela roja o neutral (debe ser verde)", False, open_price, high, low, close
+    )
+
+
+def _rejection_reason(
+    reason_code: int,
+    wrong_color_message: str,
+    long_wick_is_upper: bool,
+    open_price: float,
+    high: float,
+    low: float,
+    close: float
+) -> str:
+    """
+    Construye el motivo de rechazo legible a partir del código del kernel.
+    Solo se invoca cuando el patrón NO fue detectado.
     
-    # Cálculo de ratios
+    Args:
+        reason_code: Código retornado por el kernel (REASON_*)
+        wrong_color_message: Mensaje si la vela tiene el color incorrecto
+        long_wick_is_upper: True para Shooting Star / Inverted Hammer
+        open_price: Precio de apertura
+        high: Precio máximo
+        low: Precio mínimo
+        close: Precio de cierre
+        
+    Returns:
+        str: Motivo(s) de rechazo separados por " | "
+    """
+    if reason_code == REASON_NO_RANGE:
+        return "Vela sin rango (high == low)"
+    if reason_code == REASON_WRONG_COLOR:
+        return wrong_color_message
+    
+    # Métricas inline (sin la tupla intermedia de _calculate_candle_metrics);
+    # total_range != 0 garantizado por REASON_NO_RANGE
+    total_range = high - low
+    body_size = abs(close - open_price)
+    body_ratio = body_size / total_range
+    is_green = close > open_price
+    upper_wick = high - (close if is_green else open_price)
+    lower_wick = (open_price if is_green else close) - low
     upper_wick_ratio = upper_wick / total_range
     lower_wick_ratio = lower_wick / total_range
     
-    # Condiciones del patrón
-    has_long_lower_wick = lower_wick_ratio >= Config.CANDLE.LOWER_WICK_RATIO_MIN
-    has_small_body = body_ratio <= Config.CANDLE.SMALL_BODY_RATIO
-    has_small_upper_wick = upper_wick_ratio <= Config.CANDLE.OPPOSITE_WICK_MAX
-    wick_to_body = (lower_wick / body_size) >= Config.CANDLE.WICK_TO_BODY_RATIO if body_size > 0 else False
+    # Mismos umbrales que usaron los kernels (un solo acceso al global)
+    (upper_wick_min, lower_wick_min, small_body_max, opposite_wick_max,
+     wick_to_body_min, _, _) = _ALL_PATTERN_THRESHOLDS
+    
+    if long_wick_is_upper:
+        long_name, opposite_name = "superior", "inferior"
+        long_wick, long_ratio, opposite_ratio = upper_wick, upper_wick_ratio, lower_wick_ratio
+        long_ratio_min = upper_wick_min
+    else:
+        long_name, opposite_name = "inferior", "superior"
+        long_wick, long_ratio, opposite_ratio = lower_wick, lower_wick_ratio, upper_wick_ratio
+        long_ratio_min = lower_wick_min
     
-    # Validación del patrón y construcción del motivo
     reasons = []
-    if not has_long_lower_wick:
-        reasons.append(f"Mecha inferior muy corta ({lower_wick_ratio*100:.1f}%, necesita ≥60%)")
-    if not has_small_body:
+    if not long_ratio >= long_ratio_min:
+        reasons.append(f"Mecha {long_name} muy corta ({long_ratio*100:.1f}%, necesita ≥60%)")
+    if not body_ratio <= small_body_max:
         reasons.append(f"Cuerpo demasiado grande ({body_ratio*100:.1f}%, necesita ≤30%)")
-    if not has_small_upper_wick:
-        reasons.append(f"Mecha superior muy larga ({upper_wick_ratio*100:.1f}%, necesita ≤15%)")
+    if not opposite_ratio <= opposite_wick_max:
+        reasons.append(f"Mecha {opposite_name} muy larga ({opposite_ratio*100:.1f}%, necesita ≤15%)")
+    wick_to_body = (long_wick / body_size) >= wick_to_body_min if body_size > 0 else False
     if not wick_to_body:
-        ratio = (lower_wick / body_size) if body_size > 0 else 0
-        reasons.append(f"Mecha inferior/cuerpo insuficiente ({ratio:.1f}x, necesita ≥2x)")
-    
-    if reasons:
-        return False, 0.0, " | ".join(reasons)
+        ratio = (long_wick / body_size) if body_size > 0 else 0
+        reasons.append(f"Mecha {long_name}/cuerpo insuficiente ({ratio:.1f}x, necesita ≥2x)")
     
-    # Cálculo de confianza
-    confidence = Config.CANDLE.BASE_CONFIDENCE
-    
-    # Bonos
-    if lower_wick_ratio >= 0.70:
-        confidence += Config.CANDLE.BONUS_CONFIDENCE_PER_CONDITION
-    
-    if body_ratio <= 0.20:
-        confidence += Config.CANDLE.BONUS_CONFIDENCE_PER_CONDITION
-    
-    if upper_wick_ratio <= 0.10:
-        confidence += Config.CANDLE.BONUS_CONFIDENCE_PER_CONDITION
-    
-    # Nota: NO hay bono adicional por color verde porque ES OBLIGATORIO
-    # (ya fue validado al inicio de la función)
-    
-    confidence = min(confidence, 1.0)
+    return " | ".join(reasons)
+
+
+@lru_cache(maxsize=DETECTOR_CACHE_SIZE)
+def detect_all_patterns(
+    open_price: float,
+    high: float,
+    low: float,
+    close: float
+) -> Tuple[int, float, float, float, float]:
+    """
+    Detecta los 4 patrones con una sola llamada al kernel JIT.
+    Las métricas de la vela se calculan una única vez.
     
-    return True, confidence, "Patrón válido"
+    Args:
+        open_price: Precio de apertura
+        high: Precio máximo
+        low: Precio mínimo
+        close: Precio de cierre
+        
+    Returns:
+        Tuple[int, float, float, float, float]: (máscara FLAG_*, conf_shooting_star,
+        conf_hanging_man, conf_inverted_hammer, conf_hammer)
+    """
+    mask, conf_ss, conf_hm, conf_ih, conf_h = _detect_all_kernel(
+        float(open_price), float(high), float(low), float(close)
+    )
+    return int(mask), conf_ss, conf_hm, conf_ih, conf_h
+
+
+# Detectores con cache por OHLC (se invalidan en reload_thresholds)
+_CACHED_DETECTORS = (
+    is_shooting_star,
+    is_hanging_man,
+    is_inverted_hammer,
+    is_hammer,
+    detect_all_patterns,
+)
+
+reload_thresholds()
@@ -0,0 +1,171 @@
+"""
+Candle Buffer - Columnar NumPy Storage
+=======================================
+Buffer de velas por fuente con un array NumPy preasignado por columna (SoA).
+
+Reemplaza el DataFrame que se reconstruía con pd.concat en cada vela cerrada
+(copia completa del buffer por vela). Agregar una vela es escribir una fila
+en arrays ya reservados: O(1) amortizado.
+
+Los arrays tienen capacidad para 2x el tamaño máximo del buffer. Las velas
+válidas ocupan siempre un tramo contiguo y en orden cronológico
+[start, end), así cada columna se expone como una vista sin copia
+(a diferencia de un ring buffer, no hace falta np.roll para leerla). Cuando
+el tramo llega al final de la capacidad, las últimas `max_size` velas se
+mueven al inicio: una copia cada `max_size` velas.
+
+Las vistas de column() son válidas hasta el próximo append(); para
+consumidores que corren fuera del event loop (gráficos en hilos/procesos)
+usar to_dataframe(), que copia.
+
+Author: TradingView Pattern Monitor Team
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class CandleBuffer:
+    """
+    Buffer columnar de tamaño acotado para las velas de una fuente.
+
+    Las columnas no provistas en append() (indicadores) quedan en NaN.
+    """
+
+    __slots__ = ("max_size", "_capacity", "_arrays", "_start", "_end")
+
+    def __init__(self, max_size: int, dtypes: Dict[str, type]):
+        """
+        Args:
+            max_size: Cantidad máxima de velas retenidas (las más viejas se descartan)
+            dtypes: Columna -> dtype NumPy (orden de columnas de to_dataframe)
+        """
+        self.max_size = max_size
+        self._capacity = 2 * max_size
+        self._arrays: Dict[str, np.ndarray] = {
+            column: np.empty(self._capacity, dtype=dtype) for column, dtype in dtypes.items()
+        }
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Vista (sin copia) de una columna en orden cronológico.
+
+        Args:
+            name: Nombre de la columna
+
+        Returns:
+            np.ndarray: Vista escribible, válida hasta el próximo append()
+        """
+        return self._arrays[name][self._start:self._end]
+
+    def last(self, name: str):
+        """
+        Valor de una columna en la última vela.
+
+        Args:
+            name: Nombre de la columna
+
+        Returns:
+            Escalar NumPy de la última fila
+        """
+        return self._arrays[name][self._end - 1]
+
+    def row(self, index: int = -1) -> Dict[str, object]:
+        """
+        Fila como diccionario columna -> valor (escalares NumPy).
+
+        Args:
+            index: Posición de la vela (negativa desde el final)
+
+        Returns:
+            Dict[str, object]: Valores de la fila
+        """
+        position = (self._end + index) if index < 0 else (self._start + index)
+        return {column: array[position] for column, array in self._arrays.items()}
+
+    def append(self, values: Dict[str, float]) -> None:
+        """
+        Agrega una vela al final, descartando la más vieja si se supera max_size.
+
+        Args:
+            values: Columna -> valor; las columnas ausentes quedan en NaN
+        """
+        if self._end == self._capacity:
+            self._compact()
+
+        position = self._end
+        for column, array in self._arrays.items():
+            array[position] = values.get(column, np.nan)
+        self._end += 1
+
+        if self._end - self._start > self.max_size:
+            self._start += 1
+
+    def extend(self, values: Dict[str, np.ndarray]) -> None:
+        """
+        Agrega un bloque de velas al final con una copia por columna.
+
+        Equivale a llamar append() fila por fila (mismo tramo final de
+        `max_size` velas), sin el bucle por vela. Pensado para la carga del
+        histórico.
+
+        Args:
+            values: Columna -> array (todos del mismo largo); las columnas
+                ausentes quedan en NaN
+        """
+        count = len(next(iter(values.values()))) if values else 0
+        if count == 0:
+            return
+
+        if count >= self.max_size:
+            # El bloque reemplaza todo el buffer: solo sus últimas max_size velas
+            skip = count - self.max_size
+            self._start = 0
+            self._end = 0
+            count = self.max_size
+        else:
+            skip = 0
+            if self._end + count > self._capacity:
+                self._compact()
+
+        position = self._end
+        for column, array in self._arrays.items():
+            block = values.get(column)
+            if block is None:
+                array[position:position + count] = np.nan
+            else:
+                array[position:position + count] = block[skip:]
+        self._end += count
+
+        if self._end - self._start > self.max_size:
+            self._start = self._end - self.max_size
+
+    def _compact(self) -> None:
+        """Mueve el tramo de velas válidas al inicio de los arrays."""
+        count = self._end - self._start
+        for array in self._arrays.values():
+            array[:count] = array[self._start:self._end]
+        self._start = 0
+        self._end = count
+
+    def to_dataframe(self, tail: Optional[int] = None) -> pd.DataFrame:
+        """
+        Copia del buffer como DataFrame (índice 0..n-1).
+
+        Args:
+            tail: Si se indica, solo las últimas `tail` velas
+
+        Returns:
+            pd.DataFrame: Snapshot independiente del buffer
+        """
+        start = self._start if tail is None else max(self._start, self._end - tail)
+        return pd.DataFrame({
+            column: array[start:self._end].copy() for column, array in self._arrays.items()
+        })
@@ -0,0 +1,247 @@
+"""
+Candle Pattern Detection - Vectorized (NumPy)
+==============================================
+Versión vectorizada de los detectores de src/logic/candle.py.
+
+Evalúa los 4 patrones sobre arrays OHLC completos en una sola pasada:
+las métricas de la vela (rango, cuerpo, mechas y ratios) se calculan una
+única vez y se reutilizan para los 4 patrones. Útil para escanear el buffer
+completo o datasets históricos (backtesting) sin N llamadas escalares.
+
+La semántica es idéntica a la versión escalar (mismos umbrales de
+Config.CANDLE, mismo orden de suma de bonos de confianza).
+
+Si Numba está instalado, detect_patterns_batch usa el kernel compilado
+(un único bucle nativo sin arrays temporales intermedios), en paralelo
+para datasets grandes.
+
+Author: TradingView Pattern Monitor Team
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from src.logic._candle_njit import (
+    FLAG_SHOOTING_STAR,
+    FLAG_HANGING_MAN,
+    FLAG_INVERTED_HAMMER,
+    FLAG_HAMMER,
+    RANGE_EPS,
+    detect_patterns_batch_nb,
+    detect_patterns_batch_parallel_nb,
+)
+from src.utils._njit import NUMBA_AVAILABLE
+
+
+PATTERN_NAMES = ("SHOOTING_STAR", "HANGING_MAN", "INVERTED_HAMMER", "HAMMER")
+
+# Desde este tamaño el escaneo Numba se reparte entre núcleos (prange); por
+# debajo, lanzar los hilos cuesta más que el bucle serial
+PARALLEL_BATCH_MIN_ROWS = 200_000
+
+
+def _confidence_table(base: float, bonus: float) -> np.ndarray:
+    """
+    Confianza según la cantidad de condiciones de bono cumplidas (0..3).
+    
+    Args:
+        base: Confianza base del patrón
+        bonus: Bono por condición adicional
+        
+    Returns:
+        np.ndarray: Tabla de 4 confianzas (acotadas a 1.0)
+    """
+    table = [base]
+    for _ in range(3):
+        table.append(table[-1] + bonus)
+    return np.minimum(np.array(table), 1.0)
+
+
+def compute_pattern_flags(
+    open_price: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray
+) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Detecta los 4 patrones sobre arrays OHLC en una sola pasada vectorizada.
+
+    Args:
+        open_price: Array de precios de apertura
+        high: Array de precios máximos
+        low: Array de precios mínimos
+        close: Array de precios de cierre
+
+    Returns:
+        Dict[str, Tuple[np.ndarray, np.ndarray]]: patrón -> (máscara bool, confianza float64)
+    """
+    o = np.asarray(open_price, dtype=np.float64)
+    h = np.asarray(high, dtype=np.float64)
+    l = np.asarray(low, dtype=np.float64)
+    c = np.asarray(close, dtype=np.float64)
+
+    cfg = Config.CANDLE
+
+    # Métricas comunes (una sola vez para los 4 patrones)
+    total_range = h - l
+    body_size = np.abs(c - o)
+    is_green = c > o
+    upper_wick = h - np.maximum(o, c)
+    lower_wick = np.minimum(o, c) - l
+
+    has_range = np.abs(total_range) > RANGE_EPS * np.maximum(np.abs(o), 1.0)
+    has_body = body_size > 0
+
+    # Ratios seguros: las velas sin rango quedan en 0.0 (descartadas por has_range)
+    body_ratio = np.divide(body_size, total_range, out=np.zeros_like(o), where=has_range)
+    upper_wick_ratio = np.divide(upper_wick, total_range, out=np.zeros_like(o), where=has_range)
+    lower_wick_ratio = np.divide(lower_wick, total_range, out=np.zeros_like(o), where=has_range)
+    upper_wick_to_body = np.divide(upper_wick, body_size, out=np.zeros_like(o), where=has_body)
+    lower_wick_to_body = np.divide(lower_wick, body_size, out=np.zeros_like(o), where=has_body)
+
+    has_small_body = body_ratio <= cfg.SMALL_BODY_RATIO
+
+    # Forma "mecha superior larga" (Shooting Star / Inverted Hammer)
+    upper_shape = (
+        has_range
+        & has_small_body
+        & (upper_wick_ratio >= cfg.UPPER_WICK_RATIO_MIN)
+        & (lower_wick_ratio <= cfg.OPPOSITE_WICK_MAX)
+        & has_body
+        & (upper_wick_to_body >= cfg.WICK_TO_BODY_RATIO)
+    )
+
+    # Forma "mecha inferior larga" (Hanging Man / Hammer)
+    lower_shape = (
+        has_range
+        & has_small_body
+        & (lower_wick_ratio >= cfg.LOWER_WICK_RATIO_MIN)
+        & (upper_wick_ratio <= cfg.OPPOSITE_WICK_MAX)
+        & has_body
+        & (lower_wick_to_body >= cfg.WICK_TO_BODY_RATIO)
+    )
+
+    # Confianza: cantidad de bonos cumplidos (0..3) indexando una tabla
+    # armada con el mismo orden de suma que la versión escalar
+    confidence_table = _confidence_table(cfg.BASE_CONFIDENCE, cfg.BONUS_CONFIDENCE_PER_CONDITION)
+    small_body_bonus = (body_ratio <= 0.20).astype(np.uint8)
+
+    upper_bonus = small_body_bonus + (upper_wick_ratio >= 0.70) + (lower_wick_ratio <= 0.10)
+    lower_bonus = small_body_bonus + (lower_wick_ratio >= 0.70) + (upper_wick_ratio <= 0.10)
+    upper_conf = confidence_table[upper_bonus]
+    lower_conf = confidence_table[lower_bonus]
+
+    # Color: Shooting Star / Hanging Man rojas o neutrales, Inverted Hammer / Hammer verdes
+    shooting_star = upper_shape & ~is_green
+    inverted_hammer = upper_shape & is_green
+    hanging_man = lower_shape & ~is_green
+    hammer = lower_shape & is_green
+
+    return {
+        "SHOOTING_STAR": (shooting_star, np.where(shooting_star, upper_conf, 0.0)),
+        "HANGING_MAN": (hanging_man, np.where(hanging_man, lower_conf, 0.0)),
+        "INVERTED_HAMMER": (inverted_hammer, np.where(inverted_hammer, upper_conf, 0.0)),
+        "HAMMER": (hammer, np.where(hammer, lower_conf, 0.0)),
+    }
+
+
+def detect_patterns_batch(
+    open_price: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Versión batch de detect_all_patterns: máscara FLAG_* empaquetada por vela.
+
+    Permite filtrar de un golpe las velas sin patrón (mask == 0) al escanear
+    buffers o datasets históricos.
+
+    Args:
+        open_price: Array de precios de apertura
+        high: Array de precios máximos
+        low: Array de precios mínimos
+        close: Array de precios de cierre
+
+    Returns:
+        Tuple: (máscara uint8 FLAG_*, conf_shooting_star, conf_hanging_man,
+        conf_inverted_hammer, conf_hammer, candle_exhaustion bool), todos
+        arrays de la longitud de entrada. candle_exhaustion aplica la regla de
+        detect_candle_exhaustion contra la vela anterior en las velas con patrón.
+    """
+    if NUMBA_AVAILABLE:
+        cfg = Config.CANDLE
+        kernel = (
+            detect_patterns_batch_parallel_nb
+            if len(open_price) >= PARALLEL_BATCH_MIN_ROWS
+            else detect_patterns_batch_nb
+        )
+        return kernel(
+            np.ascontiguousarray(open_price, dtype=np.float64),
+            np.ascontiguousarray(high, dtype=np.float64),
+            np.ascontiguousarray(low, dtype=np.float64),
+            np.ascontiguousarray(close, dtype=np.float64),
+            cfg.UPPER_WICK_RATIO_MIN, cfg.LOWER_WICK_RATIO_MIN, cfg.SMALL_BODY_RATIO,
+            cfg.OPPOSITE_WICK_MAX, cfg.WICK_TO_BODY_RATIO, cfg.BASE_CONFIDENCE,
+            cfg.BONUS_CONFIDENCE_PER_CONDITION
+        )
+
+    flags = compute_pattern_flags(open_price, high, low, close)
+    ss, conf_ss = flags["SHOOTING_STAR"]
+    hm, conf_hm = flags["HANGING_MAN"]
+    ih, conf_ih = flags["INVERTED_HAMMER"]
+    h, conf_h = flags["HAMMER"]
+
+    mask = (
+        ss * np.uint8(FLAG_SHOOTING_STAR)
+        | hm * np.uint8(FLAG_HANGING_MAN)
+        | ih * np.uint8(FLAG_INVERTED_HAMMER)
+        | h * np.uint8(FLAG_HAMMER)
+    ).astype(np.uint8)
+
+    high_arr = np.asarray(high, dtype=np.float64)
+    low_arr = np.asarray(low, dtype=np.float64)
+    exhaustion = np.zeros(len(mask), dtype=bool)
+    exhaustion[1:] = np.where(
+        (ss | hm)[1:],
+        high_arr[1:] > high_arr[:-1],
+        (ih | h)[1:] & (low_arr[1:] < low_arr[:-1])
+    )
+
+    return mask, conf_ss, conf_hm, conf_ih, conf_h, exhaustion
+
+
+def annotate_patterns(
+    dataframe: pd.DataFrame,
+    ohlc_columns: Tuple[str, str, str, str] = ("open", "high", "low", "close")
+) -> pd.DataFrame:
+    """
+    Agrega al DataFrame las columnas `pattern_mask` (uint8 FLAG_*),
+    `pattern_confidence` (confianza del patrón detectado, 0.0 si no hay) y
+    `candle_exhaustion` (ruptura del high/low de la fila anterior).
+
+    Los 4 patrones salen de una sola pasada sobre las columnas OHLC; una vela
+    solo puede activar un bit (mecha larga superior XOR inferior, y el color
+    separa cada par), por lo que la confianza cabe en una única columna.
+
+    Args:
+        dataframe: DataFrame con columnas OHLC (se modifica in-place)
+        ohlc_columns: Nombres de las columnas (open, high, low, close)
+
+    Returns:
+        pd.DataFrame: El mismo DataFrame con las tres columnas nuevas
+    """
+    open_col, high_col, low_col, close_col = ohlc_columns
+    mask, conf_ss, conf_hm, conf_ih, conf_h, exhaustion = detect_patterns_batch(
+        dataframe[open_col].to_numpy(dtype=np.float64),
+        dataframe[high_col].to_numpy(dtype=np.float64),
+        dataframe[low_col].to_numpy(dtype=np.float64),
+        dataframe[close_col].to_numpy(dtype=np.float64)
+    )
+    dataframe["pattern_mask"] = mask
+    dataframe["pattern_confidence"] = conf_ss + conf_hm + conf_ih + conf_h
+    dataframe["candle_exhaustion"] = exhaustion
+    return dataframe
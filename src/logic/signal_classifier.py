@@ -11,8 +11,214 @@ Centralizes the logic for classifying the strength of a trading signal based on:
 Author: TradingView Pattern Monitor Team
 """
 
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from config import Config
+from src.logic._candle_njit import (
+    FLAG_SHOOTING_STAR,
+    FLAG_HANGING_MAN,
+    FLAG_INVERTED_HAMMER,
+    FLAG_HAMMER
+)
+
+
+# Estado de tendencia -> bucket entero (ordenado de alcista a bajista).
+# Permite comparar dirección con enteros en lugar de buscar substrings.
+TREND_STRONG_BULLISH = 0
+TREND_WEAK_BULLISH = 1
+TREND_NEUTRAL = 2
+TREND_WEAK_BEARISH = 3
+TREND_STRONG_BEARISH = 4
+
+TREND_BUCKET = {
+    "STRONG_BULLISH": TREND_STRONG_BULLISH,
+    "WEAK_BULLISH": TREND_WEAK_BULLISH,
+    "NEUTRAL": TREND_NEUTRAL,
+    "WEAK_BEARISH": TREND_WEAK_BEARISH,
+    "STRONG_BEARISH": TREND_STRONG_BEARISH,
+}
+
+# Bucket -> estado (inverso de TREND_BUCKET, para los kernels que retornan el bucket)
+TREND_STATUSES = ("STRONG_BULLISH", "WEAK_BULLISH", "NEUTRAL", "WEAK_BEARISH", "STRONG_BEARISH")
+
+
+# =============================================================================
+# DECISION MATRIX (built once at import)
+# =============================================================================
+# Key: (trend_bucket, pattern, bollinger_exhaustion, candle_exhaustion)
+# Value: (signal_strength, is_trend_aligned, is_counter_trend)
+#
+# Reemplaza la cascada if/elif por un único acceso a diccionario por vela.
+# Las combinaciones no presentes (p.ej. tendencia NEUTRAL) resuelven a _DEFAULT_ENTRY.
+
+# Escala de fuerza según (bollinger_exhaustion, candle_exhaustion)
+_PRIMARY_SCALE = {
+    (True, True): "VERY_HIGH",
+    (True, False): "HIGH",
+    (False, True): "LOW",
+    (False, False): "VERY_LOW",
+}
+_SECONDARY_SCALE = {
+    (True, True): "MEDIUM",
+    (True, False): "LOW",
+    (False, True): "VERY_LOW",
+    (False, False): "NONE",
+}
+
+# Patrón -> (tendencia requerida, escala aplicada en esa tendencia)
+_PATTERN_RULES = {
+    "SHOOTING_STAR": ("BULLISH", _PRIMARY_SCALE),
+    "INVERTED_HAMMER": ("BULLISH", _SECONDARY_SCALE),
+    "HAMMER": ("BEARISH", _PRIMARY_SCALE),
+    "HANGING_MAN": ("BEARISH", _SECONDARY_SCALE),
+}
+
+# Dirección de reversión que anticipa cada patrón
+_BEARISH_PATTERNS = ("SHOOTING_STAR", "HANGING_MAN")
+_BULLISH_PATTERNS = ("HAMMER", "INVERTED_HAMMER")
+
+_TREND_BUCKETS = {
+    "STRONG_BULLISH": "BULLISH",
+    "WEAK_BULLISH": "BULLISH",
+    "NEUTRAL": "NEUTRAL",
+    "WEAK_BEARISH": "BEARISH",
+    "STRONG_BEARISH": "BEARISH",
+}
+
+_DEFAULT_ENTRY = ("NONE", False, False)
+
+
+def _build_signal_matrix() -> Dict[Tuple[str, str, bool, bool], Tuple[str, bool, bool]]:
+    """
+    Construye la matriz de decisión completa (3 tendencias x 4 patrones x 2 x 2).
+    
+    Returns:
+        Dict con todas las combinaciones de contexto precomputadas
+    """
+    matrix = {}
+    for pattern, (required_bucket, scale) in _PATTERN_RULES.items():
+        is_bearish_pattern = pattern in _BEARISH_PATTERNS
+        for bucket in ("BULLISH", "BEARISH", "NEUTRAL"):
+            # Patrón bajista espera tendencia alcista (y viceversa)
+            is_trend_aligned = bucket == ("BULLISH" if is_bearish_pattern else "BEARISH")
+            is_counter_trend = bucket == ("BEARISH" if is_bearish_pattern else "BULLISH")
+            for bollinger_exhaustion in (True, False):
+                for candle_exhaustion in (True, False):
+                    if bucket == required_bucket:
+                        strength = scale[(bollinger_exhaustion, candle_exhaustion)]
+                    else:
+                        strength = "NONE"
+                    matrix[(bucket, pattern, bollinger_exhaustion, candle_exhaustion)] = (
+                        strength, is_trend_aligned, is_counter_trend
+                    )
+    return matrix
+
+
+_SIGNAL_MATRIX = _build_signal_matrix()
+
+
+# FLAG_* -> nombre del patrón (claves de _PATTERN_RULES)
+_PATTERN_BY_FLAG = {
+    FLAG_SHOOTING_STAR: "SHOOTING_STAR",
+    FLAG_HANGING_MAN: "HANGING_MAN",
+    FLAG_INVERTED_HAMMER: "INVERTED_HAMMER",
+    FLAG_HAMMER: "HAMMER",
+}
+
+
+def _build_signal_code_table() -> Tuple:
+    """
+    Misma matriz que _SIGNAL_MATRIX, indexada por códigos enteros.
+    
+    Tuplas anidadas [bucket de tendencia 0..4][FLAG_* 0..8][bollinger][vela]:
+    la consulta son cuatro accesos por índice, sin hashear strings. Los
+    flags que no corresponden a un patrón resuelven a _DEFAULT_ENTRY.
+    
+    Returns:
+        Tuple: Tabla anidada de entradas (signal_strength, is_trend_aligned, is_counter_trend)
+    """
+    table = []
+    for trend_status in TREND_STATUSES:
+        bucket = _TREND_BUCKETS[trend_status]
+        by_flag = []
+        for flag in range(max(_PATTERN_BY_FLAG) + 1):
+            pattern = _PATTERN_BY_FLAG.get(flag)
+            by_flag.append(tuple(
+                tuple(
+                    _SIGNAL_MATRIX.get((bucket, pattern, bollinger_exhaustion, candle_exhaustion), _DEFAULT_ENTRY)
+                    for candle_exhaustion in (False, True)
+                )
+                for bollinger_exhaustion in (False, True)
+            ))
+        table.append(tuple(by_flag))
+    return tuple(table)
+
+
+_SIGNAL_CODE_TABLE = _build_signal_code_table()
+
+
+def get_trend_bucket(trend_status: str) -> str:
+    """
+    Reduce el estado granular de tendencia a BULLISH / BEARISH / NEUTRAL.
+    
+    Args:
+        trend_status: Estado de tendencia (STRONG_BULLISH, WEAK_BULLISH, etc.)
+        
+    Returns:
+        str: "BULLISH", "BEARISH" o "NEUTRAL"
+    """
+    bucket = _TREND_BUCKETS.get(trend_status)
+    if bucket is None:
+        bucket = "BULLISH" if "BULLISH" in trend_status else "BEARISH" if "BEARISH" in trend_status else "NEUTRAL"
+    return bucket
+
+
+def classify_signal_context(
+    pattern: str,
+    trend_status: str,
+    exhaustion_bb: str,
+    candle_exhaustion: bool
+) -> Tuple[str, bool, bool]:
+    """
+    Resuelve fuerza de señal y relación patrón/tendencia con un único lookup.
+    
+    Args:
+        pattern: Pattern name (SHOOTING_STAR, HANGING_MAN, INVERTED_HAMMER, HAMMER)
+        trend_status: Trend status (STRONG_BULLISH, WEAK_BULLISH, NEUTRAL, etc.)
+        exhaustion_bb: Bollinger exhaustion type (PEAK, BOTTOM, NONE)
+        candle_exhaustion: Boolean indicating if candle exhaustion occurred
+        
+    Returns:
+        Tuple[str, bool, bool]: (signal_strength, is_trend_aligned, is_counter_trend)
+    """
+    key = (
+        get_trend_bucket(trend_status),
+        pattern,
+        exhaustion_bb == "PEAK" or exhaustion_bb == "BOTTOM",
+        bool(candle_exhaustion)
+    )
+    return _SIGNAL_MATRIX.get(key, _DEFAULT_ENTRY)
+
+
+def classify_signal_codes(
+    pattern_flag: int,
+    trend_bucket: int,
+    bollinger_exhaustion: bool,
+    candle_exhaustion: bool
+) -> Tuple[str, bool, bool]:
+    """
+    Versión de classify_signal_context con los códigos enteros del kernel de análisis.
+    
+    Args:
+        pattern_flag: FLAG_* del patrón detectado
+        trend_bucket: Bucket de tendencia (TREND_STRONG_BULLISH .. TREND_STRONG_BEARISH)
+        bollinger_exhaustion: True si hay agotamiento Bollinger (PEAK o BOTTOM)
+        candle_exhaustion: True si la vela rompió el high/low anterior
+        
+    Returns:
+        Tuple[str, bool, bool]: (signal_strength, is_trend_aligned, is_counter_trend)
+    """
+    return _SIGNAL_CODE_TABLE[trend_bucket][pattern_flag][bool(bollinger_exhaustion)][bool(candle_exhaustion)]
+
 
 def classify_signal(
     pattern: str,
@@ -34,61 +240,6 @@ def classify_signal(
     Returns:
         str: Signal strength (VERY_HIGH, HIGH, MEDIUM, LOW, VERY_LOW, NONE)
     """
-    
-    # 1. Determine Trend Context
-    is_bullish_trend = "BULLISH" in trend_status
-    is_bearish_trend = "BEARISH" in trend_status
-    
-    # 2. Determine Bollinger Exhaustion
-    bollinger_exhaustion = exhaustion_bb in ["PEAK", "BOTTOM"]
-    
-    # 3. Initialize Strength
-    signal_strength = "NONE"
-    
-    # 4. Classification Logic
-    if is_bullish_trend:
-        if pattern == "SHOOTING_STAR":
-            if bollinger_exhaustion and candle_exhaustion:
-                signal_strength = "VERY_HIGH"
-            elif bollinger_exhaustion:
-                signal_strength = "HIGH"
-            elif candle_exhaustion:
-                signal_strength = "LOW"
-            else:
-                signal_strength = "VERY_LOW"
-                
-        elif pattern == "INVERTED_HAMMER":
-            if bollinger_exhaustion and candle_exhaustion:
-                signal_strength = "MEDIUM"
-            elif bollinger_exhaustion:
-                signal_strength = "LOW"
-            elif candle_exhaustion:
-                signal_strength = "VERY_LOW"
-            else:
-                signal_strength = "NONE"
-                
-    elif is_bearish_trend:
-        if pattern == "HAMMER":
-            if bollinger_exhaustion and candle_exhaustion:
-                signal_strength = "VERY_HIGH"
-            elif bollinger_exhaustion:
-                signal_strength = "HIGH"
-            elif candle_exhaustion:
-                signal_strength = "LOW"
-            else:
-                signal_strength = "VERY_LOW"
-                
-        elif pattern == "HANGING_MAN":
-            if bollinger_exhaustion and candle_exhaustion:
-                signal_strength = "MEDIUM"
-            elif bollinger_exhaustion:
-                signal_strength = "LOW"
-            elif candle_exhaustion:
-                signal_strength = "VERY_LOW"
-            else:
-                signal_strength = "NONE"
-                
-    # 5. Optional RSI Filter (Can be added here if needed to downgrade strength)
+    # Optional RSI Filter (Can be added here if needed to downgrade strength)
     # Currently handled outside or as a hard filter, but could be integrated here.
-    
-    return signal_strength
+    return classify_signal_context(pattern, trend_status, exhaustion_bb, candle_exhaustion)[0]
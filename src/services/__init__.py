@@ -1,19 +1,35 @@
-"""Services package initialization."""
+"""
+Services package initialization.
 
-from .connection_service import ConnectionService, CandleData
-from .telegram_service import TelegramService
-from .storage_service import StorageService
-from .local_notification_storage import LocalNotificationStorage
-from .statistics_service import StatisticsService
-from .tradingview_service import TradingViewService, HistoricalCandle
+Las clases se importan de forma diferida (PEP 562): acceder a
+`src.services.TelegramService` carga solo telegram_service, en lugar de
+importar todos los servicios (y sus dependencias: pandas, websockets, ...)
+con el paquete.
+"""
 
-__all__ = [
-    "ConnectionService",
-    "CandleData",
-    "TelegramService",
-    "StorageService",
-    "LocalNotificationStorage",
-    "StatisticsService",
-    "TradingViewService",
-    "HistoricalCandle"
-]
+from importlib import import_module
+
+# Nombre exportado -> submódulo que lo define
+_LAZY_EXPORTS = {
+    "ConnectionService": "connection_service",
+    "CandleData": "connection_service",
+    "TelegramService": "telegram_service",
+    "StorageService": "storage_service",
+    "LocalNotificationStorage": "local_notification_storage",
+    "StatisticsService": "statistics_service",
+    "TradingViewService": "tradingview_service",
+    "HistoricalCandle": "tradingview_service",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    # Cachear en el módulo: los accesos siguientes no pasan por __getattr__
+    globals()[name] = value
+    return value
+
+
+__all__ = list(_LAZY_EXPORTS)
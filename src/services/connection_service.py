@@ -14,18 +14,21 @@ Author: TradingView Pattern Monitor Team
 import asyncio
 import json
 import random
-import string
-from typing import Dict, Callable, Optional, Any, List
+import re
+import secrets
+from typing import Awaitable, Dict, Callable, Optional, Any, List, Tuple, Union
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from pathlib import Path
 
+import numpy as np
 import websockets
 from websockets.exceptions import ConnectionClosed, WebSocketException
 
 from config import Config, InstrumentConfig
 from src.utils.logger import get_logger, log_exception, log_critical_auth_failure
+from src.utils._json import dumps as json_dumps, loads as json_loads
 
 
 logger = get_logger(__name__)
@@ -35,9 +38,14 @@ logger = get_logger(__name__)
 # DATA STRUCTURES
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CandleData:
-    """Estructura de datos para una vela recibida."""
+    """
+    Estructura de datos para una vela recibida.
+    
+    Se crea una por vela entrante: con slots no lleva __dict__ por instancia,
+    y es inmutable (nadie la modifica después de construirla).
+    """
     timestamp: int
     open: float
     high: float
@@ -60,10 +68,18 @@ def generate_session_id(prefix: str = "qs") -> str:
         prefix: Prefijo del ID (qs para quote session, cs para chart session)
         
     Returns:
-        str: Session ID único (ej: "qs_abc123xyz")
+        str: Session ID único (ej: "qs_3f9a1c07be42")
     """
-    random_part = ''.join(random.choices(string.ascii_lowercase + string.digits, k=12))
-    return f"{prefix}_{random_part}"
+    # 12 caracteres hex generados en C (sin armar el alfabeto ni hacer join por llamada)
+    return f"{prefix}_{secrets.token_hex(6)}"
+
+
+# Encabezado de frame del protocolo: ~m~<length>~m~<json_payload>
+FRAME_HEADER_RE = re.compile(r"~m~([0-9]+)~m~")
+
+# Desde esta cantidad de velas el snapshot se convierte a float64 en bloque
+# (una conversión NumPy) en lugar de float()/int() campo por campo
+BATCH_PARSE_MIN_ROWS = 32
 
 
 def encode_message(func_name: str, params: List[Any]) -> str:
@@ -81,16 +97,84 @@ def encode_message(func_name: str, params: List[Any]) -> str:
         
     Example:
         >>> encode_message("set_auth_token", ["your_token"])
-        '~m~47~m~{"m":"set_auth_token","p":["your_token"]}'
+        '~m~41~m~{"m":"set_auth_token","p":["your_token"]}'
+        >>> decode_message(encode_message("x", ["é€"]))  # ida y vuelta con no-ASCII
+        [{'m': 'x', 'p': ['é€']}]
+    """
+    # JSON compacto en bytes (orjson si está instalado). El largo del frame
+    # cuenta caracteres (igual que decode_message): con payload ASCII bytes y
+    # caracteres coinciden; si hay no-ASCII se escapa a \uXXXX con json
+    message = {"m": func_name, "p": params}
+    payload = json_dumps(message)
+    if not payload.isascii():
+        payload = json.dumps(message, separators=(",", ":")).encode("ascii")
+    return (b"~m~%d~m~%s" % (len(payload), payload)).decode("ascii")
+
+
+def build_subscribe_payload(snapshot_candles: int) -> str:
+    """
+    Codifica las suscripciones de todos los instrumentos en un único payload.
+    
+    Por instrumento: chart_create_session, resolve_symbol y create_series.
+    El protocolo ~m~<len>~m~ se autodelimita, así que los frames viajan
+    concatenados en un solo send. Solo depende de la configuración y de
+    `snapshot_candles`, por lo que se codifica una vez y se reutiliza en
+    cada reconexión.
+    
+    Args:
+        snapshot_candles: Velas a solicitar por serie
+        
+    Returns:
+        str: Frames concatenados
     """
-    payload = json.dumps({"m": func_name, "p": params})
-    return f"~m~{len(payload)}~m~{payload}"
+    frames: List[str] = []
+    for instrument in Config.INSTRUMENTS.values():
+        chart_session_id = instrument.chart_session_id
+        
+        # Crear chart session
+        frames.append(encode_message("chart_create_session", [chart_session_id]))
+        
+        frames.append(encode_message(
+            "resolve_symbol",
+            [
+                chart_session_id,
+                "symbol_1",
+                f"={json.dumps({'symbol': instrument.full_symbol, 'adjustment': 'splits'})}"
+            ]
+        ))
+        
+        # Crear serie con timeframe 1m
+        frames.append(encode_message(
+            "create_series",
+            [
+                chart_session_id,
+                "s1",
+                "s1",
+                "symbol_1",
+                instrument.timeframe,
+                snapshot_candles  # 1000 en primera conexión, 1 en reconexiones
+            ]
+        ))
+    return "".join(frames)
 
 
 def decode_message(raw_message: str) -> List[Dict[str, Any]]:
     """
     Decodifica mensajes del protocolo TradingView.
     
+    Cada encabezado ~m~<length>~m~ se ubica con una búsqueda del regex
+    precompilado (en C) y el payload se toma por longitud exacta; la
+    búsqueda siguiente arranca después del payload, así un "~m~" dentro
+    de un string JSON no se confunde con un encabezado.
+    
+    El slice solo se acepta si termina justo donde empieza el próximo
+    encabezado (o el mensaje). Si el largo declarado no coincide, el frame
+    se descarta y la búsqueda sigue desde su payload, sin perder los frames
+    siguientes.
+    
+    Los payloads se parsean con orjson si está instalado (acepta el slice
+    str directamente); sus errores heredan de json.JSONDecodeError.
+    
     Args:
         raw_message: Mensaje crudo recibido del WebSocket
         
@@ -98,21 +182,23 @@ def decode_message(raw_message: str) -> List[Dict[str, Any]]:
         List[Dict]: Lista de mensajes decodificados
     """
     messages = []
-    parts = raw_message.split("~m~")
-    
-    i = 0
-    while i < len(parts):
-        if parts[i].isdigit():
-            length = int(parts[i])
-            if i + 1 < len(parts) and len(parts[i + 1]) == length:
-                try:
-                    data = json.loads(parts[i + 1])
-                    messages.append(data)
-                except json.JSONDecodeError:
-                    pass
-            i += 2
-        else:
-            i += 1
+    search = FRAME_HEADER_RE.search
+    total_length = len(raw_message)
+    
+    header = search(raw_message)
+    while header is not None:
+        payload_start = header.end()
+        payload_end = payload_start + int(header.group(1))
+        if payload_end != total_length and not raw_message.startswith("~m~", payload_end):
+            # Largo declarado inconsistente (o frame truncado): descartar
+            header = search(raw_message, payload_start)
+            continue
+        
+        try:
+            messages.append(json_loads(raw_message[payload_start:payload_end]))
+        except json.JSONDecodeError:
+            pass
+        header = search(raw_message, payload_end)
     
     return messages
 
@@ -156,6 +242,9 @@ class ConnectionService:
         # Session IDs para el protocolo TradingView
         self.quote_session_id: str = generate_session_id("qs")
         self.chart_sessions: Dict[str, str] = {}  # key: "primary"/"secondary"
+        # Índice inverso chart_session_id -> (key, exchange, symbol): resuelve la
+        # fuente de cada timescale_update/du con un único lookup
+        self._session_instruments: Dict[str, Tuple[str, str, str]] = {}
         
         # Control de reconexión
         self.reconnect_attempts: int = 0
@@ -165,9 +254,37 @@ class ConnectionService:
         self.snapshot_received: Dict[str, bool] = {}
         self.snapshot_completed: Dict[str, bool] = {}  # Track cuando termina el snapshot
         self.first_connection: bool = True  # Flag para saber si es la primera conexión
+        # Frames de suscripción ya codificados, por cantidad de velas pedidas
+        # (solo cambian entre primera conexión y reconexión)
+        self._subscribe_payloads: Dict[int, str] = {}
+        # Último valor [t, o, h, l, c, v] recibido por chart session (du):
+        # una réplica idéntica se descarta antes de construir la vela
+        self._last_candle_values: Dict[str, List[float]] = {}
+        # chart_session_id -> Event que se activa al recibir su series_completed
+        self._series_ready: Dict[str, asyncio.Event] = {}
         
         # Message task
         self.message_task: Optional[asyncio.Task] = None
+        
+        # Cola acotada de velas en tiempo real consumida por un único worker:
+        # el loop de recepción solo encola y vuelve a leer el socket (y a
+        # responder heartbeats) mientras el análisis procesa. Un solo
+        # consumidor preserva el orden de las velas por fuente.
+        self._candle_queue: asyncio.Queue = asyncio.Queue(maxsize=Config.CANDLE_QUEUE_SIZE)
+        self._candle_worker_task: Optional[asyncio.Task] = None
+        
+        # Método del protocolo -> handler. Las confirmaciones
+        # (protocol_switched, quote_completed) no tienen handler: se ignoran
+        self._dispatch: Dict[str, Callable[[List[Any]], Awaitable[None]]] = {
+            "critical_error": self._on_error,
+            "error": self._on_error,
+            "protocol_error": self._on_error,
+            "timescale_update": self._on_timescale_update,
+            "du": self._process_realtime_update,  # Actualización en tiempo real (SÍ genera gráficos)
+            "symbol_error": self._on_symbol_error,
+            "series_error": self._on_series_error,
+            "series_completed": self._on_series_completed,
+        }
     
     async def start(self) -> None:
         """
@@ -183,6 +300,9 @@ class ConnectionService:
                 logger.info("Interrupción de teclado recibida. Cerrando...")
                 break
             except Exception as e:
+                if not self.is_running:
+                    # Socket cerrado por stop(): no es una caída, no reconectar
+                    break
                 log_exception(logger, "Unexpected error in connection loop", e)
                 await self._handle_reconnection()
         
@@ -200,14 +320,6 @@ class ConnectionService:
         logger.info("🛑 Deteniendo Connection Service...")
         self.is_running = False
         
-        # Cancelar message task si existe
-        if self.message_task and not self.message_task.done():
-            self.message_task.cancel()
-            try:
-                await self.message_task
-            except asyncio.CancelledError:
-                logger.debug("Tarea de mensajes cancelada")
-        
         # Cerrar chart sessions y quote session de forma limpia
         if self.websocket and not self.websocket.closed:
             try:
@@ -234,6 +346,23 @@ class ConnectionService:
                 await self.websocket.close()
                 logger.debug("🔌 Conexión WebSocket cerrada")
         
+        # Con el socket cerrado el loop de mensajes termina solo; cancelarlo
+        # solo si sigue vivo (ej: sin conexión establecida)
+        if self.message_task and not self.message_task.done():
+            self.message_task.cancel()
+            try:
+                await self.message_task
+            except asyncio.CancelledError:
+                logger.debug("Tarea de mensajes cancelada")
+        
+        # Cancelar el worker de velas
+        if self._candle_worker_task and not self._candle_worker_task.done():
+            self._candle_worker_task.cancel()
+            try:
+                await self._candle_worker_task
+            except asyncio.CancelledError:
+                logger.debug("Worker de velas cancelado")
+        
         logger.info("✅ Connection Service detenido correctamente")
     
     async def _connect_and_run(self) -> None:
@@ -264,14 +393,32 @@ class ConnectionService:
             
             logger.info("✅ WebSocket conectado exitosamente")
             
+            # Worker de velas (persiste entre reconexiones)
+            if self._candle_worker_task is None or self._candle_worker_task.done():
+                self._candle_worker_task = asyncio.create_task(self._candle_worker())
+            
             # Handshake y autenticación
             await self._authenticate()
             
+            # Loop de recepción de mensajes (no se necesita heartbeat proactivo).
+            # Arranca antes de suscribir: es quien recibe los series_completed
+            # que _subscribe_instruments espera
+            self.message_task = asyncio.create_task(self._message_loop())
+            
             # Suscripciones a instrumentos
-            await self._subscribe_instruments()
+            try:
+                await self._subscribe_instruments()
+            except BaseException:
+                self.message_task.cancel()
+                raise
             
-            # Loop de recepción de mensajes (no se necesita heartbeat proactivo)
-            await self._message_loop()
+            try:
+                await self.message_task
+            except asyncio.CancelledError:
+                # stop() canceló el loop de mensajes: fin normal del servicio.
+                # La cancelación no se propaga a start()/main()
+                if self.is_running:
+                    raise
     
     async def _authenticate(self) -> None:
         """
@@ -305,54 +452,46 @@ class ConnectionService:
         # Reconexiones: 1 vela para obtener el estado actual
         snapshot_candles = Config.TRADINGVIEW.snapshot_candles if self.first_connection else 1
         
+        self._series_ready = {}
+        
         for key, instrument in Config.INSTRUMENTS.items():
             logger.info(f"📊 Suscribiéndose a {instrument.full_symbol} ({key})...")
             
-            # Generar chart session ID único
+            # Chart session ID fijo por instrumento
             chart_session_id = instrument.chart_session_id
             self.chart_sessions[key] = chart_session_id
-            
-            # Crear chart session
-            create_session_msg = encode_message("chart_create_session", [chart_session_id])
-            await self.websocket.send(create_session_msg)
+            self._session_instruments[chart_session_id] = (key, instrument.exchange, instrument.symbol)
+            self._series_ready[chart_session_id] = asyncio.Event()
             
             # Solicitar snapshot de datos históricos
             if self.first_connection:
                 logger.info(f"📥 Solicitando {snapshot_candles} velas (primera conexión)")
             else:
                 logger.info(f"🔄 Reconexión - continuando con buffer existente")
-            
-            resolve_symbol_msg = encode_message(
-                "resolve_symbol",
-                [
-                    chart_session_id,
-                    "symbol_1",
-                    f"={json.dumps({'symbol': instrument.full_symbol, 'adjustment': 'splits'})}"
-                ]
-            )
-            await self.websocket.send(resolve_symbol_msg)
-            
-            # Crear serie con timeframe 1m
-            create_series_msg = encode_message(
-                "create_series",
-                [
-                    chart_session_id,
-                    "s1",
-                    "s1",
-                    "symbol_1",
-                    instrument.timeframe,
-                    snapshot_candles  # 1000 en primera conexión, 1 en reconexiones
-                ]
-            )
-            await self.websocket.send(create_series_msg)
-            
-            logger.info(f"✅ Suscrito a {instrument.full_symbol}")
+        
+        # Un solo frame WebSocket (una escritura) para todas las suscripciones
+        payload = self._subscribe_payloads.get(snapshot_candles)
+        if payload is None:
+            payload = self._subscribe_payloads[snapshot_candles] = build_subscribe_payload(snapshot_candles)
+        if payload:
+            await self.websocket.send(payload)
+            for instrument in Config.INSTRUMENTS.values():
+                logger.info(f"✅ Suscrito a {instrument.full_symbol}")
         
         # Marcar que ya no es la primera conexión
         if self.first_connection:
             self.first_connection = False
         
-        await asyncio.sleep(1)  # Dar tiempo para que el servidor procese
+        # Esperar a que el servidor confirme cada serie (series_completed)
+        # en lugar de una pausa fija
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(event.wait() for event in self._series_ready.values())),
+                timeout=Config.SERIES_READY_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            pending = [sid for sid, event in self._series_ready.items() if not event.is_set()]
+            logger.warning(f"⚠️  Sin series_completed tras {Config.SERIES_READY_TIMEOUT}s para: {pending}")
     
     async def _message_loop(self) -> None:
         """
@@ -385,73 +524,88 @@ class ConnectionService:
             raw_message: Mensaje crudo recibido
         """
         messages = decode_message(raw_message)
+        dispatch = self._dispatch
         
         for msg in messages:
             if not isinstance(msg, dict):
                 continue
             
             method = msg.get("m")
-            params = msg.get("p", [])
             
             # Log de TODOS los métodos recibidos para debug
             if method:
                 logger.info(f"📥 Mensaje recibido | Método: {method}")
             
-            # Detectar fallo de autenticación o error de protocolo
-            if method == "critical_error" or method == "error" or method == "protocol_error":
-                error_msg = params[0] if params else "Unknown error"
-                logger.error(f"❌ TradingView Error: {error_msg}")
-                
-                if "auth" in error_msg.lower() or "token" in error_msg.lower():
-                    log_critical_auth_failure(logger)
-                    if self.on_auth_failure_callback:
-                        self.on_auth_failure_callback()
-                    self.is_running = False
-                    return
-                
-                if "authorization" in error_msg.lower() or "session" in error_msg.lower():
-                    log_critical_auth_failure(logger)
-                    if self.on_auth_failure_callback:
-                        self.on_auth_failure_callback()
-                    self.is_running = False
-            
-            # Procesar datos de velas (snapshot inicial)
-            elif method == "timescale_update":
-                # Si es el primer timescale_update para esta sesión, guardar snapshot
-                if params and len(params) >= 2:
-                    chart_session_id = params[0]
-                    if chart_session_id not in self.snapshot_received:
-                        await self._save_snapshot_to_file(chart_session_id, params)
-                        self.snapshot_received[chart_session_id] = True
-                
-                # Procesar snapshot histórico (NO genera gráficos)
-                await self._load_historical_snapshot(params)
-            
-            # Procesar actualizaciones en tiempo real (método 'du' = data update)
-            elif method == "du":
-                # logger.info(f"🔄 MENSAJE DU | Params: {params[:2] if len(params) > 2 else params}")
-                # Procesar vela en tiempo real (SÍ genera gráficos)
-                await self._process_realtime_update(params)
-            
-            # Errores de símbolo o serie
-            elif method == "symbol_error":
-                error_details = params[1] if len(params) > 1 else "Sin detalles"
-                logger.error(f"❌ SYMBOL_ERROR | Símbolo no disponible o acceso denegado | Detalles: {error_details}")
-            
-            elif method == "series_error":
-                error_details = params[1] if len(params) > 1 else "Sin detalles"
-                logger.error(f"❌ SERIES_ERROR | Error al cargar series de datos | Detalles: {error_details}")
+            # Un lookup en la tabla de handlers en lugar de la cadena de if/elif
+            handler = dispatch.get(method)
+            if handler is None:
+                continue
             
-            # Confirmaciones de protocolo
-            elif method in ["protocol_switched", "quote_completed"]:
-                pass  # No loguear confirmaciones
+            await handler(msg.get("p", []))
             
-            elif method == "series_completed":
-                # Marcar snapshot como completado
-                if params and len(params) >= 1:
-                    chart_session_id = params[0]
-                    self.snapshot_completed[chart_session_id] = True
-                    logger.info(f"✅ Snapshot completado para {chart_session_id}. Procesamiento en tiempo real ACTIVO.")
+            # Fallo de autenticación: no procesar el resto del frame
+            if not self.is_running:
+                return
+    
+    async def _on_error(self, params: List[Any]) -> None:
+        """
+        Detecta fallo de autenticación o error de protocolo
+        (critical_error / error / protocol_error).
+        
+        Args:
+            params: Parámetros del mensaje
+        """
+        error_msg = params[0] if params else "Unknown error"
+        logger.error(f"❌ TradingView Error: {error_msg}")
+        
+        lowered = error_msg.lower()
+        if "auth" in lowered or "token" in lowered or "session" in lowered:
+            log_critical_auth_failure(logger)
+            if self.on_auth_failure_callback:
+                self.on_auth_failure_callback()
+            self.is_running = False
+    
+    async def _on_timescale_update(self, params: List[Any]) -> None:
+        """
+        Procesa datos de velas (snapshot inicial).
+        
+        Args:
+            params: Parámetros del mensaje timescale_update
+        """
+        # Si es el primer timescale_update para esta sesión, guardar snapshot
+        if params and len(params) >= 2:
+            chart_session_id = params[0]
+            if chart_session_id not in self.snapshot_received:
+                await self._save_snapshot_to_file(chart_session_id, params)
+                self.snapshot_received[chart_session_id] = True
+        
+        # Procesar snapshot histórico (NO genera gráficos)
+        await self._load_historical_snapshot(params)
+    
+    async def _on_symbol_error(self, params: List[Any]) -> None:
+        """Error de símbolo (no disponible o acceso denegado)."""
+        error_details = params[1] if len(params) > 1 else "Sin detalles"
+        logger.error(f"❌ SYMBOL_ERROR | Símbolo no disponible o acceso denegado | Detalles: {error_details}")
+    
+    async def _on_series_error(self, params: List[Any]) -> None:
+        """Error al cargar la serie de datos."""
+        error_details = params[1] if len(params) > 1 else "Sin detalles"
+        logger.error(f"❌ SERIES_ERROR | Error al cargar series de datos | Detalles: {error_details}")
+    
+    async def _on_series_completed(self, params: List[Any]) -> None:
+        """
+        Marca el snapshot de una chart session como completado.
+        
+        Args:
+            params: Parámetros del mensaje series_completed
+        """
+        if params and len(params) >= 1:
+            chart_session_id = params[0]
+            self.snapshot_completed[chart_session_id] = True
+            ready = self._series_ready.get(chart_session_id)
+            if ready is not None:
+                ready.set()
+            logger.info(f"✅ Snapshot completado para {chart_session_id}. Procesamiento en tiempo real ACTIVO.")
     
     async def _load_historical_snapshot(self, params: List[Any]) -> None:
         """
@@ -472,19 +626,11 @@ class ConnectionService:
         data_payload = params[1]  # ✅ El payload está en params[1] para timescale_update
         
         # Identificar la fuente (OANDA o FX)
-        source = None
-        symbol = None
-        source_key = None
-        for key, session_id in self.chart_sessions.items():
-            if session_id == chart_session_id:
-                source = Config.INSTRUMENTS[key].exchange
-                symbol = Config.INSTRUMENTS[key].symbol
-                source_key = key
-                break
-        
-        if not source:
+        instrument = self._session_instruments.get(chart_session_id)
+        if instrument is None:
             logger.warning(f"⚠️  CARGA DE SNAPSHOT FALLÓ | Sesión de gráfico desconocida: {chart_session_id}")
             return
+        source_key, source, symbol = instrument
         
         logger.info(f"📥 Cargando 1000 velas históricas para {source_key}...")
         
@@ -496,36 +642,60 @@ class ConnectionService:
             if isinstance(s1_data, dict) and "s" in s1_data:
                 series_data = s1_data["s"]
                 
-                for candle_obj in series_data:
-                    if "v" in candle_obj:
-                        candle_values = candle_obj["v"]
-                        
-                        if len(candle_values) >= 6:
-                            candle = CandleData(
-                                timestamp=int(candle_values[0]),
-                                open=float(candle_values[1]),
-                                high=float(candle_values[2]),
-                                low=float(candle_values[3]),
-                                close=float(candle_values[4]),
-                                volume=float(candle_values[5]),
-                                source=source,
-                                symbol=symbol
-                            )
-                            candle_list.append(candle)
+                rows = [
+                    candle_obj["v"][:6] for candle_obj in series_data
+                    if "v" in candle_obj and len(candle_obj["v"]) >= 6
+                ]
+                
+                if len(rows) >= BATCH_PARSE_MIN_ROWS:
+                    # Matriz (n, 6) [t, o, h, l, c, v]: una sola conversión en C
+                    values = np.asarray(rows, dtype=np.float64)
+                    candle_list = [
+                        CandleData(
+                            timestamp=timestamp,
+                            open=open_price,
+                            high=high,
+                            low=low,
+                            close=close,
+                            volume=volume,
+                            source=source,
+                            symbol=symbol
+                        )
+                        for timestamp, open_price, high, low, close, volume in zip(
+                            values[:, 0].astype(np.int64).tolist(),
+                            *values[:, 1:].T.tolist()
+                        )
+                    ]
+                else:
+                    for candle_values in rows:
+                        candle = CandleData(
+                            timestamp=int(candle_values[0]),
+                            open=float(candle_values[1]),
+                            high=float(candle_values[2]),
+                            low=float(candle_values[3]),
+                            close=float(candle_values[4]),
+                            volume=float(candle_values[5]),
+                            source=source,
+                            symbol=symbol
+                        )
+                        candle_list.append(candle)
         
         # Cargar todas las velas de una vez en el AnalysisService
         if candle_list and self.analysis_service:
             if len(candle_list) == 1 and chart_session_id in self.snapshot_completed:
                 # Si es UNA sola vela Y ya se completó el snapshot inicial, procesarla como tiempo real
                 logger.info(f"✅ Cargada 1 vela cerrada. Procesando como tiempo real...")
-                await self.analysis_service.process_realtime_candle(candle_list[0])
+                self._dispatch_candle(candle_list[0])
             elif len(candle_list) == 1:
                 # Si es UNA vela pero es reconexión (sin snapshot previo), ignorarla
                 logger.info(f"🔄 Reconexión detectada. Ignorando vela de sincronización. Continuando con buffer existente.")
             else:
                 # Si son múltiples velas (snapshot inicial), cargarlas sin análisis
                 logger.info(f"✅ Cargadas {len(candle_list)} velas históricas. Enviando a AnalysisService...")
-                self.analysis_service.load_historical_candles(candle_list)
+                # El bloque histórico va por la misma cola: el worker lo carga
+                # después de las velas en tiempo real ya encoladas, sin frenar
+                # la lectura del socket
+                self._dispatch_candle(candle_list)
         else:
             logger.warning(f"⚠️  No se extrajeron velas del snapshot")
     
@@ -548,17 +718,11 @@ class ConnectionService:
         data_payload = params[1]
         
         # Identificar la fuente (OANDA o FX)
-        source = None
-        symbol = None
-        for key, session_id in self.chart_sessions.items():
-            if session_id == chart_session_id:
-                source = Config.INSTRUMENTS[key].exchange
-                symbol = Config.INSTRUMENTS[key].symbol
-                break
-        
-        if not source:
+        instrument = self._session_instruments.get(chart_session_id)
+        if instrument is None:
             logger.warning(f"⚠️  ACTUALIZACIÓN EN TIEMPO REAL FALLÓ | Sesión de gráfico desconocida: {chart_session_id}")
             return
+        _, source, symbol = instrument
         
         # Extraer la vela del mensaje 'du'
         if isinstance(data_payload, dict) and "s1" in data_payload:
@@ -570,6 +734,12 @@ class ConnectionService:
                 if len(series_data) > 0 and "v" in series_data[0]:
                     candle_values = series_data[0]["v"]
                     
+                    # Réplica exacta de la última actualización: no cambia la vela
+                    # (solo volvería a sumar su volumen a la vela en formación)
+                    if candle_values == self._last_candle_values.get(chart_session_id):
+                        return
+                    self._last_candle_values[chart_session_id] = candle_values
+                    
                     if len(candle_values) >= 6:
                         candle = CandleData(
                             timestamp=int(candle_values[0]),
@@ -594,12 +764,58 @@ class ConnectionService:
                         
                         # Procesar vela en tiempo real - genera gráficos y alertas
                         if self.analysis_service:
-                            await self.analysis_service.process_realtime_candle(candle)
+                            self._dispatch_candle(candle)
                     else:
                         logger.warning(f"⚠️  Valores de vela muy cortos: {len(candle_values)}")
         else:
             logger.warning(f"⚠️  Formato de actualización en tiempo real inválido")
     
+    def _dispatch_candle(self, item: Union[CandleData, List[CandleData]]) -> None:
+        """
+        Encola una vela en tiempo real (o un bloque histórico) para el worker
+        de análisis.
+        
+        Si la cola está llena se descarta el elemento más viejo: el análisis
+        prioriza el estado más reciente del mercado.
+        
+        Args:
+            item: Vela recibida, o lista de velas del snapshot histórico
+        """
+        try:
+            self._candle_queue.put_nowait(item)
+        except asyncio.QueueFull:
+            dropped = self._candle_queue.get_nowait()
+            self._candle_queue.task_done()
+            self._candle_queue.put_nowait(item)
+            if isinstance(dropped, list):
+                description = f"snapshot histórico de {len(dropped)} velas"
+            else:
+                description = f"{dropped.source}:{dropped.symbol} @ {dropped.timestamp}"
+            logger.warning(
+                f"⚠️  Cola de velas llena ({Config.CANDLE_QUEUE_SIZE}) | Descartando {description}"
+            )
+    
+    async def _candle_worker(self) -> None:
+        """
+        Consume la cola de velas y las entrega al AnalysisService en orden.
+        
+        Los bloques históricos (listas) se cargan sin análisis con
+        load_historical_candles; las velas sueltas pasan por
+        process_realtime_candle. Una excepción al procesar se registra y el
+        worker sigue con el próximo elemento.
+        """
+        while True:
+            item = await self._candle_queue.get()
+            try:
+                if isinstance(item, list):
+                    self.analysis_service.load_historical_candles(item)
+                else:
+                    await self.analysis_service.process_realtime_candle(item)
+            except Exception as e:
+                log_exception(logger, "Error procesando velas en el worker de análisis", e)
+            finally:
+                self._candle_queue.task_done()
+    
     async def _save_snapshot_to_file(self, chart_session_id: str, params: List[Any]) -> None:
         """
         Guarda el snapshot inicial de 1000 velas en un archivo JSON.
@@ -614,11 +830,8 @@ class ConnectionService:
             logs_dir.mkdir(exist_ok=True)
             
             # Identificar la fuente
-            source = "unknown"
-            for key, session_id in self.chart_sessions.items():
-                if session_id == chart_session_id:
-                    source = Config.INSTRUMENTS[key].exchange
-                    break
+            instrument = self._session_instruments.get(chart_session_id)
+            source = instrument[1] if instrument is not None else "unknown"
             
             # Nombre del archivo con timestamp
             timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -648,10 +861,14 @@ class ConnectionService:
         self.reconnect_attempts += 1
         
         # Calcular delay con backoff exponencial
-        delay = min(
+        base_delay = min(
             Config.RECONNECT_INITIAL_TIMEOUT * (2 ** (self.reconnect_attempts - 1)),
             Config.RECONNECT_MAX_TIMEOUT
         )
+        # Jitter (50-100% del delay): evita que varios clientes reconecten
+        # en sincronía tras un corte de TradingView
+        delay = round(base_delay * (0.5 + random.random() * 0.5), 2)
+        logger.debug(f"⏱️  Backoff: base {base_delay}s | con jitter {delay}s")
         
         logger.warning(
             f"🔄 RECONNECTION #{self.reconnect_attempts}/{self.max_reconnect_attempts} | "
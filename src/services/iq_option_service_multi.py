@@ -494,6 +494,11 @@ class IqOptionServiceMultiAsync:
         
         logger.info(f"⚡ INICIALIZACIÓN: Solicitando {count_to_request} velas por activo...")
         
+        # Snapshots iniciales pendientes: (source_key, última vela cerrada).
+        # Las descargas se mantienen secuenciales (el cliente de IQ Option no es
+        # thread-safe), pero los gráficos se generan en paralelo al final.
+        initial_charts = []
+        
         for symbol in Config.TARGET_ASSETS:
             try:
                 # Solicitar datos a la API (Blocking call run in executor)
@@ -539,7 +544,7 @@ class IqOptionServiceMultiAsync:
                     # 4. Generar gráfico inicial (Snapshot)
                     if Config.GENERATE_HISTORICAL_CHARTS:
                         source_key = f"{last_closed_candle.source}_{symbol}"
-                        await self.analysis_service.generate_initial_chart(source_key, last_closed_candle)
+                        initial_charts.append((source_key, last_closed_candle))
 
                 # 4. Cargar en InstrumentState (Buffer interno de IQ Service)
                 state = self.iq_service.instrument_states[symbol]
@@ -554,6 +559,13 @@ class IqOptionServiceMultiAsync:
                     f"❌ Error crítico cargando históricos para {symbol}: {e}",
                     exc_info=True
                 )
+        
+        # 5. Gráficos iniciales de todas las fuentes en paralelo (pool compartido)
+        if initial_charts:
+            await asyncio.gather(*(
+                self.analysis_service.generate_initial_chart(source_key, candle)
+                for source_key, candle in initial_charts
+            ))
 
     async def _poll_instrument(self, symbol: str) -> None:
         """
@@ -13,14 +13,18 @@ Responsabilidades:
 Author: TradingView Pattern Monitor Team
 """
 import os
+import copy
 import json
+import time
 import pandas as pd
 import numpy as np
 from typing import Dict, Optional, List, Tuple
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+from config import Config
 from src.utils.logger import get_logger
+from src.logic.candle import get_expected_direction
 
 
 
@@ -36,6 +40,7 @@ class StatisticsService:
     - Normalización de scores usando lógica actual
     - Queries de probabilidad con fuzzy matching
     - Análisis de rachas (streaks) de éxito/fracaso
+    - Caché con TTL de consultas de probabilidad
     """
     
     def __init__(self, data_path: str = "data/trading_signals_dataset.jsonl"):
@@ -50,6 +55,9 @@ class StatisticsService:
         self.last_load_time: Optional[datetime] = None
         self.records_loaded: int = 0
         
+        # Key: parámetros de la consulta, Value: (instante monotónico, resultado)
+        self._probability_cache: Dict[tuple, Tuple[float, Dict]] = {}
+        
         # Cargar dataset al inicializar
         self._load_dataset()
         
@@ -188,6 +196,9 @@ class StatisticsService:
         FILTRADO POR INSTRUMENTO: Solo usa datos del mismo source+symbol para evitar
         mezclar estadísticas de diferentes instrumentos con características distintas.
         
+        CACHÉ: Los resultados se reutilizan durante Config.PROBABILITY_CACHE_TTL_SECONDS
+        para la misma combinación de parámetros (se invalida en reload_dataset).
+        
         Args:
             pattern: Tipo de patrón (ej: "SHOOTING_STAR", "HAMMER")
             current_score: Score de tendencia actual
@@ -234,6 +245,53 @@ class StatisticsService:
                 "lookback_days": int
             }
         """
+        cache_key = (
+            pattern, current_score, current_exhaustion_type, source, symbol,
+            current_alignment, current_ema_order, lookback_days, score_tolerance
+        )
+        now = time.monotonic()
+        
+        cached = self._probability_cache.get(cache_key)
+        if cached is not None and now - cached[0] < Config.PROBABILITY_CACHE_TTL_SECONDS:
+            logger.debug(f"📊 Estadísticas desde caché | {source}:{symbol} | {pattern}")
+            return copy.deepcopy(cached[1])
+        
+        stats = self._compute_probability(
+            pattern=pattern,
+            current_score=current_score,
+            current_exhaustion_type=current_exhaustion_type,
+            source=source,
+            symbol=symbol,
+            current_alignment=current_alignment,
+            current_ema_order=current_ema_order,
+            lookback_days=lookback_days,
+            score_tolerance=score_tolerance
+        )
+        
+        # Evicción simple: descartar la entrada más antigua (orden de inserción)
+        if len(self._probability_cache) >= Config.PROBABILITY_CACHE_MAX_SIZE:
+            self._probability_cache.pop(next(iter(self._probability_cache)))
+        self._probability_cache.pop(cache_key, None)
+        self._probability_cache[cache_key] = (now, copy.deepcopy(stats))
+        
+        return stats
+    
+    def _compute_probability(
+        self,
+        pattern: str,
+        current_score: int,
+        current_exhaustion_type: str,
+        source: str,
+        symbol: str,
+        current_alignment: Optional[str],
+        current_ema_order: Optional[str],
+        lookback_days: int,
+        score_tolerance: int
+    ) -> Dict[str, any]:
+        """
+        Ejecuta la consulta de probabilidad sobre el dataset (sin caché).
+        Ver get_probability para la descripción de argumentos y retorno.
+        """
         if self.df is None or self.df.empty:
             logger.warning(
                 f"⚠️  Dataset vacío | "
@@ -426,12 +484,7 @@ class StatisticsService:
         # Determinar dirección esperada del patrón
         # SHOOTING_STAR y HANGING_MAN son bajistas → esperan ROJA
         # HAMMER e INVERTED_HAMMER son alcistas → esperan VERDE
-        if pattern in ["SHOOTING_STAR", "INVERTED_HAMMER"]:
-            expected_direction = "ROJA"
-        elif pattern in ["HAMMER", "HANGING_MAN"]:
-            expected_direction = "VERDE"
-        else:
-            expected_direction = "UNKNOWN"
+        expected_direction = get_expected_direction(pattern)
         
         return {
             "total_cases": int(total_cases),
@@ -500,6 +553,7 @@ class StatisticsService:
         """
         logger.info("🔄 Recargando dataset...")
         self._load_dataset()
+        self._probability_cache.clear()
     
     def get_stats_summary(self) -> Dict[str, any]:
         """
@@ -18,12 +18,14 @@ Author: TradingView Pattern Monitor Team
 
 import asyncio
 import json
+import math
 import numpy as np
 from pathlib import Path
 from typing import Dict, Any, Optional
 from datetime import datetime
 
 from src.utils.logger import get_logger, log_exception
+from src.utils._json import dumps as json_dumps, ORJSON_AVAILABLE
 
 
 logger = get_logger(__name__)
@@ -217,15 +219,40 @@ class StorageService:
         Args:
             record: Registro a escribir
         """
-        # Convertir tipos de NumPy a tipos nativos de Python
-        sanitized_record = self._sanitize_numpy_types(record)
-        
-        # Serializar a JSON (una línea)
-        json_line = json.dumps(sanitized_record, ensure_ascii=False) + "\n"
+        # Serializar a JSON (una línea, bytes UTF-8). orjson serializa los
+        # tipos de NumPy directamente, pero escribe NaN/Infinity como null:
+        # esos registros (ej: indicadores sin datos) pasan por json estándar
+        # para conservar el formato del dataset (NaN, como siempre)
+        if ORJSON_AVAILABLE and not self._contains_non_finite(record):
+            json_line = json_dumps(record) + b"\n"
+        else:
+            json_line = json.dumps(
+                self._sanitize_numpy_types(record), ensure_ascii=False, separators=(",", ":")
+            ).encode("utf-8") + b"\n"
         
         # Escribir de forma asíncrona sin bloquear Event Loop
         await asyncio.to_thread(self._sync_write, json_line)
     
+    def _contains_non_finite(self, obj: Any) -> bool:
+        """
+        Indica si el registro contiene algún float NaN o infinito.
+        
+        Args:
+            obj: Objeto a revisar (puede ser dict, list, o valor primitivo)
+            
+        Returns:
+            bool: True si hay al menos un valor no finito
+        """
+        if isinstance(obj, dict):
+            return any(self._contains_non_finite(value) for value in obj.values())
+        elif isinstance(obj, (list, tuple)):
+            return any(self._contains_non_finite(item) for item in obj)
+        elif isinstance(obj, (float, np.floating)):
+            return not math.isfinite(obj)
+        elif isinstance(obj, np.ndarray):
+            return obj.dtype.kind in "fc" and not np.isfinite(obj).all()
+        return False
+    
     def _sanitize_numpy_types(self, obj: Any) -> Any:
         """
         Convierte recursivamente tipos de NumPy a tipos nativos de Python.
@@ -244,21 +271,21 @@ class StorageService:
             return bool(obj)
         elif isinstance(obj, (np.int_, np.intc, np.intp, np.int8, np.int16, np.int32, np.int64)):
             return int(obj)
-        elif isinstance(obj, (np.float_, np.float16, np.float32, np.float64)):
+        elif isinstance(obj, (np.float16, np.float32, np.float64)):
             return float(obj)
         elif isinstance(obj, np.ndarray):
             return obj.tolist()
         else:
             return obj
     
-    def _sync_write(self, json_line: str) -> None:
+    def _sync_write(self, json_line: bytes) -> None:
         """
         Escritura síncrona (ejecutada en thread separado).
         
         Args:
-            json_line: Línea JSON a escribir
+            json_line: Línea JSON codificada (incluye salto de línea)
         """
-        with open(self.file_path, "a", encoding="utf-8") as f:
+        with open(self.file_path, "ab") as f:
             f.write(json_line)
     
     def get_stats(self) -> Dict[str, Any]:
@@ -21,6 +21,7 @@ from config import Config
 if TYPE_CHECKING:
     from src.logic.analysis_service import PatternSignal
 from src.utils.logger import get_logger, log_exception
+from src.logic.candle import get_expected_direction
 from src.services.local_notification_storage import LocalNotificationStorage
 
 
@@ -238,9 +239,10 @@ class TelegramService:
 
         elif signal.signal_strength == "LOW":
             # ℹ️ SEÑAL BAJA
-            if signal.pattern in ["SHOOTING_STAR", "INVERTED_HAMMER"]:
+            expected_direction = get_expected_direction(signal.pattern)
+            if expected_direction == "ROJA":
                 text = "🔴 Posible operación a la BAJA"
-            elif signal.pattern in ["HAMMER", "HANGING_MAN"]:
+            elif expected_direction == "VERDE":
                 text = "🟢 Posible operación al ALZA"
             else:
                 text = "⚪ Vela no reconocida"
@@ -249,9 +251,10 @@ class TelegramService:
         
         elif signal.signal_strength == "VERY_LOW":
             # ⚪ SEÑAL MUY BAJA
-            if signal.pattern in ["SHOOTING_STAR", "INVERTED_HAMMER"]:
+            expected_direction = get_expected_direction(signal.pattern)
+            if expected_direction == "ROJA":
                 text = "🔴 Posible operación a la BAJA"
-            elif signal.pattern in ["HAMMER", "HANGING_MAN"]:
+            elif expected_direction == "VERDE":
                 text = "🟢 Posible operación al ALZA"
             else:
                 text = "⚪ Vela no reconocida"
@@ -9,8 +9,8 @@ Author: TradingView Pattern Monitor Team
 
 import asyncio
 import json
-import random
-import string
+import re
+import secrets
 import websockets
 from typing import List, Optional, Dict, Any
 from dataclasses import dataclass
@@ -18,6 +18,7 @@ from datetime import datetime
 
 from config import Config
 from src.utils.logger import get_logger
+from src.utils._json import dumps as json_dumps, loads as json_loads
 
 
 logger = get_logger(__name__)
@@ -50,10 +51,14 @@ def generate_session_id(prefix: str = "qs") -> str:
         prefix: Prefijo del ID (qs para quote session, cs para chart session)
         
     Returns:
-        str: Session ID único (ej: "qs_abc123xyz")
+        str: Session ID único (ej: "qs_3f9a1c07be42")
     """
-    random_part = ''.join(random.choices(string.ascii_lowercase + string.digits, k=12))
-    return f"{prefix}_{random_part}"
+    # 12 caracteres hex generados en C (sin armar el alfabeto ni hacer join por llamada)
+    return f"{prefix}_{secrets.token_hex(6)}"
+
+
+# Encabezado de frame del protocolo: ~m~<length>~m~<json_payload>
+FRAME_HEADER_RE = re.compile(r"~m~([0-9]+)~m~")
 
 
 def encode_message(func_name: str, params: List[Any]) -> str:
@@ -68,15 +73,38 @@ def encode_message(func_name: str, params: List[Any]) -> str:
         
     Returns:
         str: Mensaje codificado
+        
+    Example:
+        >>> decode_message(encode_message("x", ["é€"]))  # ida y vuelta con no-ASCII
+        [{'m': 'x', 'p': ['é€']}]
     """
-    payload = json.dumps({"m": func_name, "p": params})
-    return f"~m~{len(payload)}~m~{payload}"
+    # JSON compacto en bytes (orjson si está instalado). El largo del frame
+    # cuenta caracteres (igual que decode_message): con payload ASCII bytes y
+    # caracteres coinciden; si hay no-ASCII se escapa a \uXXXX con json
+    message = {"m": func_name, "p": params}
+    payload = json_dumps(message)
+    if not payload.isascii():
+        payload = json.dumps(message, separators=(",", ":")).encode("ascii")
+    return (b"~m~%d~m~%s" % (len(payload), payload)).decode("ascii")
 
 
 def decode_message(raw_message: str) -> List[Dict[str, Any]]:
     """
     Decodifica mensajes del protocolo TradingView.
     
+    Cada encabezado ~m~<length>~m~ se ubica con una búsqueda del regex
+    precompilado (en C) y el payload se toma por longitud exacta; la
+    búsqueda siguiente arranca después del payload, así un "~m~" dentro
+    de un string JSON no se confunde con un encabezado.
+    
+    El slice solo se acepta si termina justo donde empieza el próximo
+    encabezado (o el mensaje). Si el largo declarado no coincide, el payload
+    se toma hasta el próximo "~m~" (como el parser original, que ignoraba el
+    largo) y se sigue con los frames siguientes.
+    
+    Los payloads se parsean con orjson si está instalado (acepta el slice
+    str directamente); sus errores heredan de json.JSONDecodeError.
+    
     Args:
         raw_message: Mensaje crudo recibido del WebSocket
         
@@ -84,20 +112,24 @@ def decode_message(raw_message: str) -> List[Dict[str, Any]]:
         List[Dict]: Lista de mensajes decodificados
     """
     messages = []
-    parts = raw_message.split("~m~")
+    search = FRAME_HEADER_RE.search
+    total_length = len(raw_message)
     
-    i = 0
-    while i < len(parts):
-        if parts[i].isdigit():
-            length = int(parts[i])
-            i += 1
-            if i < len(parts):
-                try:
-                    message = json.loads(parts[i])
-                    messages.append(message)
-                except json.JSONDecodeError:
-                    pass
-        i += 1
+    header = search(raw_message)
+    while header is not None:
+        payload_start = header.end()
+        payload_end = payload_start + int(header.group(1))
+        if payload_end != total_length and not raw_message.startswith("~m~", payload_end):
+            # Largo declarado inconsistente: payload hasta el próximo separador
+            payload_end = raw_message.find("~m~", payload_start)
+            if payload_end == -1:
+                payload_end = total_length
+        
+        try:
+            messages.append(json_loads(raw_message[payload_start:payload_end]))
+        except json.JSONDecodeError:
+            pass
+        header = search(raw_message, payload_end)
     
     return messages
 
@@ -0,0 +1,44 @@
+"""
+Indicator Kernels - Numba JIT
+==============================
+Kernels compilados para los indicadores de src/utils/indicators.py.
+
+La EMA es una recurrencia secuencial: pandas la resuelve en su bucle
+Cython genérico de `ewm` (ventanas, pesos, manejo de NaN), mientras que
+acá es un único bucle nativo sobre el array de cierres.
+
+Author: TradingView Pattern Monitor Team
+"""
+
+import numpy as np
+
+from src.utils._njit import njit
+
+
+@njit(cache=True)
+def ema_nb(values, alpha):
+    """
+    Recurrencia de `ewm(span=period, adjust=False).mean()` sobre un array sin NaN.
+
+    Replica paso a paso la normalización de pandas (ver update_ema), por lo
+    que el resultado es bit a bit idéntico al de pandas.
+
+    Args:
+        values: Array float64 de precios (sin NaN)
+        alpha: Factor de suavizado (ver ema_alpha)
+
+    Returns:
+        np.ndarray: EMA de cada posición
+    """
+    n = values.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return out
+
+    old_wt = 1.0 - alpha
+    weighted = values[0]
+    out[0] = weighted
+    for i in range(1, n):
+        weighted = (old_wt * weighted + alpha * values[i]) / (old_wt + alpha)
+        out[i] = weighted
+    return out
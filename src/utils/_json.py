@@ -0,0 +1,57 @@
+"""
+Fast JSON Helpers - Optional Dependency
+========================================
+Expone `dumps` (retorna bytes UTF-8) y `loads` usando orjson si está
+instalado. Si no lo está, usa el módulo json estándar con salida equivalente
+(compacta, UTF-8 sin escapar), de modo que los archivos son intercambiables.
+
+Uso:
+    from src.utils._json import dumps, loads, ORJSON_AVAILABLE
+
+    line = dumps({"a": 1}) + b"\n"
+
+Author: TradingView Pattern Monitor Team
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+if ORJSON_AVAILABLE:
+    def dumps(obj: Any) -> bytes:
+        """
+        Serializa a JSON compacto (bytes UTF-8). Soporta escalares/arrays de NumPy.
+        
+        Args:
+            obj: Objeto a serializar
+            
+        Returns:
+            bytes: JSON codificado en UTF-8
+        """
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    loads = orjson.loads
+else:
+    def dumps(obj: Any) -> bytes:
+        """
+        Serializa a JSON compacto (bytes UTF-8) con el módulo estándar.
+        
+        Args:
+            obj: Objeto a serializar
+            
+        Returns:
+            bytes: JSON codificado en UTF-8
+        """
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    loads = json.loads
+
+
+__all__ = ["dumps", "loads", "ORJSON_AVAILABLE"]
@@ -0,0 +1,40 @@
+"""
+Numba JIT Helpers - Optional Dependency
+========================================
+Expone `njit` y `prange` de Numba si está instalado. Si no lo está, provee
+un decorador no-op y `prange = range`, de modo que los kernels numéricos se
+ejecutan como Python puro con exactamente la misma semántica.
+
+Uso:
+    from src.utils._njit import njit, NUMBA_AVAILABLE
+
+    @njit(cache=True)
+    def kernel(x): ...
+
+Author: TradingView Pattern Monitor Team
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """
+        Decorador no-op compatible con `@njit` y `@njit(...)`.
+        
+        Returns:
+            La función original sin compilar
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+__all__ = ["njit", "prange", "NUMBA_AVAILABLE"]
@@ -13,7 +13,7 @@ Author: TradingView Pattern Monitor Team
 
 import io
 import base64
-from typing import Optional
+from typing import Optional, Sequence, Tuple
 
 import pandas as pd
 import numpy as np
@@ -24,6 +24,42 @@ import matplotlib.pyplot as plt
 from matplotlib.lines import Line2D
 
 
+# =============================================================================
+# CHART STYLE (construido una sola vez al importar)
+# =============================================================================
+# mplfinance no permite actualizar una figura existente vela a vela, así que
+# cada gráfico se crea desde cero; lo que sí se puede evitar es reconstruir en
+# cada llamada los objetos invariantes (colores de mercado y estilo).
+
+# Colores: Velas alcistas (verdes), velas bajistas (rojas)
+_MARKET_COLORS = mpf.make_marketcolors(
+    up='#00FF00',      # Verde para velas alcistas (cierre > apertura)
+    down='#FF0000',    # Rojo para velas bajistas (cierre < apertura)
+    edge='inherit',    # Borde del mismo color que el cuerpo
+    wick='inherit',    # Mechas del mismo color que el cuerpo
+    volume='in',       # Volumen: verde si sube, rojo si baja
+    alpha=0.9
+)
+
+_CHART_STYLE = mpf.make_mpf_style(
+    base_mpf_style='yahoo',        # Estilo claro con fondo blanco
+    marketcolors=_MARKET_COLORS,   # ← Aplicar colores personalizados
+    gridstyle='--',
+    gridcolor='#CCCCCC',           # Grilla gris clara
+    facecolor='#FFFFFF',           # Fondo blanco del área de gráfico
+    edgecolor='#E0E0E0',           # Borde gris muy claro
+    figcolor='#FFFFFF',            # Fondo blanco de la figura completa
+    rc={
+        'axes.labelcolor': '#000000',    # Etiquetas negras
+        'xtick.color': '#000000',        # Números eje X negros
+        'ytick.color': '#000000',        # Números eje Y negros
+        'axes.edgecolor': '#000000',     # Borde del gráfico negro
+        'text.color': '#000000'          # Texto general negro
+    },
+    y_on_right=False
+)
+
+
 # =============================================================================
 # CHART GENERATION
 # =============================================================================
@@ -36,6 +72,8 @@ def generate_chart_base64(
 ) -> str:
     """
     Genera un gráfico de velas japonesas y lo retorna en Base64.
+    Base64 solo es necesario para el transporte a Telegram; para guardar en
+    disco usar render_chart_png_bytes() directamente.
     
     IMPORTANTE: Esta función es bloqueante (CPU bound). Debe ejecutarse en
     un hilo separado con asyncio.to_thread() desde código asíncrono.
@@ -49,6 +87,47 @@ def generate_chart_base64(
     Returns:
         str: Imagen del gráfico codificada en Base64
         
+    Raises:
+        ValueError: Si el DataFrame no tiene suficientes datos o columnas faltantes
+    """
+    image_bytes = render_chart_png_bytes(dataframe, lookback, title, show_emas)
+    
+    # Codificar en Base64
+    base64_string = base64.b64encode(image_bytes).decode('utf-8')
+    
+    # Validar que el Base64 sea válido (sin espacios, saltos de línea, etc.)
+    # Nota: No debe tener prefijo data:image/png;base64,
+    base64_length = len(base64_string)
+    has_newlines = '\n' in base64_string or '\r' in base64_string
+    has_spaces = ' ' in base64_string
+    
+    # Log de depuración
+    print(f"🖼️ CHART BASE64 GENERADO")
+    
+    return base64_string
+
+
+def render_chart_png_bytes(
+    dataframe: pd.DataFrame,
+    lookback: int,
+    title: str = "Price Chart",
+    show_emas: bool = True
+) -> bytes:
+    """
+    Renderiza el gráfico de velas japonesas y retorna los bytes PNG crudos.
+    
+    IMPORTANTE: Esta función es bloqueante (CPU bound). Debe ejecutarse en
+    un hilo/proceso separado desde código asíncrono.
+    
+    Args:
+        dataframe: DataFrame con columnas ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+        lookback: Número de velas hacia atrás a mostrar
+        title: Título del gráfico
+        show_emas: Si es True, muestra las EMAs. Si es False, solo precio y volumen.
+        
+    Returns:
+        bytes: Imagen PNG
+        
     Raises:
         ValueError: Si el DataFrame no tiene suficientes datos o columnas faltantes
     """
@@ -86,14 +165,14 @@ def generate_chart_base64(
     # Definición de Doji: Precio de apertura IGUAL al de cierre (Strict Doji)
     # Usamos marketcolor_overrides para pintar cada vela individualmente
     
-    colors = []
-    for index, row in df_plot.iterrows():
-        if row['Open'] == row['Close']:
-            colors.append('#808080')  # Gris (Doji Estricto)
-        elif row['Close'] > row['Open']:
-            colors.append('#00FF00')  # Verde (Alcista)
-        else:
-            colors.append('#FF0000')  # Rojo (Bajista)
+    # Vectorizado (antes: df_plot.iterrows() fila a fila)
+    open_values = df_plot['Open'].to_numpy()
+    close_values = df_plot['Close'].to_numpy()
+    colors = np.where(
+        open_values == close_values,
+        '#808080',  # Gris (Doji Estricto)
+        np.where(close_values > open_values, '#00FF00', '#FF0000')  # Verde (Alcista) / Rojo (Bajista)
+    ).tolist()
 
     # -------------------------------------------------------------------------
     # 2. EMAs (Solo si show_emas=True)
@@ -205,34 +284,8 @@ def generate_chart_base64(
             )
             additional_plots.append(ema_50_plot)
     
-    # Configurar estilo del gráfico
-    # Colores: Velas alcistas (verdes), velas bajistas (rojas)
-    market_colors = mpf.make_marketcolors(
-        up='#00FF00',      # Verde para velas alcistas (cierre > apertura)
-        down='#FF0000',    # Rojo para velas bajistas (cierre < apertura)
-        edge='inherit',    # Borde del mismo color que el cuerpo
-        wick='inherit',    # Mechas del mismo color que el cuerpo
-        volume='in',       # Volumen: verde si sube, rojo si baja
-        alpha=0.9
-    )
-    
-    style = mpf.make_mpf_style(
-        base_mpf_style='yahoo',        # Estilo claro con fondo blanco
-        marketcolors=market_colors,     # ← Aplicar colores personalizados
-        gridstyle='--',
-        gridcolor='#CCCCCC',           # Grilla gris clara
-        facecolor='#FFFFFF',           # Fondo blanco del área de gráfico
-        edgecolor='#E0E0E0',           # Borde gris muy claro
-        figcolor='#FFFFFF',            # Fondo blanco de la figura completa
-        rc={
-            'axes.labelcolor': '#000000',    # Etiquetas negras
-            'xtick.color': '#000000',        # Números eje X negros
-            'ytick.color': '#000000',        # Números eje Y negros
-            'axes.edgecolor': '#000000',     # Borde del gráfico negro
-            'text.color': '#000000'          # Texto general negro
-        },
-        y_on_right=False
-    )
+    # Estilo precomputado a nivel de módulo (ver _CHART_STYLE)
+    style = _CHART_STYLE
     
     # Configurar tamaño y proporciones
     fig_config = {
@@ -335,22 +388,7 @@ def generate_chart_base64(
         plt.close(fig)
         
         # Obtener bytes de la imagen
-        buffer.seek(0)
-        image_bytes = buffer.read()
-        
-        # Codificar en Base64
-        base64_string = base64.b64encode(image_bytes).decode('utf-8')
-        
-        # Validar que el Base64 sea válido (sin espacios, saltos de línea, etc.)
-        # Nota: No debe tener prefijo data:image/png;base64,
-        base64_length = len(base64_string)
-        has_newlines = '\n' in base64_string or '\r' in base64_string
-        has_spaces = ' ' in base64_string
-        
-        # Log de depuración
-        print(f"🖼️ CHART BASE64 GENERADO")
-        
-        return base64_string
+        return buffer.getvalue()
     
     finally:
         buffer.close()
@@ -426,9 +464,9 @@ async def process_and_save_chart(
     
     df = pd.DataFrame(data)
     
-    # 2. Generar gráfico (bloqueante -> thread)
-    chart_base64 = await asyncio.to_thread(
-        generate_chart_base64,
+    # 2. Generar gráfico (bloqueante -> thread), PNG crudo sin pasar por Base64
+    png_bytes = await asyncio.to_thread(
+        render_chart_png_bytes,
         df,
         lookback,
         title
@@ -439,7 +477,7 @@ async def process_and_save_chart(
     path_obj.parent.mkdir(parents=True, exist_ok=True)
     
     with open(path_obj, "wb") as f:
-        f.write(base64.b64decode(chart_base64))
+        f.write(png_bytes)
 
 
 def generate_outcome_chart_base64(
@@ -509,3 +547,138 @@ def generate_outcome_chart_base64(
         lookback,
         title
     )
+
+
+# =============================================================================
+# PROCESS POOL HELPERS
+# =============================================================================
+# Matplotlib retiene el GIL durante el render, por lo que asyncio.to_thread()
+# serializa los gráficos de varios símbolos que cierran en el mismo minuto.
+# Estas funciones permiten enviar el buffer a un ProcessPoolExecutor como
+# bytes planos (float64) en lugar de picklear el DataFrame completo.
+
+def dataframe_to_bytes(dataframe: pd.DataFrame) -> Tuple[bytes, Tuple[str, ...], Tuple[int, int]]:
+    """
+    Serializa un DataFrame numérico a bytes para enviarlo a otro proceso.
+    
+    Args:
+        dataframe: DataFrame con columnas numéricas (timestamp, OHLCV, indicadores)
+        
+    Returns:
+        Tuple[bytes, Tuple[str, ...], Tuple[int, int]]: (buffer float64, columnas, shape)
+    """
+    values = dataframe.to_numpy(dtype=np.float64, na_value=np.nan)
+    return values.tobytes(), tuple(dataframe.columns), values.shape
+
+
+def dataframe_from_bytes(
+    buffer: bytes,
+    columns: Sequence[str],
+    shape: Tuple[int, int]
+) -> pd.DataFrame:
+    """
+    Reconstruye un DataFrame serializado con dataframe_to_bytes().
+    
+    Args:
+        buffer: Bytes float64 del buffer
+        columns: Nombres de columnas
+        shape: (filas, columnas)
+        
+    Returns:
+        pd.DataFrame: DataFrame reconstruido (timestamp como int64)
+    """
+    values = np.frombuffer(buffer, dtype=np.float64).reshape(shape)
+    dataframe = pd.DataFrame(values, columns=list(columns))
+    if "timestamp" in dataframe.columns:
+        dataframe["timestamp"] = dataframe["timestamp"].astype(np.int64)
+    return dataframe
+
+
+def render_chart_png_bytes_from_bytes(
+    buffer: bytes,
+    columns: Sequence[str],
+    shape: Tuple[int, int],
+    lookback: int,
+    title: str = "Price Chart",
+    show_emas: bool = True
+) -> bytes:
+    """
+    Variante de render_chart_png_bytes() ejecutable en un proceso worker.
+    
+    Args:
+        buffer: Bytes float64 del DataFrame (ver dataframe_to_bytes)
+        columns: Nombres de columnas
+        shape: (filas, columnas)
+        lookback: Número de velas hacia atrás a mostrar
+        title: Título del gráfico
+        show_emas: Si es True, muestra las EMAs
+        
+    Returns:
+        bytes: Imagen PNG
+    """
+    return render_chart_png_bytes(
+        dataframe_from_bytes(buffer, columns, shape),
+        lookback,
+        title,
+        show_emas=show_emas
+    )
+
+
+def generate_chart_base64_from_bytes(
+    buffer: bytes,
+    columns: Sequence[str],
+    shape: Tuple[int, int],
+    lookback: int,
+    title: str = "Price Chart",
+    show_emas: bool = True
+) -> str:
+    """
+    Variante de generate_chart_base64() ejecutable en un proceso worker.
+    
+    Args:
+        buffer: Bytes float64 del DataFrame (ver dataframe_to_bytes)
+        columns: Nombres de columnas
+        shape: (filas, columnas)
+        lookback: Número de velas hacia atrás a mostrar
+        title: Título del gráfico
+        show_emas: Si es True, muestra las EMAs
+        
+    Returns:
+        str: Imagen del gráfico codificada en Base64
+    """
+    return generate_chart_base64(
+        dataframe_from_bytes(buffer, columns, shape),
+        lookback,
+        title,
+        show_emas=show_emas
+    )
+
+
+def generate_outcome_chart_base64_from_bytes(
+    buffer: bytes,
+    columns: Sequence[str],
+    shape: Tuple[int, int],
+    outcome_candle,
+    lookback: int,
+    title: str
+) -> str:
+    """
+    Variante de generate_outcome_chart_base64() ejecutable en un proceso worker.
+    
+    Args:
+        buffer: Bytes float64 del DataFrame (ver dataframe_to_bytes)
+        columns: Nombres de columnas
+        shape: (filas, columnas)
+        outcome_candle: Objeto CandleData de la vela de resultado (picklable)
+        lookback: Ventana de visualización
+        title: Título del gráfico
+        
+    Returns:
+        str: Base64 del gráfico generado
+    """
+    return generate_outcome_chart_base64(
+        dataframe_from_bytes(buffer, columns, shape),
+        outcome_candle,
+        lookback,
+        title
+    )
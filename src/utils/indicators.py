@@ -4,12 +4,19 @@ Technical Analysis Indicators
 Funciones de utilidad para calcular indicadores técnicos usando pandas.
 """
 
+import numpy as np
 import pandas as pd
 
+from src.utils._indicators_njit import ema_nb
+from src.utils._njit import NUMBA_AVAILABLE
+
 def calculate_ema(series: pd.Series, period: int) -> pd.Series:
     """
     Calcula la Media Móvil Exponencial (EMA).
     
+    Con Numba instalado y una serie sin NaN usa el kernel compilado ema_nb
+    (mismo resultado que pandas); si no, `ewm(adjust=False)` de pandas.
+    
     Args:
         series: Serie de precios (típicamente Close)
         period: Periodo de la EMA (ej: 200)
@@ -17,9 +24,49 @@ def calculate_ema(series: pd.Series, period: int) -> pd.Series:
     Returns:
         pd.Series: Serie con valores de EMA
     """
+    if NUMBA_AVAILABLE:
+        values = series.to_numpy(dtype=np.float64)
+        # Con NaN la semántica de pesos de pandas es otra: se delega en ewm
+        if not np.isnan(values).any():
+            return pd.Series(ema_nb(values, ema_alpha(period)), index=series.index)
+    
     return series.ewm(span=period, adjust=False).mean()
 
 
+def ema_alpha(period: int) -> float:
+    """
+    Factor de suavizado de la EMA, calculado igual que pandas para `span`.
+    
+    Args:
+        period: Periodo de la EMA
+        
+    Returns:
+        float: alpha = 1 / (1 + com), con com = (period - 1) / 2
+    """
+    com = (period - 1) / 2.0
+    return 1.0 / (1.0 + com)
+
+
+def update_ema(prev_ema, value, alpha):
+    """
+    Un paso de la recurrencia de `ewm(adjust=False)`: O(1) por vela.
+    
+    Reproduce la normalización interna de pandas, por lo que encadenar
+    update_ema sobre una serie da exactamente el mismo resultado que
+    calculate_ema. Acepta escalares o arrays de NumPy (varias EMAs a la vez).
+    
+    Args:
+        prev_ema: EMA de la vela anterior
+        value: Precio de la vela actual (típicamente Close)
+        alpha: Factor de suavizado (ver ema_alpha)
+        
+    Returns:
+        Nueva EMA
+    """
+    old_wt = 1.0 - alpha
+    return (old_wt * prev_ema + alpha * value) / (old_wt + alpha)
+
+
 def calculate_bollinger_bands(series: pd.Series, period: int = 20, std_dev: float = 2.5) -> tuple[pd.Series, pd.Series, pd.Series]:
     """
     Calcula las Bandas de Bollinger (Upper, Middle, Lower).
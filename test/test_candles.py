@@ -11,7 +11,6 @@ Tipos de vela VÁLIDOS (obligatorios):
 - hammer
 """
 
-import json
 import sys
 from pathlib import Path
 
@@ -19,6 +18,8 @@ from pathlib import Path
 root_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(root_dir))
 
+from src.utils._json import loads as json_loads  # orjson si está instalado
+
 # Importar directamente desde el archivo candle.py (evita import circular)
 import importlib.util
 spec = importlib.util.spec_from_file_location(
@@ -99,13 +100,13 @@ def test_candle(test_case: dict, case_number: int) -> bool:
     
     # Switch para ejecutar la función correspondiente
     if tipo_esperado == "shooting_star":
-        is_detected, confidence = is_shooting_star(apertura, maximo, minimo, cierre)
+        is_detected, confidence, _ = is_shooting_star(apertura, maximo, minimo, cierre)
     elif tipo_esperado == "hanging_man":
-        is_detected, confidence = is_hanging_man(apertura, maximo, minimo, cierre)
+        is_detected, confidence, _ = is_hanging_man(apertura, maximo, minimo, cierre)
     elif tipo_esperado == "inverted_hammer":
-        is_detected, confidence = is_inverted_hammer(apertura, maximo, minimo, cierre)
+        is_detected, confidence, _ = is_inverted_hammer(apertura, maximo, minimo, cierre)
     elif tipo_esperado == "hammer":
-        is_detected, confidence = is_hammer(apertura, maximo, minimo, cierre)
+        is_detected, confidence, _ = is_hammer(apertura, maximo, minimo, cierre)
     else:
         is_detected = False
         confidence = 0.0
@@ -150,8 +151,14 @@ def run_tests():
         print(f"❌ ERROR: No se encontró el archivo {test_file}")
         return False
     
-    with open(test_file, "r", encoding="utf-8") as f:
-        test_cases = json.load(f)
+    with open(test_file, "rb") as f:
+        test_cases = json_loads(f.read())
+    
+    # Velas agregadas en vivo por AnalysisService (JSONL, una por línea)
+    jsonl_file = test_file.with_suffix(".jsonl")
+    if jsonl_file.exists():
+        with open(jsonl_file, "rb") as f:
+            test_cases.extend(json_loads(line) for line in f if line.strip())
     
     print("\n" + "🧪 " * 40)
     print("SISTEMA AUTOMATIZADO DE VALIDACIÓN DE PATRONES")
@@ -0,0 +1,365 @@
+"""
+Test de Equivalencia de Kernels - Sistema Automatizado
+=======================================================
+Verifica que los kernels optimizados (Numba / NumPy) den exactamente el
+mismo resultado que la lógica escalar original a la que reemplazan:
+
+- detect_all_patterns / detect_patterns_batch (Numba y fallback NumPy)
+  contra una copia de los detectores originales sobre test_data.json
+- bollinger_exhaustion_nb / trend_score_nb contra detect_exhaustion y
+  analyze_trend originales (incluyendo NaN)
+- calculate_ema / ema_nb / update_ema contra `ewm(span, adjust=False)`
+
+Se ejecuta directamente (python test/test_kernels.py) o con pytest.
+"""
+
+import math
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Agregar el directorio raíz al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from config import Config
+from src.logic import candle_vec
+from src.logic._analysis_njit import bollinger_exhaustion_nb, trend_score_nb
+from src.logic._candle_njit import (
+    FLAG_SHOOTING_STAR, FLAG_HANGING_MAN, FLAG_INVERTED_HAMMER, FLAG_HAMMER,
+    detect_all_patterns_nb, detect_patterns_batch_nb
+)
+from src.logic.analysis_service import analyze_trend, detect_exhaustion
+from src.logic.candle import detect_all_patterns
+from src.utils._indicators_njit import ema_nb
+from src.utils._json import loads as json_loads
+from src.utils.indicators import calculate_ema, ema_alpha, update_ema
+
+TEST_DATA_FILE = Path(__file__).parent / "test_data.json"
+EMA_PERIODS = (3, 5, 7, 10, 15, 20, 30, 50, 200)
+FLAG_ORDER = (FLAG_SHOOTING_STAR, FLAG_HANGING_MAN, FLAG_INVERTED_HAMMER, FLAG_HAMMER)
+EXHAUSTION_NAMES = ("NONE", "PEAK", "BOTTOM")
+TREND_NAMES = ("STRONG_BULLISH", "WEAK_BULLISH", "NEUTRAL", "WEAK_BEARISH", "STRONG_BEARISH")
+
+
+# =============================================================================
+# IMPLEMENTACIONES DE REFERENCIA (lógica escalar original)
+# =============================================================================
+
+def _reference_pattern(o: float, h: float, l: float, c: float,
+                       long_is_upper: bool, require_green: bool) -> float:
+    """
+    Copia de is_shooting_star / is_hanging_man / is_inverted_hammer / is_hammer
+    previos a los kernels JIT. Devuelve la confianza (0.0 si no hay patrón).
+    """
+    cfg = Config.CANDLE
+    total_range = h - l
+    if total_range == 0:
+        return 0.0
+    if require_green and c <= o:
+        return 0.0
+    if not require_green and c > o:
+        return 0.0
+
+    body_size = abs(c - o)
+    body_ratio = body_size / total_range
+    if c > o:
+        upper_wick, lower_wick = h - c, o - l
+    else:
+        upper_wick, lower_wick = h - o, c - l
+
+    if long_is_upper:
+        long_wick, short_wick, wick_min = upper_wick, lower_wick, cfg.UPPER_WICK_RATIO_MIN
+    else:
+        long_wick, short_wick, wick_min = lower_wick, upper_wick, cfg.LOWER_WICK_RATIO_MIN
+    long_ratio = long_wick / total_range
+    short_ratio = short_wick / total_range
+
+    if not (
+        long_ratio >= wick_min
+        and body_ratio <= cfg.SMALL_BODY_RATIO
+        and short_ratio <= cfg.OPPOSITE_WICK_MAX
+        and body_size > 0
+        and (long_wick / body_size) >= cfg.WICK_TO_BODY_RATIO
+    ):
+        return 0.0
+
+    confidence = cfg.BASE_CONFIDENCE
+    if long_ratio >= 0.70:
+        confidence += cfg.BONUS_CONFIDENCE_PER_CONDITION
+    if body_ratio <= 0.20:
+        confidence += cfg.BONUS_CONFIDENCE_PER_CONDITION
+    if short_ratio <= 0.10:
+        confidence += cfg.BONUS_CONFIDENCE_PER_CONDITION
+    return min(confidence, 1.0)
+
+
+def _reference_all_patterns(o: float, h: float, l: float, c: float):
+    """(máscara FLAG_*, conf_ss, conf_hm, conf_ih, conf_h) con los detectores originales."""
+    confs = (
+        _reference_pattern(o, h, l, c, long_is_upper=True, require_green=False),
+        _reference_pattern(o, h, l, c, long_is_upper=False, require_green=False),
+        _reference_pattern(o, h, l, c, long_is_upper=True, require_green=True),
+        _reference_pattern(o, h, l, c, long_is_upper=False, require_green=True),
+    )
+    mask = 0
+    for flag, conf in zip(FLAG_ORDER, confs):
+        if conf > 0:
+            mask |= flag
+    return (mask,) + confs
+
+
+def _reference_exhaustion(h: float, l: float, c: float, upper: float, lower: float) -> str:
+    """Copia de detect_exhaustion previo al kernel."""
+    if math.isnan(upper) or math.isnan(lower):
+        return "NONE"
+    if h >= upper or c >= upper:
+        return "PEAK"
+    if l <= lower or c <= lower:
+        return "BOTTOM"
+    return "NONE"
+
+
+def _reference_trend(ema_3, ema_5, ema_20, prev_ema_3, prev_ema_5, prev_ema_20, has_prev):
+    """Copia de analyze_trend V7.1 previo al kernel: (status, score, is_aligned)."""
+    thr = Config.SLOPE_THRESHOLD_PCT
+    score_structure = score_velocity = score_momentum = 0.0
+    bullish = bearish = False
+    if not (math.isnan(ema_3) or math.isnan(ema_5) or math.isnan(ema_20)):
+        if ema_3 > ema_5 > ema_20:
+            bullish, score_structure = True, 3.0
+        elif ema_3 < ema_5 < ema_20:
+            bearish, score_structure = True, -3.0
+
+    def slope(cur, prev):
+        if has_prev and not math.isnan(cur) and not math.isnan(prev) and prev != 0:
+            return (cur - prev) / prev
+        return 0.0
+
+    slope_3 = slope(ema_3, prev_ema_3)
+    slope_5 = slope(ema_5, prev_ema_5)
+    slope_20 = slope(ema_20, prev_ema_20)
+
+    if slope_20 > thr:
+        score_velocity = 2.0
+    elif slope_20 < -thr:
+        score_velocity = -2.0
+
+    if bullish:
+        if slope_3 > thr:
+            score_momentum += 3.0
+        elif slope_3 < thr:
+            score_momentum -= 2.0
+        if slope_5 > thr:
+            score_momentum += 2.0
+    elif bearish:
+        if slope_3 < -thr:
+            score_momentum -= 3.0
+        elif slope_3 > -thr:
+            score_momentum += 2.0
+        if slope_5 < -thr:
+            score_momentum -= 2.0
+    else:
+        if slope_3 > thr:
+            score_momentum += 1.5
+        elif slope_3 < -thr:
+            score_momentum -= 1.5
+        if slope_5 > thr:
+            score_momentum += 1.0
+        elif slope_5 < -thr:
+            score_momentum -= 1.0
+
+    total = round(max(min(score_structure + score_velocity + score_momentum, 10.0), -10.0), 1)
+    if total >= 8.0:
+        status = "STRONG_BULLISH"
+    elif total >= 5.0:
+        status = "WEAK_BULLISH"
+    elif total > -5.0:
+        status = "NEUTRAL"
+    elif total > -8.0:
+        status = "WEAK_BEARISH"
+    else:
+        status = "STRONG_BEARISH"
+    return status, total, bullish or bearish
+
+
+# =============================================================================
+# DATOS
+# =============================================================================
+
+def _load_ohlc() -> np.ndarray:
+    """Velas de test_data.json como matriz (n, 4) O/H/L/C."""
+    with open(TEST_DATA_FILE, "rb") as f:
+        cases = json_loads(f.read())
+    return np.array(
+        [[case["apertura"], case["maximo"], case["minimo"], case["cierre"]] for case in cases],
+        dtype=np.float64
+    )
+
+
+def _kernel_args():
+    cfg = Config.CANDLE
+    return (
+        cfg.UPPER_WICK_RATIO_MIN, cfg.LOWER_WICK_RATIO_MIN, cfg.SMALL_BODY_RATIO,
+        cfg.OPPOSITE_WICK_MAX, cfg.WICK_TO_BODY_RATIO, cfg.BASE_CONFIDENCE,
+        cfg.BONUS_CONFIDENCE_PER_CONDITION
+    )
+
+
+def _reference_batch(ohlc: np.ndarray):
+    """Máscara, confianzas y candle_exhaustion esperados para un bloque de velas."""
+    rows = [_reference_all_patterns(*map(float, candle)) for candle in ohlc]
+    mask = np.array([row[0] for row in rows], dtype=np.uint8)
+    confs = np.array([row[1:] for row in rows], dtype=np.float64)
+    exhaustion = np.zeros(len(ohlc), dtype=bool)
+    for i in range(1, len(ohlc)):
+        if mask[i] & (FLAG_SHOOTING_STAR | FLAG_HANGING_MAN):
+            exhaustion[i] = ohlc[i, 1] > ohlc[i - 1, 1]
+        elif mask[i] & (FLAG_INVERTED_HAMMER | FLAG_HAMMER):
+            exhaustion[i] = ohlc[i, 2] < ohlc[i - 1, 2]
+    return mask, confs, exhaustion
+
+
+def _assert_batch(result, expected, label: str) -> None:
+    mask, conf_ss, conf_hm, conf_ih, conf_h, exhaustion = result
+    exp_mask, exp_confs, exp_exhaustion = expected
+    assert np.array_equal(mask, exp_mask), f"{label}: máscara distinta"
+    for col, conf in enumerate((conf_ss, conf_hm, conf_ih, conf_h)):
+        assert np.array_equal(conf, exp_confs[:, col]), f"{label}: confianza distinta (col {col})"
+    assert np.array_equal(exhaustion, exp_exhaustion), f"{label}: candle_exhaustion distinto"
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+def test_detect_all_patterns_matches_reference():
+    """detect_all_patterns (kernel Numba y .py_func) == detectores originales."""
+    args = _kernel_args()
+    scalar_kernel = getattr(detect_all_patterns_nb, "py_func", detect_all_patterns_nb)
+    for o, h, l, c in _load_ohlc():
+        expected = _reference_all_patterns(o, h, l, c)
+        assert detect_all_patterns(o, h, l, c) == expected, (o, h, l, c)
+        assert tuple(scalar_kernel(o, h, l, c, *args)) == expected, (o, h, l, c)
+
+
+def test_detect_patterns_batch_matches_reference():
+    """detect_patterns_batch (Numba, .py_func y fallback NumPy) == detectores originales."""
+    ohlc = _load_ohlc()
+    expected = _reference_batch(ohlc)
+    o, h, l, c = (np.ascontiguousarray(ohlc[:, i]) for i in range(4))
+
+    _assert_batch(candle_vec.detect_patterns_batch(o, h, l, c), expected, "detect_patterns_batch")
+    batch_py = getattr(detect_patterns_batch_nb, "py_func", detect_patterns_batch_nb)
+    _assert_batch(batch_py(o, h, l, c, *_kernel_args()), expected, "detect_patterns_batch_nb.py_func")
+
+    numba_available = candle_vec.NUMBA_AVAILABLE
+    candle_vec.NUMBA_AVAILABLE = False
+    try:
+        _assert_batch(candle_vec.detect_patterns_batch(o, h, l, c), expected, "fallback NumPy")
+    finally:
+        candle_vec.NUMBA_AVAILABLE = numba_available
+
+
+def _random_band_case(rng: random.Random):
+    c = rng.uniform(0.9, 1.1)
+    h = c + rng.uniform(0.0, 0.02)
+    l = c - rng.uniform(0.0, 0.02)
+    upper = rng.choice([math.nan, c + rng.uniform(-0.03, 0.03), h, c])
+    lower = rng.choice([math.nan, c - rng.uniform(-0.03, 0.03), l, c])
+    return h, l, c, upper, lower
+
+
+def test_bollinger_exhaustion_matches_reference():
+    """bollinger_exhaustion_nb / detect_exhaustion == detect_exhaustion original."""
+    rng = random.Random(7)
+    kernel_py = getattr(bollinger_exhaustion_nb, "py_func", bollinger_exhaustion_nb)
+    for _ in range(20_000):
+        h, l, c, upper, lower = _random_band_case(rng)
+        expected = _reference_exhaustion(h, l, c, upper, lower)
+        assert EXHAUSTION_NAMES[bollinger_exhaustion_nb(h, l, c, upper, lower)] == expected
+        assert EXHAUSTION_NAMES[kernel_py(h, l, c, upper, lower)] == expected
+        assert detect_exhaustion(h, l, c, upper, lower) == expected
+
+
+def _random_ema(rng: random.Random, base: float) -> float:
+    if rng.random() < 0.05:
+        return math.nan
+    if rng.random() < 0.02:
+        return 0.0
+    # Pendientes alrededor del umbral para cubrir todas las ramas
+    return base * (1.0 + rng.choice([-1, 1]) * rng.uniform(0.0, 4.0) * Config.SLOPE_THRESHOLD_PCT)
+
+
+def test_trend_score_matches_reference():
+    """trend_score_nb / analyze_trend == analyze_trend V7.1 original."""
+    rng = random.Random(3)
+    thr = Config.SLOPE_THRESHOLD_PCT
+    kernel_py = getattr(trend_score_nb, "py_func", trend_score_nb)
+    for _ in range(20_000):
+        base = rng.uniform(0.5, 2.0)
+        prev = [_random_ema(rng, base) for _ in range(3)]
+        cur = [_random_ema(rng, base) for _ in range(3)]
+        has_prev = rng.random() < 0.9
+        status, score, aligned = _reference_trend(*cur, *prev, has_prev)
+
+        for kernel in (trend_score_nb, kernel_py):
+            k_score, k_bucket, k_aligned = kernel(*cur, *prev, has_prev, thr)
+            assert (TREND_NAMES[k_bucket], k_score, bool(k_aligned)) == (status, score, aligned)
+
+        emas = dict(zip(("ema_3", "ema_5", "ema_20"), cur))
+        prev_emas = dict(zip(("ema_3", "ema_5", "ema_20"), prev)) if has_prev else None
+        trend = analyze_trend(1.0, emas, prev_emas)
+        assert (trend.status, trend.score, trend.is_aligned) == (status, score, aligned)
+
+
+def test_ema_matches_pandas_ewm():
+    """calculate_ema, ema_nb y update_ema encadenado == ewm(span, adjust=False)."""
+    closes = pd.Series(_load_ohlc()[:, 3])
+    values = closes.to_numpy(dtype=np.float64)
+    for period in EMA_PERIODS:
+        expected = closes.ewm(span=period, adjust=False).mean().to_numpy()
+        alpha = ema_alpha(period)
+
+        assert np.array_equal(calculate_ema(closes, period).to_numpy(), expected), period
+        assert np.array_equal(ema_nb(values, alpha), expected), period
+
+        incremental = np.empty_like(values)
+        incremental[0] = values[0]
+        for i in range(1, len(values)):
+            incremental[i] = update_ema(incremental[i - 1], values[i], alpha)
+        assert np.array_equal(incremental, expected), period
+
+    # Forma vectorizada: varias EMAs en un solo paso
+    alphas = np.array([ema_alpha(p) for p in EMA_PERIODS])
+    state = np.full(len(EMA_PERIODS), values[0])
+    for value in values[1:]:
+        state = update_ema(state, value, alphas)
+    last = [closes.ewm(span=p, adjust=False).mean().iloc[-1] for p in EMA_PERIODS]
+    assert np.array_equal(state, np.array(last))
+
+
+def run_tests() -> bool:
+    """Ejecuta todos los tests del módulo e imprime un resumen."""
+    tests = [obj for name, obj in globals().items() if name.startswith("test_") and callable(obj)]
+    failed = 0
+    print(f"\n{'='*80}")
+    print("🧪 EQUIVALENCIA DE KERNELS OPTIMIZADOS")
+    print(f"{'='*80}")
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    print(f"{'='*80}")
+    print(f"✅ Pasados: {len(tests) - failed} | ❌ Fallidos: {failed}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_tests() else 1)
@@ -0,0 +1,184 @@
+"""
+Test de Equivalencia del Pipeline - Sistema Automatizado
+=========================================================
+Verifica que las estructuras optimizadas del pipeline en tiempo real den el
+mismo resultado que la implementación original a la que reemplazan:
+
+- CandleBuffer (append / extend / compactación) contra una lista acotada
+- decode_message (regex) contra el parser original basado en split("~m~")
+- classify_signal_codes contra classify_signal_context
+
+Se ejecuta directamente (python test/test_pipeline.py) o con pytest.
+"""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Agregar el directorio raíz al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from src.logic._candle_njit import (
+    FLAG_SHOOTING_STAR, FLAG_HANGING_MAN, FLAG_INVERTED_HAMMER, FLAG_HAMMER
+)
+from src.logic.candle_buffer import CandleBuffer
+from src.logic.signal_classifier import (
+    TREND_STATUSES, classify_signal_codes, classify_signal_context
+)
+from src.services import connection_service, tradingview_service
+
+BUFFER_DTYPES = {"timestamp": np.int64, "close": np.float64, "ema_20": np.float64}
+PATTERN_FLAGS = {
+    "SHOOTING_STAR": FLAG_SHOOTING_STAR,
+    "HANGING_MAN": FLAG_HANGING_MAN,
+    "INVERTED_HAMMER": FLAG_INVERTED_HAMMER,
+    "HAMMER": FLAG_HAMMER,
+}
+
+
+# =============================================================================
+# IMPLEMENTACIONES DE REFERENCIA
+# =============================================================================
+
+def _reference_decode(raw_message: str) -> list:
+    """Copia del decode_message original (split por "~m~")."""
+    messages = []
+    parts = raw_message.split("~m~")
+    i = 0
+    while i < len(parts):
+        if parts[i].isdigit():
+            length = int(parts[i])
+            if i + 1 < len(parts) and len(parts[i + 1]) == length:
+                try:
+                    messages.append(json.loads(parts[i + 1]))
+                except json.JSONDecodeError:
+                    pass
+            i += 2
+        else:
+            i += 1
+    return messages
+
+
+def _reference_encode(func_name: str, params: list) -> str:
+    """Copia del encode_message original (json.dumps por defecto)."""
+    payload = json.dumps({"m": func_name, "p": params})
+    return f"~m~{len(payload)}~m~{payload}"
+
+
+def _random_frame(rng: random.Random, encode) -> str:
+    """Frame de datos (du / timescale_update / qsd) o heartbeat."""
+    if rng.random() < 0.2:
+        beat = f"~h~{rng.randint(1, 999)}"
+        return f"~m~{len(beat)}~m~{beat}"
+    bars = [
+        {"i": i, "v": [1700000000 + 60 * i] + [round(rng.uniform(1.0, 1.2), 5) for _ in range(4)]}
+        for i in range(rng.randint(1, 5))
+    ]
+    func = rng.choice(["du", "timescale_update", "qsd", "series_completed"])
+    return encode(func, [f"cs_{rng.randint(0, 9)}", {"s1": {"s": bars, "symbol": "FX:EURUSD"}}])
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+def test_candle_buffer_matches_list_model():
+    """append/extend con compactación == lista de las últimas max_size velas."""
+    rng = random.Random(5)
+    max_size = 50
+    buffer = CandleBuffer(max_size, BUFFER_DTYPES)
+    model = []
+    next_ts = 0
+
+    for _ in range(2_000):
+        if rng.random() < 0.1:
+            count = rng.choice([1, 7, max_size - 1, max_size, max_size + 13])
+            block = {
+                "timestamp": np.arange(next_ts, next_ts + count, dtype=np.int64),
+                "close": np.arange(count, dtype=np.float64) + next_ts * 0.5,
+            }
+            buffer.extend(block)
+            model.extend(
+                (int(ts), float(close), np.nan) for ts, close in zip(block["timestamp"], block["close"])
+            )
+            next_ts += count
+        else:
+            close = rng.uniform(1.0, 1.2)
+            values = {"timestamp": next_ts, "close": close}
+            ema = np.nan
+            if rng.random() < 0.5:
+                ema = values["ema_20"] = rng.uniform(1.0, 1.2)
+            buffer.append(values)
+            model.append((next_ts, close, ema))
+            next_ts += 1
+        model = model[-max_size:]
+
+        assert len(buffer) == len(model)
+        expected = np.array(model, dtype=np.float64)
+        assert np.array_equal(buffer.column("timestamp"), expected[:, 0].astype(np.int64))
+        assert np.array_equal(buffer.column("close"), expected[:, 1])
+        assert np.array_equal(buffer.column("ema_20"), expected[:, 2], equal_nan=True)
+        assert buffer.last("timestamp") == model[-1][0]
+        assert buffer.row(0)["timestamp"] == model[0][0]
+
+    frame = buffer.to_dataframe(tail=10)
+    assert list(frame.columns) == list(BUFFER_DTYPES)
+    assert frame["timestamp"].tolist() == [row[0] for row in model[-10:]]
+
+
+def test_decode_message_matches_split_parser():
+    """decode_message (regex) == parser original sobre frames válidos."""
+    rng = random.Random(11)
+    for module in (connection_service, tradingview_service):
+        for encode in (_reference_encode, module.encode_message):
+            for _ in range(500):
+                raw = "".join(_random_frame(rng, encode) for _ in range(rng.randint(1, 6)))
+                assert module.decode_message(raw) == _reference_decode(raw), raw
+
+
+def test_encode_decode_round_trip_non_ascii():
+    """encode_message cuenta caracteres igual que decode_message (no-ASCII incluido)."""
+    params = ["é€", {"symbol": "BMFBOVESPA:ÍNDICE", "nota": "~m~ dentro del payload"}]
+    for module in (connection_service, tradingview_service):
+        raw = module.encode_message("quote_add_symbols", params)
+        expected = [{"m": "quote_add_symbols", "p": params}]
+        assert module.decode_message(raw) == expected
+        assert module.decode_message(raw + raw) == expected * 2
+
+
+def test_classify_signal_codes_matches_context():
+    """classify_signal_codes == classify_signal_context en todas las combinaciones."""
+    for bucket, trend_status in enumerate(TREND_STATUSES):
+        for pattern, flag in PATTERN_FLAGS.items():
+            for exhaustion_bb in ("PEAK", "BOTTOM", "NONE"):
+                for candle_exhaustion in (False, True):
+                    expected = classify_signal_context(pattern, trend_status, exhaustion_bb, candle_exhaustion)
+                    result = classify_signal_codes(flag, bucket, exhaustion_bb != "NONE", candle_exhaustion)
+                    assert result == expected, (pattern, trend_status, exhaustion_bb, candle_exhaustion)
+
+
+def run_tests() -> bool:
+    """Ejecuta todos los tests del módulo e imprime un resumen."""
+    tests = [obj for name, obj in globals().items() if name.startswith("test_") and callable(obj)]
+    failed = 0
+    print(f"\n{'='*80}")
+    print("🧪 EQUIVALENCIA DEL PIPELINE EN TIEMPO REAL")
+    print(f"{'='*80}")
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    print(f"{'='*80}")
+    print(f"✅ Pasados: {len(tests) - failed} | ❌ Fallidos: {failed}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_tests() else 1)
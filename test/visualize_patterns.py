@@ -16,7 +16,6 @@ Usage:
     python test/visualize_patterns.py --pattern hammer
 """
 
-import json
 import matplotlib.pyplot as plt
 from pathlib import Path
 from typing import List, Dict, Optional
@@ -27,6 +26,7 @@ import importlib.util
 
 # Cargar config.py directamente (sin __init__.py)
 project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))  # candle.py importa los kernels de src.logic
 config_path = project_root / "config.py"
 spec = importlib.util.spec_from_file_location("config", config_path)
 config_module = importlib.util.module_from_spec(spec)
@@ -39,6 +39,8 @@ spec = importlib.util.spec_from_file_location("candle_detection", candle_path)
 candle_module = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(candle_module)
 
+from src.utils._json import loads as json_loads  # orjson si está instalado
+
 # Extraer funciones
 is_shooting_star = candle_module.is_shooting_star
 is_hanging_man = candle_module.is_hanging_man
@@ -87,16 +89,16 @@ def validate_pattern(candle: Dict[str, float], expected_pattern: str) -> bool:
     
     # Ejecutar función de validación según tipo usando candle.py
     if expected_pattern == "shooting_star":
-        detected, _ = is_shooting_star(apertura, maximo, minimo, cierre)
+        detected, _, _ = is_shooting_star(apertura, maximo, minimo, cierre)
         return detected
     elif expected_pattern == "hanging_man":
-        detected, _ = is_hanging_man(apertura, maximo, minimo, cierre)
+        detected, _, _ = is_hanging_man(apertura, maximo, minimo, cierre)
         return detected
     elif expected_pattern == "hammer":
-        detected, _ = is_hammer(apertura, maximo, minimo, cierre)
+        detected, _, _ = is_hammer(apertura, maximo, minimo, cierre)
         return detected
     elif expected_pattern == "inverted_hammer":
-        detected, _ = is_inverted_hammer(apertura, maximo, minimo, cierre)
+        detected, _, _ = is_inverted_hammer(apertura, maximo, minimo, cierre)
         return detected
     else:
         return False
@@ -153,8 +155,14 @@ def visualize_patterns(test_data_path: Path, pattern_filter: Optional[str] = Non
                        Si es None, muestra todos los patrones
     """
     # Leer datos
-    with open(test_data_path, "r", encoding="utf-8") as f:
-        all_candles = json.load(f)
+    with open(test_data_path, "rb") as f:
+        all_candles = json_loads(f.read())
+    
+    # Velas agregadas en vivo por AnalysisService (JSONL, una por línea)
+    jsonl_path = test_data_path.with_suffix(".jsonl")
+    if jsonl_path.exists():
+        with open(jsonl_path, "rb") as f:
+            all_candles.extend(json_loads(line) for line in f if line.strip())
     
     # Filtrar por tipo si se especifica
     if pattern_filter: